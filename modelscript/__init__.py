@@ -2,7 +2,8 @@
 """
 Initialize the megamodel with
 - all metamodels
-- all scripts components (parsers/printers/plantuml/...)
+- the loaders of scripts components (parsers/printers/plantuml/...)
+  which are imported on demand, see Megamodel.loadMetamodel
 - the configuration
 
 This module is called by the environment
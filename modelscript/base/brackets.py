@@ -38,7 +38,8 @@ itself. ::
             eater : Elephant[0..1] ;
             bananas : Banana[*] ; } ; } ;
 
-For more examples see for instance testcases/cls/.mdl/*.clsb
+For more examples see for instance testcases/cls/.mdl/*.clsb. These
+files are produced only on demand, with "modelc --save-bracketed".
 """
 
 __all__ = (
@@ -46,7 +47,10 @@ __all__ = (
     'BracketedScript'
 )
 
-from typing import Match, ClassVar, List
+from typing import (
+    Match, ClassVar, Iterable, Iterator, Optional, Union)
+import io
+import mmap
 import re
 
 # The following dependencies could be removed if necessary.
@@ -85,9 +89,6 @@ class BracketedScript(object):
     # ModelScript1:
     #      added [^@\|] so that --@ and --| are not treated as comment
 
-    IS_DOC_LINE_REGEX: ClassVar[Match[str]] = re.compile('^ *\|')
-    """ Regular expression for a documentation line. """
-
     # -- output parameters -----------------------------------------
 
     OPENING_BRACKET: ClassVar[str] = '\000{'
@@ -103,121 +104,145 @@ class BracketedScript(object):
     """ Closing documentation line string. """
 
     DOC_LINE_CONTENT: ClassVar[Match[str]] = \
-        re.compile(' *\| ?(?P<content>.*)\000\|\000;(\000}\000;)*$')
+        re.compile(r' *\| ?(?P<content>.*)\000\|\000;(\000}\000;)*$')
     """ Regular expression for a documentation line. """
 
-    # -- output parameters -----------------------------------------
+    # -- input ------------------------------------------------------
 
     file: str
     """ Name of the input file. """
 
-    lines: List[str]
-    """ Content of the input file represented as list of lines. """
-
-    bracketedLines: List[str]
-    """ """
+    lines: Optional[Iterable[str]]
+    """ Lines to bracket if not to be read from the file. This could
+    be any iterable of lines: a list, an open file, a string or even
+    an mmap object (decoded as utf-8). """
 
-    targetFilename: str
-    """ Name of the output file.
-    The location of the output file is computed by the Environment.
-    See  modelscript.interfaces.environment. """
-
-    def __init__(self, file: str) -> None:
+    def __init__(self,
+                 file: str,
+                 lines: Union[None, str, Iterable[str]] = None) -> None:
         self.file = file
-        self.lines = [line.rstrip('\n') for line in open(file)]
-        self.bracketedLines = []
-        basic_file_name = self.file+'b'
-        self.targetFilename = Environment.getWorkerFileName(basic_file_name)
-
-    def _is_blank_line(self, index: int) -> bool:
-        """ Check if the line is blank or a comment line """
-        m = re.match(self.IS_BLANK_LINE, self.lines[index])
-        return m is not None
+        self.lines = lines
 
-    def _is_doc_line(self, index: int) -> bool:
-        m = re.match(self.IS_DOC_LINE_REGEX, self.lines[index])
-        return m is not None
-
-    def _terminate_doc_line(self, docLine: str) -> str:
-        return docLine + self.CLOSING_DOC_LINE
+    @property
+    def targetFilename(self) -> str:
+        """ Name of the output file.
+        The location of the output file is computed by the Environment.
+        See  modelscript.interfaces.environment. The directory of the
+        output file is created on demand, so this property should be
+        used only when the file is saved.
+        """
+        basic_file_name = self.file+'b'
+        return Environment.getWorkerFileName(basic_file_name)
 
     @classmethod
     def extractDocLineText(cls, docLine: str) -> str:
-        m = re.match(cls.DOC_LINE_CONTENT, docLine)
+        m = cls.DOC_LINE_CONTENT.match(docLine)
         assert m is not None
         return m.group('content')
 
-    def _nb_spaces(self, index: int) -> int:
-        m = re.match(' *', self.lines[index])
-        if m:
-            return len(m.group(0))
-        else:
-            return 0
-
-    def _line_indent(self, index: int) -> int:
-        blanks = self._nb_spaces(index)
-        if blanks % self.SPACE_INDENT  == 0:
-            return blanks // self.SPACE_INDENT
-        else:
-            raise BracketError(  # raise:OK
-                message = '%i spaces found. Multiple of %i expected.'
-                        % (blanks, self.SPACE_INDENT),
-                line = index+1)
-
-    def _suffix(self, delta: int) -> str:
+    @classmethod
+    def _suffix(cls, delta: int) -> str:
         if delta == 1:
-            return self.OPENING_BRACKET
+            return cls.OPENING_BRACKET
         elif delta == 0:
-            return self.EOL
+            return cls.EOL
         else:
             return (
-                self.EOL
-                +  (self.CLOSING_BRACKET+self.EOL) * - delta
+                cls.EOL
+                +  (cls.CLOSING_BRACKET+cls.EOL) * - delta
             )
 
-    @property
-    def text(self) -> str:
-        """ Returns the bracketed text. """
-        self.bracketedLines = list(self.lines)
-        # LNBL = Last Non Black Line
-        lnbl_index = -1
+    @classmethod
+    def _inputLines(cls,
+                    source: Union[str, Iterable[str], mmap.mmap]) \
+            -> Iterator[str]:
+        """ Lines of the source without end of line characters. """
+        if isinstance(source, str):
+            source = io.StringIO(source)
+        elif isinstance(source, mmap.mmap):
+            source = (
+                line.decode('utf-8')
+                for line in iter(source.readline, b''))
+        for line in source:
+            yield line.rstrip('\n')
+
+    @classmethod
+    def bracket(cls,
+                source: Union[str, Iterable[str], mmap.mmap]) \
+            -> Iterator[str]:
+        """ Generate the bracketed lines corresponding to the source.
+        Each line is classified only once. The suffix of a non blank
+        line depends on the indentation of the next non blank line
+        so the last non blank line and the blank lines that follow
+        it are kept until this next line is read.
+        Raises:
+            BracketError in case of illegal indentation.
+        """
+        is_blank_line = cls.IS_BLANK_LINE.match
+        space_indent = cls.SPACE_INDENT
+        # LNBL = Last Non Blank Line
+        lnbl = None
         lnbl_indent = 0
-        # take all lines + a extra virtual line to close everything
-        for (index, line) in enumerate(self.lines):
-            if not self._is_blank_line(index):
-                indent = self._line_indent(index)
-                delta = indent-lnbl_indent
-                if self._is_doc_line(index):
-                    self.bracketedLines[index] = (
-                        self._terminate_doc_line(self.bracketedLines[index])
-                    )
-                if delta > 1:
-                    # this will never happened for the last line
-
-                    raise BracketError(  # raise:OK
-                        message = '"%s"' % line,
-                        line=index+1)
+        pending_blank_lines = []
+        for (index, line) in enumerate(cls._inputLines(source)):
+            if is_blank_line(line) is not None:
+                if lnbl is None:
+                    yield line
                 else:
-                    if lnbl_index != -1:
-                        self.bracketedLines[lnbl_index] \
-                            += self._suffix(delta)
-                lnbl_index = index
-                lnbl_indent = indent
+                    pending_blank_lines.append(line)
+                continue
+            blanks = len(line) - len(line.lstrip(' '))
+            if blanks % space_indent != 0:
+                raise BracketError(  # raise:OK
+                    message = '%i spaces found. Multiple of %i expected.'
+                            % (blanks, space_indent),
+                    line = index+1)
+            indent = blanks // space_indent
+            delta = indent-lnbl_indent
+            if delta > 1:
+                # this will never happened for the last line
+                raise BracketError(  # raise:OK
+                    message = '"%s"' % line,
+                    line=index+1)
+            if line.startswith('|', blanks):
+                line += cls.CLOSING_DOC_LINE
+            if lnbl is not None:
+                yield lnbl + cls._suffix(delta)
+                yield from pending_blank_lines
+                pending_blank_lines = []
+            lnbl = line
+            lnbl_indent = indent
 
         # close the last line if any
-        if lnbl_index != -1:
-            delta = 0-lnbl_indent
-            self.bracketedLines[lnbl_index] += self._suffix(delta)
+        if lnbl is not None:
+            yield lnbl + cls._suffix(0-lnbl_indent)
+            yield from pending_blank_lines
+
+    def bracketedLines(self) -> Iterator[str]:
+        """ Generate the bracketed lines. Lines are read from the file
+        unless they have been given when creating the script."""
+        if self.lines is not None:
+            yield from self.bracket(self.lines)
+        else:
+            with open(self.file) as f:
+                yield from self.bracket(f)
 
-        return '\n'.join(self.bracketedLines)
+    @property
+    def text(self) -> str:
+        """ Returns the bracketed text. """
+        return '\n'.join(self.bracketedLines())
 
     def save(self) -> str:
         """ Save the bracked text into the output file.
+        Saving the bracketed text is not necessary for parsing, but
+        it could be useful for debugging. See Config.saveBracketedFiles.
         :return: the name of the output file
         """
-        f = open(self.targetFilename, "w")
-        f.write(self.text)
-        f.close()
+        with open(self.targetFilename, "w") as f:
+            for (index, line) in enumerate(self.bracketedLines()):
+                if index != 0:
+                    f.write('\n')
+                f.write(line)
         return self.targetFilename
 
 
@@ -6,9 +6,15 @@ Grammars, abstract syntax trees, syntax errors
 import os
 import sys
 import re
-from typing import  Dict, ClassVar, Tuple
+import io
+import hashlib
+import pickle
+import copyreg
+from collections.abc import Mapping
+from typing import  Dict, ClassVar, Tuple, Optional
 from typing_extensions import Literal
 
+import textx
 from textx import metamodel_from_str
 from textx.export import (
     metamodel_export,
@@ -22,8 +28,16 @@ from modelscript.base.brackets import (
 from modelscript.base.issues import (
     Level,
     LocalizedSourceIssue)
+from modelscript.base.metrics import (
+    Metric,
+    Metrics)
+from modelscript.base.files import (
+    ensureDir)
+from modelscript.base.profiles import Profile
 from modelscript.base.exceptions import (
     UnexpectedCase)
+from modelscript.interfaces.environment import Environment
+from modelscript.config import Config
 
 """# NOTE: the type TextXNode and TextXModel are to be use for type hints.
 textX generates classes both for models and for metaclass. These classes
@@ -37,6 +51,7 @@ TextXModel = object
 __all__ = (
     'Grammar',
     'Grammars',
+    'GrammarCache',
     'AST',
     'ModelSourceAST',
     'SyntaxError',
@@ -69,12 +84,22 @@ class Grammar(object):
     """Grammar and its metamodel."""
     file: str
     metamodel: TextXMetaModel
+    fromCache: bool
+    """Indicates if the metamodel has been loaded from the cache."""
 
-    def __init__(self, grammarFile: str) -> None:
+    def __init__(self, grammarFile: str, useCache: bool = False) -> None:
         self.file = grammarFile
         full_grammar_text = self._get_grammar_str()
-        self.metamodel = metamodel_from_str(full_grammar_text)
-        self.metamodel.auto_init_attributes = False
+        metamodel = (
+            GrammarCache.load(full_grammar_text) if useCache
+            else None)
+        self.fromCache = metamodel is not None
+        if metamodel is None:
+            metamodel = metamodel_from_str(full_grammar_text)
+            metamodel.auto_init_attributes = False
+            if useCache:
+                GrammarCache.save(full_grammar_text, metamodel)
+        self.metamodel = metamodel
 
     def _get_grammar_str(self) -> str:
         """Get the full grammar text.
@@ -98,18 +123,248 @@ class Grammar(object):
 class Grammars(object):
     """ Factory of grammars.
     This class avoid to create the same grammar multiple times.
+    Within a process grammars are memoized. Across processes
+    metamodels are stored in the GrammarCache unless useCache
+    is set to False (see the --no-grammar-cache option of modelc).
     """
     _grammars: ClassVar[Dict[str, Grammar]] = {}
     """Map of grammars"""
 
+    useCache: ClassVar[bool] = True
+    """Use the persistent GrammarCache."""
+
+    nbCacheHits: ClassVar[int] = 0
+    nbCacheMisses: ClassVar[int] = 0
+
     @classmethod
     def get(cls, grammarFile: str) -> Grammar:
         """Get the grammar corresponding to the given grammar file."""
         if grammarFile not in cls._grammars:
-            grammar = Grammar(grammarFile)
+            grammar = Grammar(grammarFile, useCache=cls.useCache)
+            if cls.useCache:
+                if grammar.fromCache:
+                    cls.nbCacheHits += 1
+                else:
+                    cls.nbCacheMisses += 1
             cls._grammars[grammarFile] = grammar
         return cls._grammars[grammarFile]
 
+    @classmethod
+    def metrics(cls) -> Metrics:
+        return (
+            Metrics()
+            .add(Metric('grammar cache hit', cls.nbCacheHits))
+            .add(Metric(
+                'grammar cache miss', cls.nbCacheMisses,
+                plural='grammar cache misses')))
+
+
+#---------------------------------------------------------------------------
+#   Persistent cache of metamodels
+#---------------------------------------------------------------------------
+# textX metamodels cannot be pickled as is: each grammar rule is
+# represented by a class created on the fly (with its own metaclass)
+# and the model parser class is local to textx.model.get_model_parser.
+# The pickler below save these classes by value; they are rebuilt with
+# equivalent classes when unpickled. The metamodel itself is rebuilt
+# from a fresh one since its type convertors are lambdas. Entries
+# depend on the textX version. Any failure just means that the
+# metamodel is not cached, or is built again if it cannot be loaded.
+
+class _TextXMetaClass(type):
+    """Metaclass of textX classes rebuilt from the cache."""
+    def __repr__(cls):
+        return '<textx:{} class at {}>'.format(cls._tx_fqn, id(cls))
+
+
+def _textXInstanceRepr(self):
+    if hasattr(self, 'name'):
+        return '<{}:{}>'.format(type(self).__name__, self.name)
+    else:
+        return '<textx:{} instance at {}>'.format(
+            self._tx_fqn, hex(id(self)))
+
+
+def _newTextXClass(name, bases):
+    return _TextXMetaClass(name, bases, {'__repr__': _textXInstanceRepr})
+
+
+def _newMetamodel():
+    # type convertors, which are lambdas, are taken from a fresh
+    # metamodel; all other attributes are restored from the cache.
+    return TextXMetaModel()
+
+
+def _newModelParser():
+    from textx.model import get_model_parser
+    return get_model_parser(None, None)
+
+
+_CLASS_ATTRIBUTES_NOT_SAVED = (
+    '__dict__', '__weakref__', '__module__', '__qualname__',
+    '__doc__', '__repr__')
+
+
+def _reduceTextXClass(cls):
+    state = dict(
+        (name, value) for (name, value) in vars(cls).items()
+        if name not in _CLASS_ATTRIBUTES_NOT_SAVED)
+    # With a (None, state) pair attributes are set using setattr
+    return (_newTextXClass, (cls.__name__, cls.__bases__), (None, state))
+
+
+def _reduceMetamodel(metamodel):
+    state = dict(vars(metamodel))
+    state.pop('type_convertors', None)
+    return (_newMetamodel, (), state)
+
+
+def _reduceModelParser(parser):
+    return (_newModelParser, (), dict(vars(parser)))
+
+
+class _MetamodelDispatchTable(Mapping):
+    """Dispatch table for the pickler, see pickle.Pickler.dispatch_table.
+    Types are recognized by name since they are local to textX.
+    Other types are reduced according to the copyreg table.
+    """
+    def __getitem__(self, type_):
+        if type_.__name__ in ('TextXMetaClass', '_TextXMetaClass'):
+            return _reduceTextXClass
+        elif type_.__name__ == 'TextXModelParser':
+            return _reduceModelParser
+        elif type_ is TextXMetaModel:
+            return _reduceMetamodel
+        else:
+            return copyreg.dispatch_table[type_]
+
+    def __iter__(self):
+        return iter(copyreg.dispatch_table)
+
+    def __len__(self):
+        return len(copyreg.dispatch_table)
+
+
+class _MetamodelPickler(pickle.Pickler):
+    dispatch_table = _MetamodelDispatchTable()
+
+    def persistent_id(self, obj):
+        # the debug printer of textX can refer to standard streams
+        if obj is sys.stdout:
+            return 'stdout'
+        elif obj is sys.stderr:
+            return 'stderr'
+        else:
+            return None
+
+
+class _MetamodelUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        return getattr(sys, pid)
+
+
+def _textXVersion() -> Optional[str]:
+    """The version of textX, None if it cannot be found."""
+    version = getattr(textx, '__version__', None)
+    if version is None:
+        try:
+            from importlib.metadata import version as package_version
+            version = package_version('textX')
+        except Exception:  # except:OK
+            return None
+    return str(version)
+
+
+class GrammarCache(object):
+    """Persistent cache of textX metamodels.
+    Metamodels are stored in the directory ~/.mdl/cache/grammars.
+    Each entry is keyed by a hash of the full grammar text (that is
+    including the INCLUDES), the version of textX and the version of
+    python, so there is no need to invalidate entries explicitly.
+    Nothing is cached if the version of textX is unknown.
+    """
+
+    FORMAT: ClassVar[str] = '1'
+    """Version of the cache format. To be changed with the pickler."""
+
+    textXVersion: ClassVar[Optional[str]] = _textXVersion()
+    """The version of textX, part of the keys."""
+
+    _directory: ClassVar[Optional[str]] = None
+
+    @classmethod
+    def directory(cls) -> str:
+        """The cache directory, created on demand."""
+        if cls._directory is None:
+            cls._directory = os.path.join(
+                Environment.getUserModelDir(), 'cache', 'grammars')
+            ensureDir(cls._directory)
+        return cls._directory
+
+    @classmethod
+    def key(cls, grammarText: str) -> Optional[str]:
+        """The key of the grammar text, None if it cannot be cached."""
+        if cls.textXVersion is None:
+            return None
+        h = hashlib.sha1()
+        for part in (
+                cls.FORMAT,
+                cls.textXVersion,
+                '%s.%s' % sys.version_info[:2],
+                grammarText):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    @classmethod
+    def _file(cls, grammarText: str) -> Optional[str]:
+        key = cls.key(grammarText)
+        if key is None:
+            return None
+        return os.path.join(cls.directory(), key+'.pickle')
+
+    @classmethod
+    def load(cls, grammarText: str) -> Optional[TextXMetaModel]:
+        """The metamodel cached for the grammar text or None.
+        None is also returned if the entry cannot be unpickled, so
+        that the metamodel is built again and the entry replaced.
+        """
+        try:
+            filename = cls._file(grammarText)
+            if filename is None or not os.path.isfile(filename):
+                return None
+            with open(filename, 'rb') as f:
+                metamodel = _MetamodelUnpickler(f).load()
+        except Exception:  # except:OK
+            return None
+        if not isinstance(metamodel, TextXMetaModel):
+            return None
+        return metamodel
+
+    @classmethod
+    def save(cls,
+             grammarText: str,
+             metamodel: TextXMetaModel) -> bool:
+        """Save the metamodel. Return False if this is not possible."""
+        try:
+            filename = cls._file(grammarText)
+            if filename is None:
+                return False
+            buffer = io.BytesIO()
+            _MetamodelPickler(
+                buffer,
+                protocol=pickle.HIGHEST_PROTOCOL).dump(metamodel)
+            # Write to a temporary file first so that concurrent
+            # processes never read a partial entry.
+            tmp_filename = '%s.%i.tmp' % (filename, os.getpid())
+            with open(tmp_filename, 'wb') as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_filename, filename)
+            return True
+        except Exception:  # except:OK
+            return False
+
 
 class SyntaxError(object):
     """Syntax error"""
@@ -176,18 +431,28 @@ class AST(object):
 
     grammar: Grammar
     file: str
-    bracketedFile: str
+    bracketedFile: Optional[str]
+    """The bracketed file if saved (see Config.saveBracketedFiles)."""
     model: TextXModel
 
-    def __init__(self, grammar: Grammar, file: str) -> None:
+    def __init__(self,
+                 grammar: Grammar,
+                 file: str,
+                 model: Optional[TextXModel] = None) -> None:
         """
         Create an abstract syntax tree given a file and its grammar.
+        If the textX model is given, it is just instrumented (see (3))
+        as the file has already been parsed (see ParsePool).
         * (1) the source file is first bracketed to deal with indentation,
-        * (2) the bracketed file is then parsed resulting in a textX model,
+        * (2) the bracketed text is then parsed resulting in a textX model,
         * (3) the resulting model (a textX object) is instrumented with
               and an ".ast" attribute that point to this AST object.
               This allows navigating between textX model and this AST
               object.
+        The bracketed text is parsed in memory. Since brackets are
+        added at the end of lines, lines and columns in the bracketed
+        text are the same as in the source file. The bracketed text
+        is saved into a worker file only for debugging purposes.
         Raises:
             This method could raise a TextXError if the analyzer fail
             to recognize a valid file.
@@ -195,10 +460,19 @@ class AST(object):
         self.grammar = grammar
         self.file = file
         self.basename = os.path.basename(self.file)
-        self.bracketedFile = \
-            BracketedScript(self.file).save()
-        self.model = self.grammar.metamodel.model_from_file(
-            self.bracketedFile)
+        bracketed_script = BracketedScript(self.file)
+        if Config.saveBracketedFiles:
+            self.bracketedFile = bracketed_script.save()
+        else:
+            self.bracketedFile = None
+        if model is None:
+            with Profile.phase('bracket'):
+                text = bracketed_script.text
+            with Profile.phase('textx'):
+                model = self.grammar.metamodel.model_from_str(
+                    text,
+                    file_name=self.file)
+        self.model = model
         # instrument textx model with a reference back to this object
         self.model.ast = self
 
@@ -280,12 +554,13 @@ class ModelSourceAST(AST):
     This attribute contains a model source file instead of
     just a plain filename.
     """
-    def __init__(self, grammar, modelSourceFile, fileName):
+    def __init__(self, grammar, modelSourceFile, fileName, model=None):
         self.sourceFile = modelSourceFile
         super(ModelSourceAST, self).__init__(
             grammar=grammar,
             # file=modelSourceFile.fileName
-            file=fileName  # modelSourceFile.fileName
+            file=fileName,  # modelSourceFile.fileName
+            model=model
         )
 
 
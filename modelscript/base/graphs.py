@@ -3,10 +3,13 @@
 
 __all__ = (
     'genPaths',
-    'cycles'
+    'cycles',
+    'reachableNodes',
+    'stronglyConnectedComponents',
+    'topologicalLevels'
 )
 
-from typing import List, Callable, TypeVar
+from typing import Dict, List, Callable, TypeVar
 
 Node = TypeVar('Node')
 GraphEdgesFun = Callable[[Node], List[Node]]
@@ -52,4 +55,126 @@ def cycles(nodes: List[Node],
     return [
         path
         for node in nodes
-            for path in genPaths(successors, node, node)]
\ No newline at end of file
+            for path in genPaths(successors, node, node)]
+
+
+def reachableNodes(start: Node,
+                   successors: GraphEdgesFun) \
+        -> List[Node]:
+    """
+    Return the nodes that can be reached from a node through one
+    edge or more. The start node is therefore included only if it is
+    in a cycle. Nodes are returned in a topological order: the
+    successors of a node come before it (except in cycles).
+    Each node is visited once, so this is linear in the size of
+    the reachable part of the graph even with many shared paths,
+    and iterative so that long chains of nodes do not exceed the
+    recursion limit.
+    """
+    output: List[Node] = []
+    visited = {start}
+    in_cycle = False
+    done = object()
+    work = [(start, iter(successors(start)))]
+    while work:
+        (node, children) = work[-1]
+        child = next(children, done)
+        while child is not done and child in visited:
+            if child == start:
+                in_cycle = True
+            child = next(children, done)
+        if child is not done:
+            visited.add(child)
+            work.append((child, iter(successors(child))))
+        else:
+            work.pop()
+            if work:
+                output.append(node)
+    if in_cycle:
+        output.append(start)
+    return output
+
+
+def stronglyConnectedComponents(nodes: List[Node],
+                                successors: GraphEdgesFun) \
+        -> List[List[Node]]:
+    """
+    Return the strongly connected components of a graph, that is
+    the maximal sets of nodes that can all reach each other.
+    A node which is not in a cycle forms a component by itself.
+    Components are returned in reverse topological order: the
+    successors of a component come before it. Only the given nodes
+    and the nodes reachable from them are considered.
+    This is Tarjan's algorithm, iterative so that long chains of
+    nodes do not exceed the recursion limit. Unlike cycles() this
+    is linear in the size of the graph.
+    """
+    index: Dict[Node, int] = {}
+    low: Dict[Node, int] = {}
+    stack: List[Node] = []
+    on_stack = set()
+    components: List[List[Node]] = []
+    done = object()
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            (node, children) = work[-1]
+            child = next(children, done)
+            while child is not done and child in index:
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+                child = next(children, done)
+            if child is not done:
+                index[child] = low[child] = len(index)
+                stack.append(child)
+                on_stack.add(child)
+                work.append((child, iter(successors(child))))
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.remove(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component[::-1])
+    return components
+
+
+def topologicalLevels(nodes: List[Node],
+                      successors: GraphEdgesFun) \
+        -> List[List[Node]]:
+    """
+    Group the nodes of a graph by levels. The nodes without
+    successors are at level 0 and the other nodes are one level
+    above their highest successor, so the nodes of a level only
+    depend on nodes of previous levels and can be processed
+    independently from each other. The nodes of a cycle are put at
+    the same level. Only the given nodes and the nodes reachable
+    from them are considered.
+    """
+    level_of: Dict[Node, int] = {}
+    levels: List[List[Node]] = []
+    for component in stronglyConnectedComponents(nodes, successors):
+        members = set(component)
+        level = 1 + max(
+            [level_of[s]
+             for node in component
+             for s in successors(node)
+             if s not in members] or [-1])
+        for node in component:
+            level_of[node] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].extend(component)
+    return levels
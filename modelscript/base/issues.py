@@ -3,7 +3,7 @@
 
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, ClassVar
 
 from modelscript.base.annotations import (
     Annotations)
@@ -409,7 +409,27 @@ class IssueBox(object):
     _issuesAtLine[0] are for unlocalized issues.
     """
 
+    _version: ClassVar[int] = 0
+    """Incremented each time an issue or a parent is added to
+    any box. The flattened views below are computed again when
+    the version has changed."""
 
+    _flatVersion: int
+    """The version of the flattened views or -1."""
+
+    _flatParents: List['IssueBox']
+    """All parents, each box once, the parents of a box
+    being before this box (see allParents)."""
+
+    _preorderParents: List['IssueBox']
+    """All parents, each box once, a box being before its
+    parents (see at with parentsFirst=False)."""
+
+    _flatIssues: List[Issue]
+    """All issues, local and parents (see all)."""
+
+    _flatAtLine: Dict[bool, Dict[Optional[int], List[Issue]]]
+    """The issues at each line, parents first or not (see at)."""
 
     def __init__(self,
                  origin: 'WithIssueList',
@@ -421,6 +441,8 @@ class IssueBox(object):
         self._issueList = []
         self.parents = list(parents)
         self._issuesAtLine = OrderedDict()
+        self._flatVersion = -1
+        IssueBox._version += 1
 
         if DEBUG >= 1:
             print(('ISS: New issue box for %s -> %s' % (
@@ -439,6 +461,7 @@ class IssueBox(object):
         if index not in self._issuesAtLine:
             self._issuesAtLine[index] = []
         self._issuesAtLine[index].append(issue)
+        IssueBox._version += 1
 
     def addParent(self, issueBox: 'IssueBox') -> None:
         """Add the issue box as the last parents in the list.
@@ -446,11 +469,36 @@ class IssueBox(object):
         """
         if issueBox not in self.parents:
             self.parents.append(issueBox)
+            IssueBox._version += 1
             if DEBUG >= 1:
                 print(('ISS: Add parent "%s" -> "%s"' % (
                         self.label,
                         issueBox.label)))
 
+    def _flatten(self) -> None:
+        """Compute the flattened views if some box has changed."""
+        if self._flatVersion == IssueBox._version:
+            return
+        parents = []
+        preorder = []
+        seen = {id(self)}
+
+        def visit(box):
+            for p in box.parents:
+                if id(p) not in seen:
+                    seen.add(id(p))
+                    preorder.append(p)
+                    visit(p)
+                    parents.append(p)
+
+        visit(self)
+        self._flatParents = parents
+        self._preorderParents = preorder
+        self._flatIssues = [
+            i for p in parents for i in p._issueList] + self._issueList
+        self._flatAtLine = {}
+        self._flatVersion = IssueBox._version
+
     def at(self,
            lineNo: int,
            parentsFirst: bool = True) \
@@ -458,38 +506,39 @@ class IssueBox(object):
         """Return the list of issues at the specified line.
         If the line is 0 then return unlocalized issues.
         Return both local and parents issues recursively.
+        The issues of a box reachable through different parents
+        are returned once.
         """
-        parent_issues = [
-            i for p in self.parents
-                for i in p.at(lineNo, parentsFirst=parentsFirst) ]
-        self_issues = (
-            [] if lineNo not in self._issuesAtLine
-            else self._issuesAtLine[lineNo])
-        if parentsFirst:
-            return parent_issues+self_issues
-        else:
-            return self_issues+parent_issues
+        self._flatten()
+        if parentsFirst not in self._flatAtLine:
+            boxes = (
+                self._flatParents + [self] if parentsFirst
+                else [self] + self._preorderParents)
+            at_line = {}
+            for box in boxes:
+                for (line, issues) in box._issuesAtLine.items():
+                    at_line.setdefault(line, []).extend(issues)
+            self._flatAtLine[parentsFirst] = at_line
+        return list(self._flatAtLine[parentsFirst].get(lineNo, ()))
 
     @property
     def allParents(self) -> List['IssueBox']:
-        """Return all parents recursively. """
-        return list(
-            x
-            for p in self.parents
-                for x in p.allParents+[p])
+        """Return all parents recursively, each parent once.
+        The parents of a box are before this box. """
+        self._flatten()
+        return list(self._flatParents)
 
     @property
     def all(self):
         """Return both local and parents issues recursively"""
-        return list(
-            [ i for p in self.allParents
-                    for i in p._issueList ]
-            + self._issueList)
+        self._flatten()
+        return list(self._flatIssues)
 
     @property
     def nb(self) -> int:
         """Return the nb of all issues (local and parents)"""
-        return len(self.all)
+        self._flatten()
+        return len(self._flatIssues)
 
     def select(self,
                level: Optional[Level] = None,
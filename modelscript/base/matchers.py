@@ -0,0 +1,162 @@
+# coding=utf-8
+"""Matching of a set of terms in texts.
+
+A TermMatcher finds all the occurrences of a (possibly large) set of
+terms in a text in one pass, whatever the number of terms. This is an
+Aho-Corasick automaton working on words rather than on characters:
+texts and terms are split into words and punctuation marks, so terms
+are only found at word boundaries and spaces between the words of a
+term do not matter. For instance with the terms "bank", "bank account"
+and "account" ::
+
+    >>> m = TermMatcher(['bank', 'bank account', 'account'])
+    >>> [(o.term, o.start) for o in m.occurrences(
+    ...     'The bank account of a bank.')]
+    [('bank account', 4), ('bank', 22)]
+
+Overlapping occurrences are resolved by taking the leftmost and then
+the longest term.
+"""
+
+__all__ = (
+    'TermMatcher',
+    'TermOccurrence',
+)
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD = re.compile(r'\w+|[^\w\s]')
+
+
+def _words(text: str) -> List[Tuple[str, int]]:
+    """The words of a text with their positions."""
+    return [(m.group(), m.start()) for m in _WORD.finditer(text)]
+
+
+class TermOccurrence(object):
+    """An occurrence of a term in a text."""
+
+    def __init__(self, term: str, start: int, end: int) -> None:
+        self.term = term
+        self.start = start
+        """Position of the first character in the text."""
+        self.end = end
+        """Position following the last character in the text."""
+
+    def __repr__(self):
+        return 'TermOccurrence(%r, %i, %i)' % (
+            self.term, self.start, self.end)
+
+
+class TermMatcher(object):
+    """An automaton finding the occurrences of terms in texts.
+    """
+
+    _goto: List[Dict[str, int]]
+    """The transitions of each state, indexed by word.
+    State 0 is the initial state."""
+
+    _fail: List[int]
+    """The state to go to when there is no transition for a word.
+    This is the state of the longest proper suffix of the words read
+    which is a prefix of some term."""
+
+    _term: List[Optional[Tuple[str, int]]]
+    """The term (and its number of words) recognized in each state
+    if any."""
+
+    _next: List[int]
+    """For each state, the nearest state in the failure chain which
+    recognizes a term, or -1."""
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        self._goto = [{}]
+        self._fail = [0]
+        self._term = [None]
+        self._next = [-1]
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term: str) -> None:
+        words = [w for (w, _) in _words(term)]
+        if len(words) == 0:
+            return
+        state = 0
+        for word in words:
+            target = self._goto[state].get(word)
+            if target is None:
+                target = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._term.append(None)
+                self._next.append(-1)
+                self._goto[state][word] = target
+            state = target
+        if self._term[state] is None:
+            self._term[state] = (term, len(words))
+
+    def _link(self) -> None:
+        """Compute failure links, breadth first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for (word, target) in self._goto[state].items():
+                queue.append(target)
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(word, 0)
+                if fail == target:
+                    fail = 0
+                self._fail[target] = fail
+                self._next[target] = (
+                    fail if self._term[fail] is not None
+                    else self._next[fail])
+
+    @property
+    def size(self) -> int:
+        """Number of states of the automaton."""
+        return len(self._goto)
+
+    def allOccurrences(self, text: str) -> List[TermOccurrence]:
+        """All occurrences of terms, including overlapping ones,
+        in the order of their end.
+        """
+        words = _words(text)
+        result = []
+        goto = self._goto
+        fail = self._fail
+        state = 0
+        for (index, (word, _)) in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            found = state if self._term[state] is not None \
+                else self._next[state]
+            while found > 0:
+                (term, length) = self._term[found]
+                (last_word, last_start) = words[index]
+                result.append(TermOccurrence(
+                    term,
+                    words[index-length+1][1],
+                    last_start+len(last_word)))
+                found = self._next[found]
+        return result
+
+    def occurrences(self, text: str) -> List[TermOccurrence]:
+        """The occurrences of terms, without overlaps. The leftmost
+        occurrence is taken first, and then the longest one.
+        """
+        candidates = sorted(
+            self.allOccurrences(text),
+            key=lambda o: (o.start, -o.end))
+        result = []
+        end = -1
+        for occurrence in candidates:
+            if occurrence.start >= end:
+                result.append(occurrence)
+                end = occurrence.end
+        return result
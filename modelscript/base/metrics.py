@@ -63,7 +63,7 @@ class Metrics(object):
         """Add a metric."""
         if metric.label not in self.metricNamed:
             self.metricNamed[metric.label] = \
-                Metric(metric.label, 0)
+                Metric(metric.label, 0, plural=metric.plural)
         self.metricNamed[metric.label].add(metric.n)
         return self
 
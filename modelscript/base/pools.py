@@ -0,0 +1,180 @@
+# coding=utf-8
+"""Parallel parsing of source files.
+
+Bracketing and parsing a source file do not depend on other files,
+so this can be done in worker processes. The ParsePool parses a list
+of files in a pool of processes and keeps the resulting textX models
+until they are requested by ASTBasedModelSourceFile.fillAST. All
+other phases (dependencies, model filling, resolution, ...) are still
+performed in the main process and in the usual order, so the
+resulting megamodel and issues are the same as with a serial run.
+
+textX models are sent back to the main process with a dedicated
+pickler: textX classes and the metamodel are sent by reference and
+bound to the metamodel of the same grammar in the main process.
+"""
+
+__all__ = (
+    'ParsePool',
+)
+
+import io
+import os
+import pickle
+import multiprocessing
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+from textx.exceptions import TextXSyntaxError
+from textx.metamodel import TextXMetaModel
+
+from modelscript.base.brackets import (
+    BracketedScript,
+    BracketError)
+from modelscript.base.grammars import (
+    Grammar,
+    Grammars,
+    TextXModel)
+
+
+def _isTextXClass(obj) -> bool:
+    return (
+        isinstance(obj, type)
+        and type(obj).__name__ in ('TextXMetaClass', '_TextXMetaClass'))
+
+
+class _ModelPickler(pickle.Pickler):
+
+    def __init__(self, file, metamodel):
+        super(_ModelPickler, self).__init__(
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL)
+        self.metamodel = metamodel
+
+    def persistent_id(self, obj):
+        if obj is self.metamodel:
+            return ('metamodel',)
+        elif _isTextXClass(obj):
+            return ('class', obj._tx_fqn)
+        else:
+            return None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, metamodel):
+        super(_ModelUnpickler, self).__init__(file)
+        self.metamodel = metamodel
+
+    def persistent_load(self, pid):
+        if pid[0] == 'metamodel':
+            return self.metamodel
+        else:
+            return self.metamodel[pid[1]]
+
+
+_ParseResult = Tuple
+"""Result of a worker. Either
+*   ('model', bracketedText, pickledModel)
+*   ('bracket', message, line)
+*   ('syntax', message, line, column)
+*   ('none',) when the file should be parsed in the main process.
+"""
+
+
+def _parseInWorker(job: Tuple[str, str]) -> _ParseResult:
+    """Parse a file in a worker process."""
+    (grammar_file, file) = job
+    try:
+        metamodel = Grammars.get(grammar_file).metamodel
+        text = BracketedScript(file).text
+        model = metamodel.model_from_str(text, file_name=file)
+        # The parser is rebuilt in the main process, see ParsePool.take
+        del model._tx_parser
+        buffer = io.BytesIO()
+        _ModelPickler(buffer, metamodel).dump(model)
+        return ('model', text, buffer.getvalue())
+    except BracketError as e:
+        return ('bracket', str(e), e.line)
+    except TextXSyntaxError as e:
+        return ('syntax', e.message, e.line, e.col)
+    except Exception:  # except:OK
+        # The file will be parsed again in the main process
+        # where the error will be reported as usual.
+        return ('none',)
+
+
+class ParsePool(object):
+    """Results of the parsing of source files by worker processes.
+    """
+
+    _results: ClassVar[Dict[str, _ParseResult]] = {}
+    """Results of workers indexed by the real path of files."""
+
+    @classmethod
+    def parseAll(cls,
+                 jobs: List[Tuple[str, str]],
+                 processes: int) -> None:
+        """Parse the given files in a pool of processes.
+        Each job is a pair (grammarFile, fileName).
+        """
+        if len(jobs) == 0:
+            return
+        with multiprocessing.Pool(processes=processes) as pool:
+            results = pool.map(_parseInWorker, jobs, chunksize=1)
+        for ((grammar_file, file), result) in zip(jobs, results):
+            cls._results[os.path.realpath(file)] = result
+
+    @classmethod
+    def take(cls,
+             grammar: Grammar,
+             file: str) -> Optional[TextXModel]:
+        """Return the model parsed by a worker for the given file or
+        None if the file has not been parsed by a worker, or if its
+        model cannot be used (see parser()).
+        The result is removed from the pool.
+        Raises:
+            BracketError or TextXSyntaxError as the regular parser.
+        """
+        result = cls._results.pop(os.path.realpath(file), ('none',))
+        kind = result[0]
+        if kind == 'model':
+            (_, text, data) = result
+            metamodel = grammar.metamodel
+            parser = cls.parser(metamodel, text, file)
+            if parser is None:
+                return None
+            model = _ModelUnpickler(io.BytesIO(data), metamodel).load()
+            model._tx_parser = parser
+            return model
+        elif kind == 'bracket':
+            (_, message, line) = result
+            raise BracketError(message=message, line=line)  # raise:OK
+        elif kind == 'syntax':
+            (_, message, line, column) = result
+            raise TextXSyntaxError(  # raise:OK
+                message=message,
+                line=line,
+                col=column)
+        else:
+            return None
+
+    @staticmethod
+    def parser(metamodel: TextXMetaModel, text: str, file: str):
+        """A parser for a model parsed in another process.
+        A parser is necessary to compute lines and columns.
+        The parser is cloned from the parser blueprint of the
+        metamodel, which is private to textX. None if there is no
+        such blueprint: the file is then parsed again with the
+        regular parser, as if it had not been parsed by a worker."""
+        blueprint = getattr(metamodel, '_parser_blueprint', None)
+        if blueprint is None or not hasattr(blueprint, 'clone'):
+            return None
+        parser = blueprint.clone()
+        parser.input = text
+        parser.file_name = file
+        parser.line_ends = []
+        return parser
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._results = {}
@@ -15,9 +15,11 @@ __all__ = (
 )
 
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from typing import Optional, List, TextIO
 import codecs
+import io
 import os
+import sys
 
 from modelscript.base.files import ensureDir
 from modelscript.base.issues import IssueBox
@@ -108,6 +110,29 @@ class AbstractPrinterConfigs(object):
     
 
 class AbstractPrinter(object, metaclass=ABCMeta):
+    """
+    A printer produces a text with out() and outLine(). The text is
+    either accumulated in a list of chunks (see output) or streamed
+    to a file (see display() and save() with stream=True).
+    """
+
+    STREAM_BUFFER_SIZE = 64*1024
+    """Number of characters buffered before writing to the stream."""
+
+    _chunks: List[str]
+    """The text produced and not yet written to the stream.
+    Chunks are never empty."""
+
+    _nbEOLs: int
+    """The number of end of lines produced so far, including those
+    already written to the stream."""
+
+    _bufferSize: int
+    """The number of characters in the chunks."""
+
+    _stream: Optional[TextIO]
+    """The stream the text is written to or None."""
+
     def __init__(self,
                  config: Optional[AbstractPrinterConfig] = None) \
             -> None:
@@ -116,12 +141,64 @@ class AbstractPrinter(object, metaclass=ABCMeta):
         self.config = config
         self._baseIndent = config.baseIndent
         self.currentLineNoDisplay = True
-        self.output = ''
+        self._chunks = []
+        self._nbEOLs = 0
+        self._bufferSize = 0
+        self._stream = None
         # self.eolAtEOF=eolAtEOF
 
+    @property
+    def output(self) -> str:
+        """The text produced so far. When streaming, the text is
+        written to the stream and output is empty."""
+        if self._stream is not None:
+            return ''
+        if len(self._chunks) >= 2:
+            self._chunks = [''.join(self._chunks)]
+        return self._chunks[0] if self._chunks else ''
+
+    @output.setter
+    def output(self, text: str) -> None:
+        self._nbEOLs += text.count('\n') - self.output.count('\n')
+        self._chunks = [text] if text else []
+        self._bufferSize = len(text)
+
     @property
     def currentLineNo(self):
-        return self.output.count('\n')+1
+        return self._nbEOLs+1
+
+    def _write(self, text: str) -> None:
+        if text == '':
+            return
+        self._chunks.append(text)
+        self._nbEOLs += text.count('\n')
+        self._bufferSize += len(text)
+        if (self._stream is not None
+                and self._bufferSize >= self.STREAM_BUFFER_SIZE):
+            self._flush(keepLastEOL=True)
+
+    def _flush(self, keepLastEOL: bool = False) -> None:
+        """Write the chunks to the stream. The last end of line is
+        kept if requested, so that it can still be removed."""
+        text = ''.join(self._chunks)
+        if keepLastEOL and text.endswith('\n'):
+            self._stream.write(text[:-1])
+            self._chunks = ['\n']
+            self._bufferSize = 1
+        else:
+            self._stream.write(text)
+            self._chunks = []
+            self._bufferSize = 0
+
+    def _endsWithEOL(self) -> bool:
+        return bool(self._chunks) and self._chunks[-1].endswith('\n')
+
+    def _removeLastEOL(self) -> None:
+        last = self._chunks.pop()[:-1]
+        if last:
+            self._chunks.append(last)
+        self._nbEOLs -= 1
+        self._bufferSize -= 1
 
     def kwd(self, text):
         if text == '':
@@ -159,8 +236,8 @@ class AbstractPrinter(object, metaclass=ABCMeta):
     def out(self, s, indent=0, style=None):
         if self.config.styled and style is not None:
             s = style.do(s)
-        self.output += '%s%s' % (self._indentPrefix(indent), s)
-        return self.output
+        self._write(self._indentPrefix(indent))
+        self._write(s)
 
     def endLine(self,
                 suffix='\n'):
@@ -209,10 +286,8 @@ class AbstractPrinter(object, metaclass=ABCMeta):
             for i in range(linesAfter):
                 self.outLine('')
 
-        if removeLastEOL and self.output[-1] == '\n':
-            self.output = self.output[:-1]
-
-        return self.output
+        if removeLastEOL and self._endsWithEOL():
+            self._removeLastEOL()
 
     def _indentPrefix(self, indent=0):
         return ' '*4*(self._baseIndent+indent)
@@ -235,15 +310,41 @@ class AbstractPrinter(object, metaclass=ABCMeta):
         raise MethodToBeDefined()  # raise:OK
 
     def doFull(self, removeLastEOL=False, addLastEOL=True):
-        text = self.do()
-        ends_with_eol = text.endswith('\n')
-        if removeLastEOL and ends_with_eol:
-            text = text[:-1]
-        if addLastEOL and not ends_with_eol:
-            text = text+'\n'
-        return text
-
-    def display(self, removeLastEOL=False, addLastEOL=True):
+        # The text is streamed to a buffer so that intermediate
+        # values of output (returned by the doXXX methods) are
+        # not built.
+        buffer = io.StringIO()
+        self.doStream(
+            buffer,
+            removeLastEOL=removeLastEOL,
+            addLastEOL=addLastEOL)
+        return buffer.getvalue()
+
+    def doStream(self,
+                 stream: TextIO,
+                 removeLastEOL=False,
+                 addLastEOL=True) -> None:
+        """Like doFull() but write the text to the stream as it is
+        produced, without building the whole text in memory."""
+        self._stream = stream
+        try:
+            self.do()
+            ends_with_eol = self._endsWithEOL()
+            if removeLastEOL and ends_with_eol:
+                self._removeLastEOL()
+            if addLastEOL and not ends_with_eol:
+                self._write('\n')
+            self._flush()
+        finally:
+            self._stream = None
+
+    def display(self, removeLastEOL=False, addLastEOL=True, stream=False):
+        if stream:
+            self.doStream(
+                sys.stdout,
+                removeLastEOL=removeLastEOL,
+                addLastEOL=addLastEOL)
+            return
         text = self.doFull(
             removeLastEOL=removeLastEOL,
             addLastEOL=addLastEOL)
@@ -258,9 +359,17 @@ class AbstractPrinter(object, metaclass=ABCMeta):
              outputFile,
              removeLastEOL=False,
              addLastEOL=True,
-             ensureDirectory=True):
+             ensureDirectory=True,
+             stream=False):
         if ensureDirectory:
             ensureDir(os.path.dirname(outputFile))
+        if stream:
+            with codecs.open(outputFile, "w", "utf-8") as f:
+                self.doStream(
+                    f,
+                    removeLastEOL=removeLastEOL,
+                    addLastEOL=addLastEOL)
+            return
         text = self.doFull(
             removeLastEOL=removeLastEOL,
             addLastEOL=addLastEOL)
@@ -0,0 +1,211 @@
+# coding=utf-8
+"""Profiling of the compilation phases.
+
+Phases are delimited with ``Profile.phase`` ::
+
+    with Profile.phase('fillModel', file=self.fileName):
+        self.fillModel()
+
+Nothing is recorded unless the profile is started (see modelc
+--profile). A phase without file is attributed to the file of the
+enclosing phase, so that for instance the checkers run when a model
+is finalized are attributed to the file of the model.
+
+For each file and phase the profile records the number of calls,
+the wall time (including nested phases), the self time (excluding
+nested phases) and, if tracemalloc is used, the memory allocated
+(net, including nested phases). Note that a source file loaded as
+a dependency of another one is nested in the "dependencies" phase
+of the other one.
+"""
+
+__all__ = (
+    'Profile',
+    'PhaseRecord',
+)
+
+import json
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+
+class PhaseRecord(object):
+    """Measures of a phase for a file."""
+
+    def __init__(self, file: Optional[str], phase: str) -> None:
+        self.file = file
+        self.phase = phase
+        self.calls = 0
+        self.wall = 0.0
+        """Wall time in seconds, nested phases included."""
+        self.self = 0.0
+        """Wall time in seconds, nested phases excluded."""
+        self.allocated = 0
+        """Net allocated memory in bytes, nested phases included."""
+
+    def json(self) -> Dict[str, object]:
+        return OrderedDict([
+            ('file', self.file),
+            ('phase', self.phase),
+            ('calls', self.calls),
+            ('wall', self.wall),
+            ('self', self.self),
+            ('allocated', self.allocated)])
+
+
+class _Frame(object):
+    """A phase in progress."""
+
+    def __init__(self, record: PhaseRecord, memory: int) -> None:
+        self.record = record
+        self.memory = memory
+        self.nested = 0.0
+        self.start = time.perf_counter()
+
+
+class _Phase(object):
+    """Context manager recording a phase."""
+
+    def __init__(self, phase: str, file: Optional[str]) -> None:
+        self.phase = phase
+        self.file = file
+
+    def __enter__(self):
+        Profile._enter(self.phase, self.file)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Profile._exit()
+        return False
+
+
+class _NoPhase(object):
+    """Context manager used when the profile is not started."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class Profile(object):
+
+    enabled: ClassVar[bool] = False
+
+    traceAllocations: ClassVar[bool] = False
+
+    records: ClassVar[Dict[Tuple[Optional[str], str], PhaseRecord]] \
+        = OrderedDict()
+    """Records by file and phase, in the order of their first call."""
+
+    _stack: ClassVar[List[_Frame]] = []
+
+    @classmethod
+    def start(cls, traceAllocations: bool = True) -> None:
+        """Start recording phases. Tracing allocations with
+        tracemalloc slows down the execution noticeably."""
+        cls.enabled = True
+        cls.traceAllocations = traceAllocations
+        if traceAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        cls.enabled = False
+        if cls.traceAllocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.records = OrderedDict()
+        cls._stack = []
+
+    @classmethod
+    def phase(cls, phase: str, file: Optional[str] = None):
+        """A context manager recording the given phase."""
+        if cls.enabled:
+            return _Phase(phase, file)
+        else:
+            return _NO_PHASE
+
+    @classmethod
+    def _memory(cls) -> int:
+        if cls.traceAllocations and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        else:
+            return 0
+
+    @classmethod
+    def _enter(cls, phase: str, file: Optional[str]) -> None:
+        if file is None and cls._stack:
+            file = cls._stack[-1].record.file
+        key = (file, phase)
+        if key not in cls.records:
+            cls.records[key] = PhaseRecord(file, phase)
+        cls._stack.append(_Frame(cls.records[key], cls._memory()))
+
+    @classmethod
+    def _exit(cls) -> None:
+        frame = cls._stack.pop()
+        duration = time.perf_counter() - frame.start
+        record = frame.record
+        record.calls += 1
+        record.wall += duration
+        record.self += duration - frame.nested
+        record.allocated += cls._memory() - frame.memory
+        if cls._stack:
+            cls._stack[-1].nested += duration
+
+    @classmethod
+    def table(cls) -> str:
+        """A table of records by file and then by phase."""
+        header = ['file', 'phase', 'calls', 'wall ms', 'self ms']
+        if cls.traceAllocations:
+            header.append('alloc KiB')
+        rows = [header]
+        files = list(OrderedDict.fromkeys(
+            r.file for r in cls.records.values()))
+        for file in files:
+            for r in cls.records.values():
+                if r.file != file:
+                    continue
+                row = [
+                    '-' if r.file is None else os.path.basename(r.file),
+                    r.phase,
+                    str(r.calls),
+                    '%.1f' % (r.wall * 1000),
+                    '%.1f' % (r.self * 1000)]
+                if cls.traceAllocations:
+                    row.append('%.0f' % (r.allocated / 1024))
+                rows.append(row)
+        widths = [
+            max(len(row[i]) for row in rows)
+            for i in range(len(header))]
+        lines = []
+        for (index, row) in enumerate(rows):
+            lines.append('  '.join(
+                c.ljust(w) if i <= 1 else c.rjust(w)
+                for (i, (c, w)) in enumerate(zip(row, widths))))
+            if index == 0:
+                lines.append('  '.join('-' * w for w in widths))
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def json(cls) -> str:
+        return json.dumps(
+            OrderedDict([
+                ('version', 1),
+                ('traceAllocations', cls.traceAllocations),
+                ('records', [r.json() for r in cls.records.values()])]),
+            indent=2)
+
+    @classmethod
+    def save(cls, fileName: str) -> None:
+        with open(fileName, 'w') as f:
+            f.write(cls.json())
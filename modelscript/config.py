@@ -14,6 +14,7 @@ class Config(object):
     realtimeIssuePrint=0
     realtimeUSE=0
     realtimeCheckers=0
+    saveBracketedFiles=0
 
 modules={
     'USE':'modelscript.use.engine',
@@ -0,0 +1,300 @@
+# coding=utf-8
+"""Incremental builds.
+
+The build state records for each source file analyzed by modelc
+the hash of its content, the real paths of the files it imports
+(the targets of the SourceImports of its ImportBox) and its issues.
+With the --incremental option a source file given on the command line
+is not analyzed again if its content and the content of all the files
+it depends on transitively are unchanged. Its issues are just replayed
+from the build state.
+
+The state is saved in ~/.mdl/cache/builds, one file per analysis
+level, and entries are indexed by the real path of source files.
+A state recorded with other options changing the issues (for instance
+--unreferenced-terms) is ignored.
+"""
+
+__all__ = (
+    'BuildState',
+    'CachedSourceFile',
+    'CachedIssue',
+)
+
+import hashlib
+import json
+import os
+from typing import ClassVar, Dict, List, Optional, Any
+
+from modelscript.base.files import ensureDir
+from modelscript.base.issues import (
+    Issue,
+    Levels,
+    LocalizedSourceIssue,
+    WithIssueList)
+from modelscript.base.annotations import Annotations
+from modelscript.base.exceptions import NotFound
+from modelscript.base.graphs import stronglyConnectedComponents
+from modelscript.interfaces.environment import Environment
+from modelscript.megamodels import Megamodel
+
+Entry = Dict[str, Any]
+"""Build information about a source file. A json dictionary with
+"hash", "label", "imports" and "issues" keys."""
+
+
+def fileHash(filename: str) -> Optional[str]:
+    """The hash of the content of a file or None if it cannot be read.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:  # except:OK
+        return None
+
+
+class CachedIssue(Issue):
+    """An issue replayed from the build state.
+    Cached issues are displayed exactly as the original ones but
+    they are not localized and do not raise FatalError.
+    """
+
+    def __init__(self,
+                 origin: 'CachedSourceFile',
+                 record: Dict[str, str]) -> None:
+        # Issue.__init__ is not called: a cached fatal issue
+        # must not stop the execution.
+        self.level = Levels.fromCode(record['level'])
+        self.message = record['message']
+        self.code = record['code']
+        self.origin = origin
+        self.record = record
+        self.origin._issueBox._add(self)
+
+    @classmethod
+    def recordOf(cls, issue: Issue) -> Dict[str, str]:
+        """The json representation of an issue."""
+        if isinstance(issue, LocalizedSourceIssue):
+            origin = issue.location.sourceFile.basename
+            line = str(issue.location.line)
+        else:
+            origin = issue.originLabel
+            line = '-'
+        return {
+            'level': issue.level.code,
+            'kind': issue.kind,
+            'origin': origin,
+            'line': line,
+            'message': issue.message,
+            'code': issue.code}
+
+    @property
+    def kind(self):
+        return self.record['kind']
+
+    def str(self,
+            pattern=None,
+            styled=False,
+            prefix=''):
+        if pattern is None:
+            pattern = (
+                Annotations.prefix
+                + ('{kind}:{level}:{origin}:{message}'
+                   if self.record['line'] == '-'
+                   else '{kind}:{level}:{origin}:{line}:{message}'))
+        text = pattern.format(
+            origin=self.record['origin'],
+            level=self.level.str(),
+            kind=self.kind,
+            location='-',
+            line=self.record['line'],
+            message=self.message)
+        return self.level.style.do(
+            prefix + text,
+            styled=styled)
+
+
+class CachedSourceFile(WithIssueList):
+    """A source file that has not been analyzed again.
+    It just contains the issues replayed from the build state.
+    """
+
+    def __init__(self,
+                 buildState: 'BuildState',
+                 path: str,
+                 entry: Entry) -> None:
+        self.buildState = buildState
+        self.path = path
+        self.entry = entry
+        super(CachedSourceFile, self).__init__()
+        for record in entry['issues']:
+            CachedIssue(self, record)
+
+    @property
+    def label(self):
+        return self.entry['label']
+
+    @property
+    def basename(self):
+        return os.path.basename(self.path)
+
+    @property
+    def usedSourceFiles(self) -> List[Any]:
+        return [
+            self.buildState.sourceFile(path)
+            for path in self.entry['imports']]
+
+
+class BuildState(object):
+    """Information about source files collected by previous builds.
+    """
+
+    FORMAT: ClassVar[str] = '1'
+    """Version of the build state format."""
+
+    _directory: ClassVar[Optional[str]] = None
+
+    mode: str
+    """The analysis level. Each level has its own build state."""
+
+    analysisOptions: Dict[str, Any]
+    """The other options set that change the issues reported (see
+    ExecutionContext.ANALYSIS_OPTIONS). A build state recorded with
+    other options is ignored."""
+
+    entries: Dict[str, Entry]
+    """Build information indexed by the real path of source files."""
+
+    _upToDate: Dict[str, bool]
+    """Memoization of isUpToDate."""
+
+    _cachedSourceFiles: Dict[str, CachedSourceFile]
+
+    def __init__(self,
+                 mode: str,
+                 analysisOptions: Optional[Dict[str, Any]] = None) -> None:
+        self.mode = mode
+        self.analysisOptions = (
+            {} if analysisOptions is None else analysisOptions)
+        self.entries = {}
+        self._upToDate = {}
+        self._cachedSourceFiles = {}
+        self.load()
+
+    @classmethod
+    def directory(cls) -> str:
+        """The build state directory, created on demand."""
+        if cls._directory is None:
+            cls._directory = os.path.join(
+                Environment.getUserModelDir(), 'cache', 'builds')
+            ensureDir(cls._directory)
+        return cls._directory
+
+    @property
+    def fileName(self) -> str:
+        return os.path.join(self.directory(), self.mode + '.json')
+
+    @property
+    def _stamp(self) -> List[str]:
+        """Build states saved with another stamp are ignored."""
+        return [
+            self.FORMAT,
+            Megamodel.model.version,
+            self.mode,
+            self.analysisOptions]
+
+    def load(self) -> None:
+        """Load the build state. A missing or invalid state is
+        considered as empty.
+        """
+        try:
+            with open(self.fileName) as f:
+                data = json.load(f)
+            if data['stamp'] == self._stamp:
+                self.entries = data['files']
+        except Exception:  # except:OK
+            self.entries = {}
+
+    def save(self) -> bool:
+        """Save the build state. Return False if this is not possible."""
+        try:
+            tmp_file = '%s.%i.tmp' % (self.fileName, os.getpid())
+            with open(tmp_file, 'w') as f:
+                json.dump(
+                    {'stamp': self._stamp, 'files': self.entries},
+                    f)
+            os.replace(tmp_file, self.fileName)
+            return True
+        except Exception:  # except:OK
+            return False
+
+    def isUpToDate(self, filename: str) -> bool:
+        """Indicates if the issues recorded for the file are still
+        valid, that is if neither the file nor the files it depends
+        on transitively have changed since they have been recorded.
+        The files of an import cycle are up to date or not together.
+        """
+        path = os.path.realpath(filename)
+        if path not in self._upToDate:
+            # components come after the components they import
+            for component in stronglyConnectedComponents(
+                    [path], self._recordedImports):
+                if component[0] in self._upToDate:
+                    continue
+                up_to_date = (
+                    all(self._isUnchanged(p) for p in component)
+                    and all(
+                        self._upToDate[i]
+                        for p in component
+                        for i in self.entries[p]['imports']
+                        if i not in component))
+                for p in component:
+                    self._upToDate[p] = up_to_date
+        return self._upToDate[path]
+
+    def _recordedImports(self, path: str) -> List[str]:
+        """The files imported by a file according to the build
+        state. Files already checked are not explored again."""
+        entry = self.entries.get(path)
+        if entry is None or path in self._upToDate:
+            return []
+        else:
+            return entry['imports']
+
+    def _isUnchanged(self, path: str) -> bool:
+        entry = self.entries.get(path)
+        return entry is not None and entry['hash'] == fileHash(path)
+
+    def sourceFile(self, filename: str) -> Any:
+        """The source file loaded in the megamodel for the given file
+        if any, otherwise a CachedSourceFile replaying the issues
+        recorded for this file.
+        """
+        path = os.path.realpath(filename)
+        try:
+            return Megamodel.sourceFile(path=path)
+        except NotFound:
+            if path not in self._cachedSourceFiles:
+                self._cachedSourceFiles[path] = CachedSourceFile(
+                    self, path, self.entries[path])
+            return self._cachedSourceFiles[path]
+
+    def record(self, sourceFiles: List[Any]) -> None:
+        """Record the build information of the source files that
+        have been analyzed. Cached source files are left unchanged.
+        """
+        for source in sourceFiles:
+            if isinstance(source, CachedSourceFile):
+                continue
+            hash_ = fileHash(source.path)
+            if hash_ is None:
+                continue
+            self.entries[source.path] = {
+                'hash': hash_,
+                'label': source.label,
+                'imports': [
+                    source_import.target.path
+                    for source_import in source.importBox.imports],
+                'issues': [
+                    CachedIssue.recordOf(issue)
+                    for issue in source.issues.all]}
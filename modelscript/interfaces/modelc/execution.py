@@ -12,10 +12,27 @@ import argparse
 
 # initialize the megamodel with metamodels and scripts
 
+from modelscript.base.exceptions import NotFound
 from modelscript.base.files import filesInTree
+from modelscript.base.graphs import stronglyConnectedComponents
+from modelscript.base.grammars import Grammars
+from modelscript.base.pools import ParsePool
+from modelscript.base.profiles import Profile
+from modelscript.config import Config
 from modelscript.interfaces.modelc.options import getOptions
+from modelscript.interfaces.modelc.builds import BuildState
 from modelscript.megamodels import Megamodel
-from modelscript.base.issues import WithIssueList, OrderedIssueBoxList
+from modelscript.megamodels.checkers import CheckList
+from modelscript.megamodels.pools import AnalysisPool
+from modelscript.metamodels.textblocks import WithTextBlocks
+from modelscript.scripts.megamodels.scanner import ImportGraph
+from modelscript.tools.use.engine import USEEngine
+from modelscript.tools.use.engine.results import USEResultCache
+from modelscript.base.issues import (
+    LocalizedSourceIssue,
+    Levels,
+    WithIssueList,
+    OrderedIssueBoxList)
 
 
 class ExecutionContext(WithIssueList):
@@ -24,12 +41,26 @@ class ExecutionContext(WithIssueList):
     args: ClassVar[List[str]]
     """The list of command line arguments"""
 
+    ANALYSIS_OPTIONS: ClassVar[List[str]] = ['unreferencedTerms']
+    """The options, besides --mode, that change the issues reported.
+    Build states recorded with other values are ignored."""
+
     options: argparse.Namespace
     """The options derived from args."""
 
     sourceMap: ClassVar[Dict[str, Optional['SourceFile']]]
     """For each source file name, the corresponding SourceFile
-    or None if there was an error
+    or None if there was an error. With --incremental this can also
+    be a CachedSourceFile if the file has not been analyzed again.
+    """
+
+    buildState: Optional[BuildState]
+    """The state of previous builds with --incremental, None otherwise.
+    """
+
+    importGraph: Optional[ImportGraph]
+    """The import graph of the given source files and of the files
+    they import, computed from their megamodel part before parsing.
     """
 
     issueBoxList: OrderedIssueBoxList
@@ -43,6 +74,8 @@ class ExecutionContext(WithIssueList):
         self.options = getOptions(args)
         # self.hasManySourceFiles=len(self.options.sources)>=2
         self.sourceMap = OrderedDict()
+        self.buildState = None
+        self.importGraph = None
         self._execute()
         self.issueBoxList = OrderedIssueBoxList(
             self.allSourceFileList
@@ -51,24 +84,136 @@ class ExecutionContext(WithIssueList):
     def _displayVersion(self):
         print(('ModelScript - version %s' % Megamodel.model.version))
 
-    def _processSource(self, path):
-        """Process a given source file or a given directory.
+    def _sourceFilenames(self, path, verbose=False):
+        """The source files corresponding to a given path.
         If a directory is given, then get all source files in
         this directory recursively."""
         if os.path.isdir(path):
             # A directory is given: process all nested source files.
             extensions = Megamodel.model.metamodelExtensions()
             filenames = filesInTree(path, suffix=extensions)
-            if self.options.verbose:
+            if verbose:
                 print(('%s/  %i model files found.'
                       % (path, len(filenames))))
                 print(('    '+'\n    '.join(filenames)))
-            for filename in filenames:
-                self._processSource(filename)
+            return filenames
         else:
-            # Load a given source file
-            source = Megamodel.loadFile(path, self)
-            self.sourceMap[path] = source
+            return [path]
+
+    def _processSource(self, path):
+        """Process a given source file or a given directory.
+        If a directory is given, then get all source files in
+        this directory recursively."""
+        for filename in self._sourceFilenames(
+                path,
+                verbose=self.options.verbose):
+            if (self.buildState is not None
+                    and self.buildState.isUpToDate(filename)):
+                # Replay the issues of the previous build
+                source = self.buildState.sourceFile(filename)
+            else:
+                # Load a given source file
+                source = Megamodel.loadFile(filename, self)
+            self.sourceMap[filename] = source
+
+    def _scanImports(self):
+        """Compute the import graph of the given source files
+        with the scanner."""
+        with Profile.phase('scan'):
+            self.importGraph = ImportGraph([
+                filename
+                for path in self.options.sources
+                for filename in self._sourceFilenames(path)
+                if os.path.isfile(filename)])
+
+    def _isAllowedImport(self, path, headerImport):
+        """Indicates if fillDependencies accepts the import. Otherwise
+        it reports the import itself."""
+        source_metamodel = Megamodel.fileMetamodel(path)
+        try:
+            target_metamodel = Megamodel.theMetamodel(
+                label=headerImport.metamodelLabel)
+        except ValueError:  # except:OK
+            return False
+        return (
+            source_metamodel is not None
+            and target_metamodel in source_metamodel.outMetamodels)
+
+    def _reportImportCycles(self):
+        """Report the import cycles of the import graph made only of
+        allowed imports. Other cycles are already reported by the
+        megamodel parser. A warning is added to each source file of
+        a cycle, at the line of its first import within the cycle.
+        """
+        graph = self.importGraph
+
+        def allowed_targets(path):
+            header = graph.headers[path]
+            return [] if header is None else [
+                os.path.realpath(i.absoluteTargetFilename)
+                for i in header.imports
+                if self._isAllowedImport(path, i)]
+
+        for component in graph.cycles:
+            members = set(component)
+            successors = {
+                path: [t for t in allowed_targets(path) if t in members]
+                for path in component}
+            for cycle in stronglyConnectedComponents(
+                    component, lambda path: successors[path]):
+                if len(cycle) == 1 and cycle[0] not in successors[cycle[0]]:
+                    continue
+                names = ', '.join(os.path.basename(p) for p in cycle)
+                for path in cycle:
+                    try:
+                        source = Megamodel.sourceFile(path=path)
+                    except NotFound:
+                        continue
+                    line = min(
+                        i.lineNo for i in graph.headers[path].imports
+                        if os.path.realpath(i.absoluteTargetFilename)
+                        in cycle)
+                    LocalizedSourceIssue(
+                        sourceFile=source,
+                        level=Levels.Warning,
+                        message='Import cycle between %s.' % names,
+                        line=line,
+                        code='mgm.sem.Import.Cycle')
+
+    def _parseSourcesInParallel(self, filenames):
+        """Parse the given files in a pool of processes.
+        The models are then taken from the pool when files are loaded.
+        """
+        jobs = [
+            (Megamodel.fileMetamodel(filename).sourceClass
+                .defaultGrammarFile(),
+             filename)
+            for filename in filenames]
+        if len(jobs) >= 2:
+            ParsePool.parseAll(jobs, processes=self.options.jobs)
+
+    def _analyzeSourcesInParallel(self):
+        """Analyze the files of the import graph, that is the given
+        source files and the files they import, level by level with
+        a pool of processes (see AnalysisPool). The files analyzed in
+        the main process are parsed in parallel before. The source
+        files are then found in the megamodel when files are loaded.
+        Files up to date are replayed as usual.
+        """
+        exclude = []
+        if self.buildState is not None:
+            exclude = [
+                path for path in self.importGraph.paths
+                if self.buildState.isUpToDate(path)]
+        levels = self.importGraph.levels
+        self._parseSourcesInParallel(AnalysisPool.mainFiles(
+            levels,
+            processes=self.options.jobs,
+            exclude=exclude))
+        AnalysisPool.analyzeAll(
+            levels,
+            processes=self.options.jobs,
+            exclude=exclude)
 
     def _execute(self):
 
@@ -76,6 +221,14 @@ class ExecutionContext(WithIssueList):
         if self.options.version:
             self._displayVersion()
 
+        # --- deal with --profile / --profile-json -------------------------
+        if self.options.profile or self.options.profileJSON is not None:
+            Profile.clear()
+            Profile.start()
+
+        # --- deal with --verbose -----------------------------------------
+        CheckList.recordTimings = self.options.verbose
+
         # --- deal with --mode --------------------------------------------
         print((
             {'justAST': 'Checking syntax',
@@ -84,9 +237,76 @@ class ExecutionContext(WithIssueList):
             [self.options.mode]))
         Megamodel.analysisLevel = self.options.mode
 
+        # --- deal with --no-grammar-cache --------------------------------
+        Grammars.useCache = self.options.grammarCache
+
+        # --- deal with --no-use-cache ------------------------------------
+        USEResultCache.enabled = self.options.useCache
+
+        # --- deal with --save-bracketed ----------------------------------
+        Config.saveBracketedFiles = self.options.saveBracketed
+
+        # --- deal with --unreferenced-terms ------------------------------
+        WithTextBlocks.detectUnreferencedTerms = \
+            self.options.unreferencedTerms
+
+        # --- deal with --use-sessions ------------------------------------
+        if self.options.useSessions > 0:
+            USEEngine.startSessions(self.options.useSessions)
+
+        # --- deal with --incremental ----------------------------------
+        if self.options.incremental:
+            self.buildState = BuildState(
+                self.options.mode,
+                analysisOptions={
+                    name: getattr(self.options, name)
+                    for name in self.ANALYSIS_OPTIONS
+                    if getattr(self.options, name)})
+
+        # --- compute the import graph ------------------------------------
+        self._scanImports()
+
+        # --- deal with --jobs ---------------------------------------------
+        if self.options.jobs > 1:
+            self._analyzeSourcesInParallel()
+
         # --- deal with source files or source dir
         for path in self.options.sources:
             self._processSource(path)
+        ParsePool.clear()
+        self._reportImportCycles()
+
+        if self.buildState is not None:
+            self.buildState.record(self.allSourceFileList)
+            self.buildState.save()
+
+        # --- deal with --permission-matrix --------------------------
+        if self.options.permissionMatrix is not None:
+            self._exportPermissionMatrices(self.options.permissionMatrix)
+
+        if self.options.verbose and self.options.grammarCache:
+            print(Grammars.metrics(), end='')
+        if self.options.verbose:
+            print(CheckList.timingReport(), end='')
+
+    def _exportPermissionMatrices(self, fileName):
+        """Export the matrix of each valid permission model.
+        With several permission models the name of the source file
+        is added before the extension of the file name."""
+        from modelscript.scripts.permissions.matrices import exportMatrix
+        sources = [
+            s for s in self.allSourceFileList
+            if s.metamodel.id == 'pe' and s.isValid]
+        for source in sources:
+            if len(sources) == 1:
+                target = fileName
+            else:
+                (base, extension) = os.path.splitext(fileName)
+                name = os.path.splitext(os.path.basename(source.fileName))[0]
+                target = '%s-%s%s' % (base, name, extension)
+            exportMatrix(source.model.permissionMatrix, target)
+            print('Permission matrix of %s saved in %s' % (
+                source.fileName, target))
 
     @property
     def validSourceFiles(self):
@@ -104,14 +324,30 @@ class ExecutionContext(WithIssueList):
         The list of all source files involved in this build,
         directly or not. The list is in a topological order.
         """
-        return Megamodel.sourceFileList(
-            origins=self.validSourceFiles)
+        origins = list(self.validSourceFiles)
+        if self.buildState is not None:
+            # A file that has been replayed could have been loaded
+            # later as the dependency of a file analyzed again.
+            origins = [
+                self.buildState.sourceFile(source.path)
+                for source in origins]
+        return Megamodel.sourceFileList(origins=origins)
 
     def label(self):
         return 'executionContext'
 
     def display(self, styled=True):
-        print((self.issueBoxList.str(styled=styled)))
+        with Profile.phase('display'):
+            print((self.issueBoxList.str(styled=styled)))
+        if Profile.enabled:
+            self._reportProfile()
+
+    def _reportProfile(self):
+        Profile.stop()
+        if self.options.profile:
+            print(Profile.table(), end='')
+        if self.options.profileJSON is not None:
+            Profile.save(self.options.profileJSON)
 
         # displayIssueBoxContainers(
         #     self.allSourceFileList+[self]
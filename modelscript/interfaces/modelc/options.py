@@ -86,6 +86,88 @@ def _argParser():
         choices=['justAST', 'justASTDep', 'full'],
         type=str,
         nargs='?')
+    parser.add_argument(
+        '--jobs', '-j',
+        dest='jobs',
+        default=1,
+        type=int,
+        help='number of processes used to parse and analyze source files.')
+    parser.add_argument(
+        '--incremental',
+        dest='incremental',
+        action='store_true',
+        default=False,
+        help='only analyze source files changed since the last build.')
+    parser.add_argument(
+        '--watch',
+        dest='watch',
+        action='store_true',
+        default=False,
+        help='check the sources again each time a file changes.')
+    parser.add_argument(
+        '--interval',
+        dest='interval',
+        default=1.0,
+        type=float,
+        help='delay in seconds between two checks for changes.')
+    parser.add_argument(
+        '--serve',
+        dest='serve',
+        metavar='PORT',
+        default=None,
+        type=int,
+        help='answer check requests on the given local port.')
+    parser.add_argument(
+        '--unreferenced-terms',
+        dest='unreferencedTerms',
+        action='store_true',
+        default=False,
+        help='report glossary terms used without reference.')
+    parser.add_argument(
+        '--permission-matrix',
+        dest='permissionMatrix',
+        metavar='FILE',
+        default=None,
+        help='export the permission matrix of permission models '
+             'to a .csv or .json file.')
+    parser.add_argument(
+        '--use-sessions',
+        dest='useSessions',
+        metavar='N',
+        type=int,
+        default=0,
+        help='execute soil files in at most N persistent USE OCL '
+             'processes, one per .use model.')
+    parser.add_argument(
+        '--profile',
+        dest='profile',
+        action='store_true',
+        default=False,
+        help='display the time and memory spent per file and phase.')
+    parser.add_argument(
+        '--profile-json',
+        dest='profileJSON',
+        metavar='FILE',
+        default=None,
+        help='save the profile in a json file.')
+    parser.add_argument(
+        '--no-grammar-cache',
+        dest='grammarCache',
+        action='store_false',
+        default=True,
+        help='do not use the persistent cache of grammars.')
+    parser.add_argument(
+        '--no-use-cache',
+        dest='useCache',
+        action='store_false',
+        default=True,
+        help='do not use the persistent cache of USE OCL results.')
+    parser.add_argument(
+        '--save-bracketed',
+        dest='saveBracketed',
+        action='store_true',
+        default=False,
+        help='debug: save bracketed files in .mdl directories.')
     parser.add_argument(
         '--verbose', '-v',
         dest='verbose',
@@ -124,6 +206,12 @@ def _updateConfig(options: argparse.Namespace) -> None:
 def getOptions(args: List[str]) -> argparse.Namespace:
     parser = _argParser()
     options = parser.parse_args(args)
+    if (options.permissionMatrix is not None
+            and not options.permissionMatrix.lower().endswith(
+                ('.csv', '.json'))):
+        parser.error('--permission-matrix: .csv or .json file expected')
+    if options.useSessions < 0:
+        parser.error('--use-sessions: positive number expected')
     if FULL_INTERFACE:
         _updateConfig(options)
     return options
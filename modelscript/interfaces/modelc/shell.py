@@ -27,6 +27,12 @@ from modelscript.libs.termcolor import cprint
 try:
     bc = ExecutionContext(sys.argv[1:])
     bc.display()
+    if bc.options.serve is not None:
+        from modelscript.interfaces.modelc.watch import Watcher
+        Watcher(bc).serve(bc.options.serve)
+    elif bc.options.watch:
+        from modelscript.interfaces.modelc.watch import Watcher
+        Watcher(bc).watch(bc.options.interval)
 except Exception as ex:
     title = ' SYSTEM ERROR in %s '
     cprint(title.center(80, '!'), 'red')
@@ -0,0 +1,185 @@
+# coding=utf-8
+"""Watch and server modes of modelc.
+
+Starting modelc is costly: all metapackages are imported, grammars
+are built and the metamodel registry is filled. In watch and server
+modes modelc keeps running with a warm megamodel. Each time a source
+file changes, only the corresponding source file and the source files
+that depend on it are removed from the megamodel. They are analyzed
+again during the next check while other source files are reused.
+
+Changes are detected by polling the modification time and the size
+of files:
+
+*   "modelc --watch <sources>" checks the sources again and displays
+    the issues each time a change is detected.
+
+*   "modelc --serve <port> <sources>" waits for check requests on the
+    local port. A request is a line with modelc arguments (for
+    instance "-m justAST model.cls"). Relative file names are
+    relative to the directory where the server has been started.
+    The response is the list of issues, without color, and then
+    the connection is closed. The sources given at the start of the
+    server are checked when a request has no source.
+"""
+
+__all__ = (
+    'Watcher',
+)
+
+import os
+import socketserver
+import time
+from typing import Dict, List, Optional, Tuple
+
+from modelscript.base.exceptions import NotFound
+from modelscript.megamodels import Megamodel
+from modelscript.interfaces.modelc.execution import ExecutionContext
+from modelscript.interfaces.modelc.options import getOptions
+
+FileStamp = Tuple[int, int]
+"""Modification time (in ns) and size of a file."""
+
+
+def _fileStamp(filename: str) -> Optional[FileStamp]:
+    try:
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:  # except:OK
+        return None
+
+
+class Watcher(object):
+    """Check sources with a warm megamodel each time they change.
+    """
+
+    args: List[str]
+    """The modelc arguments (without watch/serve options) used
+    for checks."""
+
+    executionContext: ExecutionContext
+    """The result of the last check."""
+
+    stamps: Dict[str, Optional[FileStamp]]
+    """File stamps at the time of the last check, indexed by the
+    real path of files."""
+
+    def __init__(self, executionContext: ExecutionContext) -> None:
+        self.args = self._checkArgs(executionContext.args)
+        self.executionContext = executionContext
+        self.stamps = self._currentStamps()
+
+    @classmethod
+    def _checkArgs(cls, args: List[str]) -> List[str]:
+        """Remove watch and serve options from the arguments."""
+        output = []
+        skip = False
+        for arg in args:
+            if skip:
+                skip = False
+            elif arg in ('--watch', '--interval', '--serve'):
+                skip = arg != '--watch'
+            elif arg.startswith(('--interval=', '--serve=')):
+                pass
+            else:
+                output.append(arg)
+        return output
+
+    def _watchedFiles(self) -> List[str]:
+        """The files loaded in the megamodel and the files found
+        in the sources given.
+        """
+        files = [source.path for source in Megamodel.sourceFiles()]
+        for path in self.executionContext.options.sources:
+            files.extend(
+                os.path.realpath(f)
+                for f in self.executionContext._sourceFilenames(path))
+        return files
+
+    def _currentStamps(self) -> Dict[str, Optional[FileStamp]]:
+        return {f: _fileStamp(f) for f in self._watchedFiles()}
+
+    def changedFiles(self) -> List[str]:
+        """The files changed, created or deleted since the last check.
+        """
+        current = self._currentStamps()
+        return [
+            f for f in set(current) | set(self.stamps)
+            if current.get(f) != self.stamps.get(f)]
+
+    def invalidate(self, files: List[str]) -> List[str]:
+        """Remove the source files of the given files as well as
+        the source files depending on them from the megamodel.
+        Return the paths of the source files removed.
+        """
+        removed = []
+        for path in files:
+            try:
+                source = Megamodel.sourceFile(path=path)
+            except NotFound:
+                continue
+            for s in [source] + Megamodel.dependentSourceFiles(source):
+                if s.path not in removed:
+                    removed.append(s.path)
+                    Megamodel.unregisterSourceFile(s)
+        return removed
+
+    def check(self, args: Optional[List[str]] = None) -> ExecutionContext:
+        """Invalidate changed files and check the sources again.
+        """
+        self.invalidate(self.changedFiles())
+        context = ExecutionContext(self.args if args is None else args)
+        if args is None:
+            self.executionContext = context
+        self.stamps = self._currentStamps()
+        return context
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Check and display the sources each time a file changes.
+        Stop on keyboard interruption.
+        """
+        try:
+            while True:
+                time.sleep(interval)
+                if self.changedFiles():
+                    self.check().display()
+        except KeyboardInterrupt:
+            pass
+
+    def server(self, port: int) -> socketserver.TCPServer:
+        """A server answering check requests on a local port.
+        Requests are processed one at a time since the megamodel is
+        shared.
+        """
+        watcher = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline().decode('utf-8')
+                args = watcher._checkArgs(line.split())
+                try:
+                    if not getOptions(args).sources:
+                        args += watcher.executionContext.options.sources
+                except SystemExit:
+                    # argparse exits on wrong arguments
+                    text = 'wrong arguments: %s' % line.strip()
+                else:
+                    context = watcher.check(args)
+                    text = context.issueBoxList.str(styled=False)
+                self.wfile.write((text + '\n').encode('utf-8'))
+
+        return _LocalServer(('localhost', port), Handler)
+
+    def serve(self, port: int) -> None:
+        """Answer check requests on a local port until keyboard
+        interruption.
+        """
+        with self.server(port) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+
+class _LocalServer(socketserver.TCPServer):
+    allow_reuse_address = True
@@ -1,13 +1,15 @@
 # coding=utf-8
 """Library to define model checkers of various kind."""
 
-from typing import Dict, List, ClassVar, Any
+from typing import Dict, List, ClassVar, Any, Tuple, Optional
 import collections
+import time
 from abc import ABCMeta, abstractmethod
 
 
 from modelscript.base.issues import (
     Levels)
+from modelscript.base.profiles import Profile
 from modelscript.megamodels.issues import (
     ModelElementIssue)
 from modelscript.base.exceptions import (
@@ -36,6 +38,10 @@ class Checker(object, metaclass=ABCMeta):
                 '%s do not define metaclasses' % self.name)
         self.metaclasses = params.get('metaclasses')
         self.level = params.get('level', Levels.Error)
+        self.code = 'cck.%s.%s' % (
+            '_'.join([mc.__name__ for mc in self.metaclasses]),
+            self.name)
+        """The code of the issues produced by the checker."""
         CheckList.registerChecker(self)
 
 
@@ -57,6 +63,20 @@ class CheckList(object):
 
     checkersForClass: ClassVar[Dict['MetaClass', List[Checker]]] \
         = collections.OrderedDict()
+    """The checkers registered for each metaclass."""
+
+    _dispatchTable: ClassVar[Dict[type, Tuple[Checker, ...]]] = {}
+    """The checkers applying to each type of element, that is the
+    checkers registered for the type or one of its superclasses.
+    Computed on demand and reset when a checker is registered."""
+
+    timings: ClassVar[Dict[str, List[float]]] = collections.OrderedDict()
+    """For each checker name, the number of elements checked and
+    the time spent in seconds. Only filled if recordTimings."""
+
+    recordTimings: ClassVar[bool] = False
+    """Whether timings are recorded (modelc --verbose). Checkers
+    are also timed in the "check.<name>" phases of the profile."""
 
     @classmethod
     def registerChecker(cls, checker):
@@ -72,36 +92,81 @@ class CheckList(object):
                 cbc[c]=[]
 
             cbc[c].append(checker)
+        CheckList._dispatchTable = {}
+
+    @classmethod
+    def checkersFor(cls, type_: type) -> Tuple[Checker, ...]:
+        """The checkers applying to the instances of a type, following
+        the method resolution order. A checker registered for many
+        superclasses is applied once."""
+        if type_ not in CheckList._dispatchTable:
+            checkers = []
+            for c in type_.__mro__:
+                for checker in CheckList.checkersForClass.get(c, ()):
+                    if checker not in checkers:
+                        checkers.append(checker)
+            CheckList._dispatchTable[type_] = tuple(checkers)
+        return CheckList._dispatchTable[type_]
 
     @classmethod
     def check(cls, element):
-        c=type(element)
+        checkers = cls.checkersFor(type(element))
         if DEBUG >= 3:
-            print('CKK: CHECKING %25s' % c.__name__, end='')
-        if c in CheckList.checkersForClass:
-            checkers = CheckList.checkersForClass[c]
-            if DEBUG >= 3:
-                print('-> [%s]' % (
-                    ','.join([c.name for c in checkers])))
-            for checker in checkers:
+            print('CKK: CHECKING %25s -> [%s]' % (
+                type(element).__name__,
+                ','.join([c.name for c in checkers])))
+        timed = cls.recordTimings or Profile.enabled
+        for checker in checkers:
+            if timed:
+                check_output=cls._timedCheck(checker, element)
+            else:
                 check_output=checker.doCheck(element)
-                metaclasses_part='_'.join(
-                    [mc.__name__ for mc in checker.metaclasses])
-                code = 'cck.%s.%s' % (
-                    metaclasses_part,
-                    checker.__class__.__name__)
-                if check_output is not None:
-                    ModelElementIssue(
-                        modelElement=element,
-                        code=code,
-                        level=checker.level,
-                        message=check_output.message,
-                        locationElement=
-                            check_output.locationElement
-                    )
-        else:
-            if DEBUG >= 3:
-                print('-> []')
+            if check_output is not None:
+                ModelElementIssue(
+                    modelElement=element,
+                    code=checker.code,
+                    level=checker.level,
+                    message=check_output.message,
+                    locationElement=
+                        check_output.locationElement
+                )
+
+    @classmethod
+    def _timedCheck(cls, checker, element):
+        start = time.perf_counter()
+        with Profile.phase('check.%s' % checker.name):
+            check_output=checker.doCheck(element)
+        if cls.recordTimings:
+            timing = cls.timings.setdefault(checker.name, [0, 0.0])
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+        return check_output
+
+    @classmethod
+    def checkTree(cls, root) -> int:
+        """Check an element and all its descendants (see
+        ModelElement.children), in depth first order. Each element
+        is checked once even if it is reachable in many ways.
+        Return the number of elements checked."""
+        seen = set()
+        stack = [root]
+        while stack:
+            element = stack.pop()
+            if id(element) in seen:
+                continue
+            seen.add(id(element))
+            cls.check(element)
+            stack.extend(reversed(element.children))
+        return len(seen)
+
+    @classmethod
+    def timingReport(cls) -> str:
+        """The time spent by each checker, slowest first."""
+        return ''.join(
+            '%s: %i element(s), %.3f ms\n' % (name, n, seconds * 1000)
+            for (name, (n, seconds)) in sorted(
+                cls.timings.items(),
+                key=lambda item: -item[1][1]))
 
 
 class PassChecker(Checker):
@@ -130,8 +130,6 @@ class SourceImport(SourceFileDependency):
 
             # --- case 2: imported file has never been registered!
             #    process it and get it
-            origin_sourcefile = importStmt.modelSourceFile
-            used_metamodels = origin_sourcefile.allUsedMetamodels
             # print('QQ'*40+'Importing '+str(importStmt))
             imported_source_file = self._doImport(importStmt)
 
@@ -79,19 +79,19 @@ class ModelElement(object, metaclass=ABCMeta):
     @property
     def children(self):
         r = []
+        seen = set()
         if hasattr(self, 'META_COMPOSITIONS'):
             for child_name in getattr(self, 'META_COMPOSITIONS'):
                 l = py.getObjectValues(
                     self, child_name, asList=True)
                 for e in l:
-                    if e not in r:
+                    if id(e) not in seen:
+                        seen.add(id(e))
                         r.append(e)
         return r
 
     def check(self):
-        CheckList.check(self)
-        for child in self.children:
-            child.check()
+        CheckList.checkTree(self)
 
 
 class SourceModelElement(ModelElement, SourceElement, metaclass=ABCMeta):
@@ -17,6 +17,11 @@ class _IssueBoxRegistry(object):
     def registerIssueBox(cls, issueBox):
         cls._issueBoxes.append(issueBox)
 
+    @classmethod
+    def unregisterIssueBox(cls, issueBox):
+        if issueBox in cls._issueBoxes:
+            cls._issueBoxes.remove(issueBox)
+
     @classmethod
     def issueBoxes(cls):
         return cls._issueBoxes
@@ -4,7 +4,7 @@ This module provides a unique mixin _MetamodelRegistry to be
 included in the Megamodel class.
 """
 
-from typing import Dict, Text, List, Optional, ClassVar
+from typing import Dict, Text, List, Optional, ClassVar, Callable
 from collections import OrderedDict
 from modelscript.base.exceptions import (
     UnexpectedValue,
@@ -46,6 +46,13 @@ class _MetamodelRegistry(object):
         ClassVar[List[MetamodelDependency]]\
         = []
 
+    _metamodelLoaders: \
+        ClassVar[Dict[str, List[Callable[[], object]]]] \
+        = OrderedDict()
+    """For each metamodel id, the functions importing the
+    implementation of the metamodel (parser, printers, checkers...)
+    that have not been called yet. See loadMetamodel."""
+
     # --------------------------------------------------
     #    Registering metamodels and dependencies
     # --------------------------------------------------
@@ -59,6 +66,37 @@ class _MetamodelRegistry(object):
         Megamodel._metamodelByLabel[metamodel.label] = metamodel
         Megamodel._metamodelByExtension[metamodel.extension] = metamodel
 
+    @classmethod
+    def registerMetamodelLoader(
+            cls,
+            id: str,
+            loader: Callable[[], object]) -> None:
+        """ Register a function importing a part of the
+        implementation of a metamodel. The function is called only
+        when the metamodel is loaded.
+        """
+        from modelscript.megamodels import Megamodel
+        Megamodel._metamodelLoaders.setdefault(id, []).append(loader)
+
+    @classmethod
+    def loadMetamodel(cls, id: str) -> None:
+        """ Import the implementation of a metamodel if not done yet.
+        This is done on demand when the source class or a printer of
+        the metamodel is requested, so that only the metamodels of the
+        files processed are imported.
+        """
+        from modelscript.megamodels import Megamodel
+        loaders = Megamodel._metamodelLoaders.pop(id, [])
+        for loader in loaders:
+            loader()
+
+    @classmethod
+    def loadAllMetamodels(cls) -> None:
+        """ Import the implementation of all metamodels. """
+        from modelscript.megamodels import Megamodel
+        for id in list(Megamodel._metamodelLoaders):
+            cls.loadMetamodel(id)
+
     @classmethod
     def metamodels(cls):
         #type: () -> List[Metamodel]
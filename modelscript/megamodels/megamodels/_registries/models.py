@@ -40,6 +40,16 @@ class _ModelRegistry(object):
         Dict[Model, List[ModelDependency]] \
         = OrderedDict()
 
+    _modelDependenciesByTarget: \
+        ClassVar[Dict[Model, List[ModelDependency]]] \
+        = {}
+
+    _modelDependencyVersion: \
+        ClassVar[int] \
+        = 0
+    """Incremented each time model dependencies change. This allows
+    to memoize information computed from model dependencies."""
+
     # --------------------------------------------------
     #    Registering models and dependencies
     # --------------------------------------------------
@@ -59,6 +69,28 @@ class _ModelRegistry(object):
             # This avoid having undefined index later
             cls._modelDependenciesBySource[model] = []
 
+    @classmethod
+    def unregisterModel(cls, model: Model) -> None:
+        """Remove a model from the megamodel as well as the model
+        dependencies from or to this model.
+        """
+        from modelscript.megamodels import Megamodel
+        if model not in cls._allModels:
+            return
+        cls._allModels.remove(model)
+        cls._modelsByMetamodel[model.metamodel].remove(model)
+        cls._modelDependenciesBySource.pop(model, None)
+        for (source, deps) in cls._modelDependenciesBySource.items():
+            deps[:] = [d for d in deps if d.targetModel != model]
+        cls._modelDependenciesByTarget.pop(model, None)
+        for (target, deps) in cls._modelDependenciesByTarget.items():
+            deps[:] = [d for d in deps if d.sourceModel != model]
+        cls._allModelDependencies[:] = [
+            d for d in cls._allModelDependencies
+            if model not in (d.sourceModel, d.targetModel)]
+        _ModelRegistry._modelDependencyVersion += 1
+        Megamodel.unregisterIssueBox(model._issueBox)
+
     @classmethod
     def registerModelDependency(cls,
                                 modelDependency: ModelDependency)\
@@ -81,7 +113,11 @@ class _ModelRegistry(object):
             Megamodel._modelDependenciesBySource[
                 s
             ].append(modelDependency)
+            if t not in cls._modelDependenciesByTarget:
+                cls._modelDependenciesByTarget[t] = []
+            cls._modelDependenciesByTarget[t].append(modelDependency)
             cls._allModelDependencies.append(modelDependency)
+            _ModelRegistry._modelDependencyVersion += 1
             return modelDependency
 
     # --------------------------------------------------
@@ -110,10 +146,10 @@ class _ModelRegistry(object):
     @classmethod
     def _inModelDependencies(cls, targetModel: Model) \
         -> List[ModelDependency]:
-        return [
-            d for d in cls._allModelDependencies
-            if d.targetModel == targetModel
-        ]
+        if targetModel not in cls._modelDependenciesByTarget:
+            return []
+        else:
+            return cls._modelDependenciesByTarget[targetModel]
 
     @classmethod
     def modelDependencies(cls,
@@ -151,6 +187,11 @@ class _ModelRegistry(object):
                 if m_dep.metamodelDependency == metamodelDependency
             ]
 
+    @classmethod
+    def modelDependencyVersion(cls) -> int:
+        """A number changing each time model dependencies change."""
+        return _ModelRegistry._modelDependencyVersion
+
     @classmethod
     def modelDependency(cls, source: Model, target: Model) \
             -> Optional[ModelDependency]:
@@ -5,10 +5,12 @@ included in the Megamodel class.
 """
 
 from collections import OrderedDict
-from typing import List, Dict, Optional, ClassVar
+from typing import List, Dict, Optional, ClassVar, Tuple
 
 from modelscript.base.exceptions import (
     NotFound)
+from modelscript.base.graphs import (
+    reachableNodes)
 
 DEBUG = 0
 
@@ -54,6 +56,13 @@ class _SourceFileRegistry(object):
         ClassVar[Dict[Metamodel, List[SourceFileDependency]]] \
         = {}
 
+    _sourceFileClosures: \
+        ClassVar[Dict[Tuple[str, ModelSourceFile], List[ModelSourceFile]]] \
+        = {}
+    """Source files used or using a source file, directly or not,
+    indexed by ('used'|'using', source). Cleared each time source
+    dependencies change."""
+
     # --------------------------------------------------
     #    Registering sources and dependencies
     # --------------------------------------------------
@@ -100,6 +109,7 @@ class _SourceFileRegistry(object):
         Megamodel.registerModel(target.model)
 
         cls._allSourceFileDependencies.append(sourceDependency)
+        cls._sourceFileClosures.clear()
 
         # BySource
         if source not in cls._sourceFileDependenciesBySource:
@@ -114,6 +124,44 @@ class _SourceFileRegistry(object):
         # Model dependency creation is done in constructor
         # of SourceFileDependency. Nothing to do here.
 
+    @classmethod
+    def unregisterSourceFile(cls, source: ModelSourceFile) -> None:
+        """Remove a source from the megamodel as well as its model
+        and the source dependencies from or to this source.
+        This is used to analyze the source again when the file has
+        changed. The source files that depend on it should be
+        unregistered as well (see dependentSourceFiles).
+        """
+        if DEBUG >= 1:
+            print(('RSC: unregisterSourceFile(%s)' % source.fileName))
+        if cls._sourceFileByPath.get(source.path) is not source:
+            # not registered, or another source for the same path
+            return
+        cls._allSourceFiles.remove(source)
+        del cls._sourceFileByPath[source.path]
+        cls._sourceFilesByMetamodel[source.metamodel].remove(source)
+
+        deps = (
+            cls._outSourceDependencies(source)
+            + cls._inSourceDependencies(source))
+        cls._allSourceFileDependencies[:] = [
+            d for d in cls._allSourceFileDependencies
+            if d not in deps]
+        for dep in deps:
+            for (index, key) in [
+                    (cls._sourceFileDependenciesBySource, dep.source),
+                    (cls._sourceFileDependenciesByTarget, dep.target)]:
+                if key in index and dep in index[key]:
+                    index[key].remove(dep)
+        cls._sourceFileDependenciesBySource.pop(source, None)
+        cls._sourceFileDependenciesByTarget.pop(source, None)
+        cls._sourceFileClosures.clear()
+
+        from modelscript.megamodels import Megamodel
+        Megamodel.unregisterIssueBox(source._issueBox)
+        if source.model is not None:
+            Megamodel.unregisterModel(source.model)
+
     # --------------------------------------------------
     #    Retrieving information from the megamodel
     # --------------------------------------------------
@@ -206,6 +254,52 @@ class _SourceFileRegistry(object):
                 if dep.metamodelDependency == metamodelDependency
             ]
 
+    @classmethod
+    def _sourceFileClosure(cls, direction: str, source: ModelSourceFile) \
+            -> List[ModelSourceFile]:
+        key = (direction, source)
+        if key not in cls._sourceFileClosures:
+            if direction == 'used':
+                successors = (lambda s: [
+                    d.target for d in cls._outSourceDependencies(s)])
+            else:
+                successors = (lambda s: [
+                    d.source for d in cls._inSourceDependencies(s)])
+            cls._sourceFileClosures[key] = reachableNodes(
+                source, successors)
+        return list(cls._sourceFileClosures[key])
+
+    @classmethod
+    def usedSourceFileClosure(cls, source: ModelSourceFile) \
+            -> List[ModelSourceFile]:
+        """Return the source files used by the given source,
+        directly or not. Used source files come before the source
+        files using them. The source itself is not included unless
+        there is a cycle. The result is memoized until source
+        dependencies change.
+        """
+        return cls._sourceFileClosure('used', source)
+
+    @classmethod
+    def usingSourceFileClosure(cls, source: ModelSourceFile) \
+            -> List[ModelSourceFile]:
+        """Return the source files that depend on the given
+        source, directly or not. Source files using others come
+        before them. The source itself is not included unless there
+        is a cycle. The result is memoized until source dependencies
+        change.
+        """
+        return cls._sourceFileClosure('using', source)
+
+    @classmethod
+    def dependentSourceFiles(cls, source: ModelSourceFile) \
+            -> List[ModelSourceFile]:
+        """Return the source files that depend on the given
+        source, directly or not. The source itself is not included
+        unless there is a cycle.
+        """
+        return cls.usingSourceFileClosure(source)
+
     @classmethod
     def sourceDependency(cls,
                          source: ModelSourceFile,
@@ -220,28 +314,31 @@ class _SourceFileRegistry(object):
 
     @classmethod
     def sourceFileList(cls, origins=None):
+        """Return the origins (all source files by default) and the
+        source files they use, directly or not, each used source
+        file coming before the source files using it (except in
+        cycles). The usedSourceFiles of each source is used so
+        that sources that are not registered can be listed as well.
+        """
         if origins is None:
             origins = cls.sourceFiles()
-        visited = []
+        visited = set()
         output = []
-        # def visit(source_file):
-        #     if source_file not in visited:
-        #         visited.insert(0, source_file)
-        #         for x in source_file.usedSourceFiles:
-        #             if x not in visited:
-        #                 visit(x)
-        # for x in origins:
-        #     visit(x)
-
-        def visit(source_file):
-            if source_file not in visited:
-                visited.append(source_file)
-                for x in source_file.usedSourceFiles:
-                    if x not in visited:
-                        visit(x)
-                output.append(source_file)
-
-        for x in list(origins):
-            visit(x)
-
+        done = object()
+        for origin in list(origins):
+            if origin in visited:
+                continue
+            visited.add(origin)
+            work = [(origin, iter(origin.usedSourceFiles))]
+            while work:
+                (source_file, used) = work[-1]
+                x = next(used, done)
+                while x is not done and x in visited:
+                    x = next(used, done)
+                if x is not done:
+                    visited.add(x)
+                    work.append((x, iter(x.usedSourceFiles)))
+                else:
+                    work.pop()
+                    output.append(source_file)
         return output
@@ -1,6 +1,8 @@
 # coding=utf-8
 """Metamodel with its description (label, extension, kinds) but
 also implementation (modelClass, sourceClass, printer Classes).
+The source and printer classes are registered by the scripts of the
+metamodel, which are imported the first time one of them is needed.
 """
 
 from typing import Text, Callable, Optional, List
@@ -73,6 +75,8 @@ class Metamodel(MegamodelElement):
 
     @property
     def sourceClass(self):
+        if self._sourceClass is None:
+            self._load()
         if self._sourceClass is None:
             raise NoSuchFeature(  # raise:OK
                 'Incomplete metamodel. '
@@ -83,6 +87,8 @@ class Metamodel(MegamodelElement):
 
     @property
     def modelPrinterClass(self):
+        if self._modelPrinterClass is None:
+            self._load()
         if self._modelPrinterClass is None:
             raise NoSuchFeature(  # raise:OK
                 'Incomplete metamodel. '
@@ -93,6 +99,8 @@ class Metamodel(MegamodelElement):
 
     @property
     def sourcePrinterClass(self):
+        if self._sourcePrinterClass is None:
+            self._load()
         if self._sourcePrinterClass is None:
             raise NoSuchFeature(  # raise:OK
                 'Incomplete metamodel. '
@@ -102,6 +110,8 @@ class Metamodel(MegamodelElement):
 
     @property
     def diagramPrinterClass(self):
+        if self._diagramPrinterClass is None:
+            self._load()
         if self._diagramPrinterClass is None:
             raise NoSuchFeature(  # raise:OK
                 'Incomplete metamodel. '
@@ -109,6 +119,11 @@ class Metamodel(MegamodelElement):
         else:
             return self._diagramPrinterClass
 
+    def _load(self):
+        """ Import the scripts of the metamodel if not done yet. """
+        from modelscript.megamodels import Megamodel
+        Megamodel.loadMetamodel(self.id)
+
     def registerSource(self, cls):
         self._sourceClass = cls
 
@@ -0,0 +1,327 @@
+# coding=utf-8
+"""Parallel analysis of source files.
+
+Files of the same level of the import graph (see ImportGraph.levels)
+do not depend on each other, for instance object models or scenarios
+importing the same class model. Once the files of the previous levels
+are loaded, the files of a level can therefore be analyzed
+(parsing, dependencies, fillModel, resolve and finalize) in worker
+processes. The AnalysisPool schedules the levels one after the other.
+Levels with a single file to analyze are analyzed in the main process.
+
+Workers are forked from the main process so they share all the
+objects existing before the fork, in particular the models already
+loaded. A completed source file is sent back to the main process with
+a dedicated pickler: objects existing before the fork are sent by
+reference (the object with the same id in the main process) and the
+textX parser is rebuilt in the main process as for the ParsePool.
+The new source files, models, dependencies and issue boxes
+are then registered in the megamodel of the main process.
+
+Changes made by a worker to objects existing before the fork would
+be lost. A worker therefore checks that the analysis created exactly
+one source file and did not add issues to existing issue boxes.
+The analysis may also add back-references to the model elements
+of imported models, for instance the occurrences of glossary entries.
+Items appended to the list attributes of existing model elements
+(and models) are therefore sent back as well and appended in the
+main process. If such a list is changed otherwise, or as when
+something cannot be pickled, the file is simply analyzed again in
+the main process. Other changes, for instance to dictionaries or to
+new attributes, are not detected: they are supposed to be caches.
+The time spent in workers is not recorded by the profiler.
+"""
+
+__all__ = (
+    'AnalysisPool',
+)
+
+import gc
+import io
+import multiprocessing
+import os
+import pickle
+import sys
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+from modelscript.base.exceptions import (
+    NotFound,
+    NoSuchFeature)
+from modelscript.base.grammars import Grammars
+from modelscript.base.issues import IssueBox
+from modelscript.base.pools import ParsePool
+from modelscript.megamodels import Megamodel
+from modelscript.megamodels.elements import ModelElement
+from modelscript.megamodels.models import Model
+from modelscript.megamodels.sources import ASTBasedModelSourceFile
+
+
+_REGISTRIES = (
+    # attributes of Megamodel with the new elements to register
+    '_allSourceFiles',
+    '_allModels',
+    '_allSourceFileDependencies',
+    '_allModelDependencies',
+    '_issueBoxes',
+)
+
+
+class _SharedPickler(pickle.Pickler):
+    """Send objects existing before the fork by reference."""
+
+    def __init__(self, file, shared, parsers):
+        super(_SharedPickler, self).__init__(
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+        self.parsers = parsers
+
+    def persistent_id(self, obj):
+        if id(obj) in self.shared and self.shared[id(obj)] is obj:
+            return ('shared', id(obj))
+        elif id(obj) in self.parsers:
+            (metamodel, parser) = self.parsers[id(obj)]
+            return (
+                'parser', id(metamodel), parser.input, parser.file_name)
+        else:
+            return None
+
+
+class _SharedUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, shared):
+        super(_SharedUnpickler, self).__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        if pid[0] == 'shared':
+            return self.shared[pid[1]]
+        else:
+            (_, metamodel_id, text, file) = pid
+            return ParsePool.parser(self.shared[metamodel_id], text, file)
+
+
+def _listSignature(element: Any) -> Dict[str, Tuple[int, int]]:
+    """The length and the id of the last item of each list attribute
+    of an element."""
+    return {
+        name: (len(value), id(value[-1]) if value else 0)
+        for (name, value) in vars(element).items()
+        if type(value) is list}
+
+
+def _appendedItems(element: Any,
+                   signature: Dict[str, Tuple[int, int]]) \
+        -> Optional[List[Tuple[str, list]]]:
+    """The items appended to the list attributes of an element since
+    the signature was computed, or None if some list was changed in
+    another way."""
+    appended = []
+    for (name, (length, last)) in signature.items():
+        value = vars(element).get(name)
+        if (type(value) is not list
+                or len(value) < length
+                or (length and id(value[length-1]) != last)):
+            return None
+        if len(value) > length:
+            appended.append((name, value[length:]))
+    return appended
+
+
+_AnalysisResult = Tuple
+"""Result of a worker. Either
+*   ('source', pickledSourceAndNewElements)
+*   ('none',) when the file should be analyzed in the main process.
+"""
+
+
+def _analyzeInWorker(file: str) -> _AnalysisResult:
+    """Analyze a file in a worker process."""
+    try:
+        marks = {
+            name: len(getattr(Megamodel, name))
+            for name in _REGISTRIES}
+        boxes = {
+            id(box): (len(box._issueList), len(box.parents))
+            for box in Megamodel._issueBoxes}
+        source = Megamodel.loadFile(file)
+        if source is None:
+            return ('none',)
+        new = {
+            name: getattr(Megamodel, name)[marks[name]:]
+            for name in _REGISTRIES}
+        if new['_allSourceFiles'] != [source]:
+            # some imported files were not loaded before
+            return ('none',)
+        for box in Megamodel._issueBoxes[:len(boxes)]:
+            if (len(box._issueList), len(box.parents)) != boxes[id(box)]:
+                return ('none',)
+        back_references = []
+        for (element, signature) in AnalysisPool._watched.values():
+            appended = _appendedItems(element, signature)
+            if appended is None:
+                return ('none',)
+            back_references.extend(
+                (element, name, items) for (name, items) in appended)
+        parsers = {}
+        if getattr(source, 'ast', None) is not None:
+            parser = source.ast.model._tx_parser
+            parsers[id(parser)] = (source.grammar.metamodel, parser)
+        buffer = io.BytesIO()
+        _SharedPickler(buffer, AnalysisPool._shared, parsers).dump(
+            (source, new, back_references))
+        return ('source', buffer.getvalue())
+    except Exception:  # except:OK
+        # The file will be analyzed again in the main process
+        # where errors will be reported as usual.
+        return ('none',)
+    finally:
+        # workers are terminated without flushing their output
+        sys.stdout.flush()
+
+
+class AnalysisPool(object):
+    """Analysis of the files of an import graph, level by level,
+    in a pool of processes."""
+
+    nbWorkerAnalyses: ClassVar[int] = 0
+    """Number of files analyzed in workers."""
+
+    nbMainAnalyses: ClassVar[int] = 0
+    """Number of files analyzed in the main process."""
+
+    _shared: ClassVar[Optional[Dict[int, Any]]] = None
+    """Objects existing before the fork indexed by id."""
+
+    _watched: ClassVar[Optional[Dict[int, Tuple[Any, Dict]]]] = None
+    """Model elements and models existing before the fork, indexed
+    by id, with the signature of their list attributes."""
+
+    @classmethod
+    def isAvailable(cls) -> bool:
+        """Workers must be forked to share the models already
+        loaded."""
+        return 'fork' in multiprocessing.get_all_start_methods()
+
+    @classmethod
+    def _factory(cls, file: str) -> Optional[type]:
+        """The source class of the file if it is ASTBased."""
+        mm = Megamodel.fileMetamodel(file)
+        if mm is None:
+            return None
+        try:
+            factory = mm.sourceClass
+        except NoSuchFeature:
+            return None
+        if issubclass(factory, ASTBasedModelSourceFile):
+            return factory
+        else:
+            return None
+
+    @classmethod
+    def _isLoaded(cls, file: str) -> bool:
+        try:
+            Megamodel.sourceFile(path=os.path.realpath(file))
+            return True
+        except NotFound:
+            return False
+
+    @classmethod
+    def _files(cls, level: List[str], exclude: List[str]) -> List[str]:
+        """The files of a level to analyze."""
+        return [
+            f for f in level
+            if f not in exclude
+            and not cls._isLoaded(f)
+            and cls._factory(f) is not None]
+
+    @classmethod
+    def _inWorkers(cls, files: List[str], processes: int) -> bool:
+        return (
+            processes >= 2
+            and len(files) >= 2
+            and cls.isAvailable())
+
+    @classmethod
+    def mainFiles(cls,
+                  levels: List[List[str]],
+                  processes: int,
+                  exclude: List[str] = ()) -> List[str]:
+        """The files that analyzeAll will analyze in the main process,
+        for instance to parse them in parallel before (see ParsePool).
+        Files analyzed in workers are parsed by workers.
+        """
+        files = []
+        for level in levels:
+            level_files = cls._files(level, exclude)
+            if not cls._inWorkers(level_files, processes):
+                files.extend(level_files)
+        return files
+
+    @classmethod
+    def analyzeAll(cls,
+                   levels: List[List[str]],
+                   processes: int,
+                   exclude: List[str] = ()) -> None:
+        """Load the files of the given levels, in order, analyzing
+        in parallel the files of a level. Files already loaded,
+        without parser or in exclude are ignored.
+        """
+        for level in levels:
+            files = cls._files(level, exclude)
+            if cls._inWorkers(files, processes):
+                cls._analyzeInWorkers(files, processes)
+            for file in files:
+                if not cls._isLoaded(file):
+                    Megamodel.loadFile(file)
+                    cls.nbMainAnalyses += 1
+
+    @classmethod
+    def _analyzeInWorkers(cls,
+                          files: List[str],
+                          processes: int) -> None:
+        # Scripts and grammars are loaded before the fork so that
+        # textX classes are shared.
+        for file in files:
+            Grammars.get(cls._factory(file).defaultGrammarFile())
+        cls._shared = {id(o): o for o in gc.get_objects()}
+        cls._watched = {
+            key: (o, _listSignature(o))
+            for (key, o) in cls._shared.items()
+            if isinstance(o, (ModelElement, Model))}
+        try:
+            context = multiprocessing.get_context('fork')
+            # Workers do not collect the objects shared with the main
+            # process, which would copy their memory pages.
+            gc.freeze()
+            try:
+                with context.Pool(processes=processes) as pool:
+                    results = pool.map(
+                        _analyzeInWorker, files, chunksize=1)
+            finally:
+                gc.unfreeze()
+            for result in results:
+                if result[0] == 'source':
+                    cls._register(result[1])
+        finally:
+            cls._shared = None
+            cls._watched = None
+
+    @classmethod
+    def _register(cls, data: bytes) -> None:
+        """Register the elements created by a worker."""
+        (source, new, back_references) = _SharedUnpickler(
+            io.BytesIO(data), cls._shared).load()
+        Megamodel.registerSourceFile(source)
+        for model in new['_allModels']:
+            Megamodel.registerModel(model)
+        for dependency in new['_allSourceFileDependencies']:
+            Megamodel.registerSourceFileDependency(dependency)
+        for dependency in new['_allModelDependencies']:
+            Megamodel.registerModelDependency(dependency)
+        for box in new['_issueBoxes']:
+            Megamodel.registerIssueBox(box)
+        for (element, name, items) in back_references:
+            getattr(element, name).extend(items)
+        IssueBox._version += 1
+        cls.nbWorkerAnalyses += 1
@@ -4,10 +4,13 @@
 from typing import Text, Optional, List, Any, Union, Dict, Set
 from abc import ABCMeta, abstractmethod
 import collections
+import os
+import sys
 
 from textx.exceptions import TextXSyntaxError
 
 from modelscript.base.sources import SourceFile
+from modelscript.base.profiles import Profile
 from modelscript.base.metrics import (
     Metrics,
     Metric)
@@ -94,8 +97,9 @@ class ASTBasedModelSourceFile(SourceFile, metaclass=ABCMeta):
         try:
             # This can raise an exception for instance if
             # there is a problem reading the file.
-            super(ASTBasedModelSourceFile, self).__init__(
-                fileName=fileName)
+            with Profile.phase('read', file=fileName):
+                super(ASTBasedModelSourceFile, self).__init__(
+                    fileName=fileName)
         except FatalError:
             # An issue has already been registered.
             # So there is nothing to do here.
@@ -130,17 +134,32 @@ class ASTBasedModelSourceFile(SourceFile, metaclass=ABCMeta):
         mode = Megamodel.analysisLevel
         # removed this code
         try:
-            self.fillAST()
+            with Profile.phase('parse', file=fileName):
+                self.fillAST()
             if mode != 'justAST':
-                fillDependencies(self)
+                with Profile.phase('dependencies', file=fileName):
+                    fillDependencies(self)
                 if mode != 'justASTDep':
-                    self.fillModel()
-                    self.resolve()
-                    self.finalize()
+                    with Profile.phase('fillModel', file=fileName):
+                        self.fillModel()
+                    with Profile.phase('resolve', file=fileName):
+                        self.resolve()
+                    with Profile.phase('finalize', file=fileName):
+                        self.finalize()
         except FatalError:
             pass  # nothing to do, the issue has been registered
 
 
+    @classmethod
+    def defaultGrammarFile(cls) -> str:
+        """The grammar file of the source class, that is by convention
+        the file "grammar.tx" in the directory of the parser module.
+        """
+        module_file = sys.modules[cls.__module__].__file__
+        return os.path.join(
+            os.path.dirname(os.path.realpath(module_file)),
+            'grammar.tx')
+
     def _addSourceModelElement(self, sme: SourceModelElement) -> None:
         self._modelMapping.add(sme)
 
@@ -177,9 +196,13 @@ class ASTBasedModelSourceFile(SourceFile, metaclass=ABCMeta):
         from modelscript.base.grammars import (
             Grammars,
             ModelSourceAST)
+        from modelscript.base.pools import ParsePool
         self.grammar = Grammars.get(self.grammarFile)
         try:
-            self.ast = ModelSourceAST(self.grammar, self, self.fileName)
+            # The file may have already been parsed in parallel
+            model = ParsePool.take(self.grammar, self.fileName)
+            self.ast = ModelSourceAST(
+                self.grammar, self, self.fileName, model=model)
         except TextXSyntaxError as e:
             from modelscript.base.grammars import AST
             err = AST.convertSyntaxError(e)
@@ -245,15 +268,15 @@ class ASTBasedModelSourceFile(SourceFile, metaclass=ABCMeta):
 
     @property
     def allUsedSourceFiles(self) -> Set[SourceFile]:
-        _all = set()
-        for us in self.usedSourceFiles:
-            _all = _all.union(us.allUsedSourceFiles)  # TODO:2 check type
-        return _all
+        """The source files used by this source, directly or not
+        (see Megamodel.usedSourceFileClosure)."""
+        from modelscript.megamodels import Megamodel
+        return set(Megamodel.usedSourceFileClosure(self))
 
     @property
     def allUsedMetamodels(self) -> Set[Metamodel]:
         return set([
-            sf.metamodel for sf in self.allUsedSourceFiles])  # TODO:2 check type
+            sf.metamodel for sf in self.allUsedSourceFiles])
 
     @property
     def usingSourceFiles(self) -> [SourceFile]:
@@ -1,5 +1,7 @@
 # coding=utf-8
+import functools
 
+from modelscript.megamodels import Megamodel
 from modelscript.megamodels.metametamodel import MetaPackage
 from modelscript.megamodels.metametamodel import MetaCheckerPackage
 from modelscript.scripts.metamodels.parser import PyMetamodelParser
@@ -40,9 +42,10 @@ META_PACKAGES=(
 )
 
 META_CHECKER_PACKAGES=(
-    'classes.checkers',
-    'glossaries.checkers',
-    'usecases.checkers',
+    # metamodel id, checker package
+    ('cl', 'classes.checkers'),
+    ('gl', 'glossaries.checkers'),
+    ('us', 'usecases.checkers'),
 )
 
 def loadMetaPackages():
@@ -50,10 +53,14 @@ def loadMetaPackages():
         mp = MetaPackage(name)
         # PyMetamodelParser().parsePyModule(mp.pyModule)
 
-def loadMetaCheckerPackages():
-    for name in META_CHECKER_PACKAGES:
-        mp = MetaCheckerPackage(name)
+def registerMetaCheckerPackages():
+    """Checker packages are loaded with the scripts of their
+    metamodel, see Megamodel.loadMetamodel."""
+    for (id, name) in META_CHECKER_PACKAGES:
+        Megamodel.registerMetamodelLoader(
+            id,
+            functools.partial(MetaCheckerPackage, name))
 
 
 loadMetaPackages()
-loadMetaCheckerPackages()
+registerMetaCheckerPackages()
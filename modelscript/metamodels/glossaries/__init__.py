@@ -48,15 +48,17 @@ class GlossaryModel(Model):
 
     packageNamed: Dict[Text, 'Package']
 
+    _termIndex: Optional[Dict[str, 'Entry']]
+    """The entry found by findEntry for each term. Built on demand
+    and reset when an entry is added."""
+
     def __init__(self):
         super(GlossaryModel, self).__init__()
         self.packageNamed = collections.OrderedDict()
+        self._termIndex = None
 
-    @property
-    def glossaryList(self):
-        #TODO:4 should be memoized. It is call for each occurrence.
-        _ = [self]+super(GlossaryModel, self).glossaryList
-        return _
+    def _glossaryList(self):
+        return [self]+super(GlossaryModel, self)._glossaryList()
 
     @property
     def packages(self):
@@ -69,24 +71,39 @@ class GlossaryModel(Model):
     def findEntry(self, term: str)-> Optional['Entry']:
         """Find an entry given a string (the term to be found)/
         """
-        # search first as the main term
-        for packages in list(self.packageNamed.values()):
-            if term in packages.entryNamed:
-                return packages.entryNamed[term]
-
-        # search then in inflections
-        for packages in list(self.packageNamed.values()):
-            for entry in list(packages.entryNamed.values()):
-                if term in entry.inflections:
-                    return entry
+        return self.termIndex.get(term)
 
-        # search then in synonyms
-        for packages in list(self.packageNamed.values()):
-            for entry in list(packages.entryNamed.values()):
-                if term in entry.synonyms:
-                    return entry
-
-        return None
+    @property
+    def termIndex(self) -> Dict[str, 'Entry']:
+        """The entry for each term, inflection or synonym.
+        A main term in any package has precedence over inflections,
+        which have precedence over synonyms. Otherwise the first
+        package and the first entry win.
+        """
+        if self._termIndex is None:
+            index = {}
+            # first the main terms
+            for package in self.packageNamed.values():
+                for (term, entry) in package.entryNamed.items():
+                    index.setdefault(term, entry)
+            # then inflections
+            for package in self.packageNamed.values():
+                for entry in package.entryNamed.values():
+                    for term in entry.inflections:
+                        index.setdefault(term, entry)
+            # then synonyms
+            for package in self.packageNamed.values():
+                for entry in package.entryNamed.values():
+                    for term in entry.synonyms:
+                        index.setdefault(term, entry)
+            self._termIndex = index
+        return self._termIndex
+
+    def finalize(self):
+        # entries are complete at this point
+        self._termIndex = None
+        self.termIndex
+        super(GlossaryModel, self).finalize()
 
     @property
     def metrics(self) -> Metrics:
@@ -161,6 +178,7 @@ class Entry(SourceModelElement):
         # TODO:3 check, unique main/alternative(?) term
         self.package = package
         self.package.entryNamed[term] = self
+        self.package.glossaryModel._termIndex = None
         self.term = term
         self.synonyms = list(synonyms)
         self.inflections = list(inflections)
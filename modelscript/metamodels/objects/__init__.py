@@ -19,7 +19,9 @@
 
 
 from collections import OrderedDict
-from typing import List, Optional, Dict, Text
+from collections.abc import Collection
+import itertools
+from typing import List, Optional, Dict, Text, Set, Iterable, Any
 from abc import ABCMeta
 
 # TODO:4 to be continued
@@ -42,6 +44,7 @@ from modelscript.metamodels.classes import (
 
 __all__=(
     'ObjectModel',
+    'ElementView',
     'ShadowObjectModel',
     'ElementFromOptionalStep',
 
@@ -55,6 +58,43 @@ __all__=(
 )
 
 
+class ElementView(Collection):
+    """Read-only view on some collections of an object model.
+    The view is not a copy: it reflects the changes of the model.
+    Elements are in the order of the collections.
+    The model must not change while the view is iterated, and
+    only a view on a single list can be indexed: use list() in
+    these cases.
+    """
+
+    def __init__(self, *collections: Iterable[Any]) -> None:
+        self._collections = collections
+
+    def __len__(self):
+        return sum(len(c) for c in self._collections)
+
+    def __iter__(self):
+        return itertools.chain(*self._collections)
+
+    def __contains__(self, element):
+        return any(element in c for c in self._collections)
+
+    def __getitem__(self, index):
+        if (len(self._collections) == 1
+                and isinstance(self._collections[0], list)):
+            return self._collections[0][index]
+        raise TypeError(  # raise:OK
+            'This view cannot be indexed. Use a list instead.')
+
+    def __eq__(self, other):
+        if isinstance(other, (ElementView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return 'ElementView(%s)' % list(self)
+
+
 class ObjectModel(Model):
     """Object model, either created "manually" or via a story evaluation.
     See ShadowObjectModel for story evaluation.
@@ -95,6 +135,44 @@ class ObjectModel(Model):
     stateCheck:  Optional['StateCheck']
     """Filled by finalize')"""
 
+    _lastSnapshot: Optional['ShadowObjectModel']
+    """The last snapshot of this model (see snapshot())."""
+
+    _snapshotMap: Dict['StateElement', 'StateElement']
+    """For each element of this model, its copy in the last
+    snapshot.
+    """
+
+    _changedObjects: Dict['Object', None]
+    """Objects created or with a new slot or a new link since the
+    last snapshot. This is an ordered set, in the order of changes.
+    """
+
+    _linksPerObject: Dict['Object', List['Link']]
+    """Links (plain links and link objects) of each object. Link
+    objects replaced by another one with the same name are kept.
+    """
+
+    _plainLinkIndex: Dict['PlainLink', int]
+    """Index of each plain link in _plainLinks."""
+
+    _objectsPerClass: Dict['Class', Dict[str, 'Object']]
+    """Objects of each class, not including the objects of
+    subclasses. Objects are indexed by name in the order of creation.
+    """
+
+    _previousSnapshot: Optional['ShadowObjectModel']
+    """If this model is a snapshot, the previous snapshot of the
+    same model if any. Filled by the copier.
+    """
+
+    _copiedElements: Optional[Set['StateElement']]
+    """If this model is a snapshot based on a previous snapshot, the
+    elements copied, that is the elements changed. Other elements
+    are shared with the previous snapshot. Filled by the copier and
+    used by the incremental StateCheck.
+    """
+
     def __init__(self):
         super(ObjectModel, self).__init__()
 
@@ -110,6 +188,14 @@ class ObjectModel(Model):
         self.checkStepEvaluation = None
         self.stateCheck = None
 
+        self._lastSnapshot = None
+        self._snapshotMap = {}
+        self._changedObjects = OrderedDict()
+        self._linksPerObject = {}
+        self._plainLinkIndex = {}
+        self._objectsPerClass = OrderedDict()
+        self._previousSnapshot = None
+        self._copiedElements = None
 
     def copy(self):
         """
@@ -120,6 +206,141 @@ class ObjectModel(Model):
             ObjectModelCopier)
         return ObjectModelCopier(self).copy()
 
+    def snapshot(self):
+        """
+        Return a ShadowObjectModel with the same content and
+        the same classModel, like copy(). Only the elements that
+        have changed since the previous snapshot are copied, the
+        other ones are shared with the previous snapshot. This is
+        intended for the state of a story which is modified in place
+        and frozen at each check step. The cost is proportional to
+        the changes since the previous snapshot (and the links of
+        the objects changed). Snapshots must not be modified.
+        """
+        from modelscript.metamodels.objects.copier import (
+            ObjectModelCopier)
+        copier = ObjectModelCopier(self, objectMap=self._snapshotMap)
+        if self._lastSnapshot is None:
+            snapshot = copier.copy()
+        else:
+            snapshot = copier.copyChanges(
+                previous=self._lastSnapshot,
+                changedObjects=list(self._changedObjects))
+        self._lastSnapshot = snapshot
+        self._changedObjects = OrderedDict()
+        return snapshot
+
+    def frozenCopy(self) -> 'ShadowObjectModel':
+        """
+        Return a model with the same content that must not be
+        modified: the last snapshot if this model has not changed
+        since, otherwise a new copy. Unlike snapshot(), this does
+        not change the next snapshot.
+        """
+        if self._lastSnapshot is not None and not self._changedObjects:
+            return self._lastSnapshot
+        else:
+            return self.copy()
+
+    def sharedCopy(self) -> 'ShadowObjectModel':
+        """
+        Return a new model with the same content as this snapshot,
+        like a snapshot taken without any change: all elements are
+        shared with this snapshot, which is its previous snapshot.
+        Only the indexes of the model are copied.
+        """
+        from modelscript.metamodels.objects.copier import (
+            ObjectModelCopier)
+        return ObjectModelCopier(self).copyChanges(
+            previous=self,
+            changedObjects=[])
+
+    def restore(self, snapshot: 'ShadowObjectModel') -> None:
+        """
+        Replace the content of this model by a copy of another
+        model, usually a copy or a snapshot which must not change
+        anymore. That model becomes the last snapshot of this model,
+        so the next snapshot shares the unchanged elements with it.
+        This allows stories to start from a state computed once.
+        """
+        from modelscript.metamodels.objects.copier import (
+            ObjectModelCopier)
+        story_evaluation = self.storyEvaluation
+        self.packageNamed = OrderedDict()
+        self._plainObjectNamed = OrderedDict()
+        self._plainLinks = []
+        self._linkObjectNamed = OrderedDict()
+        self._linksPerObject = {}
+        self._plainLinkIndex = {}
+        self._objectsPerClass = OrderedDict()
+        object_map = {}
+        ObjectModelCopier(
+            snapshot, objectMap=object_map, target=self).copy()
+        self.storyEvaluation = story_evaluation
+        self._lastSnapshot = snapshot
+        self._snapshotMap = {
+            copy: element for (element, copy) in object_map.items()}
+        self._changedObjects = OrderedDict()
+
+    def _objectChanged(self, object: 'Object') -> None:
+        """Called when an object is created or gets a slot
+        or a link.
+        """
+        self._changedObjects[object] = None
+
+    def _indexEntry(self, indexName: str, key: Any, new: type) -> Any:
+        """The entry of an index for the given key, created if
+        necessary. Snapshots share the entries of their indexes
+        with the previous snapshot (see copier), so shared entries
+        are copied before being returned.
+        """
+        index = getattr(self, indexName)
+        entry = index.get(key)
+        if entry is None:
+            entry = new()
+            index[key] = entry
+        elif (self._previousSnapshot is not None
+                and entry is getattr(
+                    self._previousSnapshot, indexName).get(key)):
+            entry = new(entry)
+            index[key] = entry
+        return entry
+
+    def _objectAdded(self, object: 'Object') -> None:
+        """Called when an object is created, before it is registered.
+        An object with the same name is replaced.
+        """
+        named = (
+            self._plainObjectNamed if object.isPlainObject()
+            else self._linkObjectNamed)
+        replaced = named.get(object.name)
+        if replaced is not None and replaced.class_ != object.class_:
+            # otherwise the entry is replaced in place
+            del self._indexEntry(
+                '_objectsPerClass', replaced.class_, OrderedDict)[
+                replaced.name]
+        self._indexEntry(
+            '_objectsPerClass', object.class_, OrderedDict)[
+            object.name] = object
+
+    def _linkAdded(self, link: 'Link') -> None:
+        """Called when a link is added to the model."""
+        if link.isPlainLink():
+            self._plainLinkIndex[link] = len(self._plainLinks)-1
+        for object in OrderedDict.fromkeys(
+                (link.sourceObject, link.targetObject)):
+            self._indexEntry('_linksPerObject', object, list).append(link)
+            self._objectChanged(object)
+
+    def _plainLinkMoved(self,
+                        link: 'PlainLink',
+                        replaced: 'PlainLink') -> None:
+        """Called when the copier of a snapshot replaces the copy
+        of a plain link by a new copy. The new copy was the last
+        plain link and now takes the index of the replaced one.
+        """
+        self._plainLinkIndex[link] = self._plainLinkIndex.pop(replaced)
+
     @property
     def classModel(self) -> ClassModel:
         if self._classModel is None:
@@ -140,11 +361,11 @@ class ObjectModel(Model):
 
     @property
     def plainObjects(self):
-        return list(self._plainObjectNamed.values())
+        return ElementView(self._plainObjectNamed.values())
 
     @property
     def plainObjectNames(self):
-        return list(self._plainObjectNamed.keys())
+        return ElementView(self._plainObjectNamed.keys())
 
     def plainObject(self, name):
         if name in self._plainObjectNamed:
@@ -154,15 +375,15 @@ class ObjectModel(Model):
 
     @property
     def plainLinks(self):
-        return self._plainLinks
+        return ElementView(self._plainLinks)
 
     @property
     def linkObjects(self):
-        return list(self._linkObjectNamed.values())
+        return ElementView(self._linkObjectNamed.values())
 
     @property
     def linkObjectNames(self):
-        return list(self._linkObjectNamed.keys())
+        return ElementView(self._linkObjectNamed.keys())
 
     def linkObject(self, name):
         if name in self._linkObjectNamed:
@@ -172,11 +393,15 @@ class ObjectModel(Model):
 
     @property
     def objects(self):
-        return self.plainObjects+self.linkObjects
+        return ElementView(
+            self._plainObjectNamed.values(),
+            self._linkObjectNamed.values())
 
     @property
     def objectNames(self):
-        return self.plainObjectNames+self.linkObjectNames
+        return ElementView(
+            self._plainObjectNamed.keys(),
+            self._linkObjectNamed.keys())
 
     def object(self, name):
         po = self.plainObject(name)
@@ -187,12 +412,26 @@ class ObjectModel(Model):
 
     @property
     def links(self):
-        return self.plainLinks+self.linkObjects
-
-    def classExtension(self, class_: 'Class') -> List['Object']:
-        # TODO:2 add inheritance in classExtension
-        return [
-            o for o in self.objects if o.class_==class_]
+        return ElementView(
+            self._plainLinks,
+            self._linkObjectNamed.values())
+
+    def classExtension(self,
+                       class_: 'Class',
+                       inherited: bool = False) -> ElementView:
+        """The objects of the class. With inherited, the objects
+        of the subclasses follow the objects of the class.
+        """
+        classes = [class_]
+        if inherited:
+            for c in classes:
+                classes.extend(
+                    s for s in getattr(c, 'subclasses', ())
+                    if s not in classes)
+        return ElementView(*(
+            self._objectsPerClass[c].values()
+            for c in classes
+            if c in self._objectsPerClass))
 
     @property
     def story(self) -> Optional['Story']:
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import Dict
 
 from modelscript.metamodels.objects import (
@@ -14,20 +15,30 @@ from modelscript.base.exceptions import (
 
 class ObjectModelCopier(object):
 
-    def __init__(self, source):
+    def __init__(self, source, objectMap=None, target=None):
         self.o=source
         #type: ObjectModel
 
-        self.t=ShadowObjectModel(classModel=source._classModel)
+        self.t=(
+            ShadowObjectModel(classModel=source._classModel)
+            if target is None
+            else target)
         #type: ObjectModel
+        # The new model, unless an empty model is given.
 
-        self._object_map=dict()
-        #type: Dict[Object, Object]
-        # A mapping between object in the original model
-        # and the corresponding object in the new model.
+        self._object_map=dict() if objectMap is None else objectMap
+        #type: Dict[StateElement, StateElement]
+        # A mapping between elements in the original model
+        # and the corresponding elements in the new model.
         # This is necessary to update links.
         # Note that 'object' refers to both plain object
         # and link object.
+        # With copyChanges() this is the mapping of the previous
+        # copy. It is updated in place.
+
+        self._copied=OrderedDict()
+        #type: Dict[StateElement, None]
+        # Elements copied (in order), not reused from a previous copy.
 
     def copy(self):
         self.t._classModel=self.o._classModel
@@ -51,6 +62,66 @@ class ObjectModelCopier(object):
             self._copy_plain_link(l)
         return self.t
 
+    def copyChanges(self, previous, changedObjects):
+        """
+        Copy the source model given a previous copy of it.
+        Only the objects changed since the previous copy, as well
+        as their links, are copied. Other elements are shared with
+        the previous copy. The object map given to the copier
+        must be the one of the previous copy.
+        The order of elements is the same as with copy().
+        """
+        self.t._classModel=self.o._classModel
+        self.t.storyEvaluation=self.o.storyEvaluation
+        self.t._plainObjectNamed=OrderedDict(previous._plainObjectNamed)
+        self.t._linkObjectNamed=OrderedDict(previous._linkObjectNamed)
+        self.t._plainLinks=list(previous._plainLinks)
+        # Index entries are shared with the previous snapshot until
+        # they are changed (see ObjectModel._indexEntry).
+        self.t._previousSnapshot=previous
+        self.t._plainLinkIndex=dict(previous._plainLinkIndex)
+        self.t._objectsPerClass=OrderedDict(previous._objectsPerClass)
+        self.t._linksPerObject=dict(previous._linksPerObject)
+
+        # Same order as copy: plain objects, link objects, plain links.
+        # Objects replaced by another one with the same name are
+        # no longer in the model and are ignored.
+        for o in changedObjects:
+            if (o.isPlainObject()
+                    and self.o.plainObject(o.name) is o):
+                self._copy_plain_object(o)
+        link_objects=OrderedDict(
+            (o, None) for o in changedObjects
+            if not o.isPlainObject())
+        plain_links=[]
+        for o in list(self._copied):
+            for l in self.o._linksPerObject.get(o, ()):
+                if l.isPlainLink():
+                    plain_links.append(l)
+                else:
+                    link_objects[l]=None
+        for lo in link_objects:
+            if self.o.linkObject(lo.name) is lo:
+                self._copy_link_object(lo)
+                plain_links.extend(
+                    l for l in self.o._linksPerObject.get(lo, ())
+                    if l.isPlainLink())
+
+        # Links changed replace their previous copy, at the same
+        # index. New links are added in order.
+        index=self.o._plainLinkIndex
+        for l in sorted(set(plain_links), key=lambda l: index[l]):
+            self._copy_plain_link(l)
+            if index[l] < len(previous._plainLinks):
+                replaced=self.t._plainLinks[index[l]]
+                self.t._plainLinks[index[l]]=self.t._plainLinks.pop()
+                self.t._plainLinkMoved(
+                    self.t._plainLinks[index[l]],
+                    replaced)
+        self.t._copiedElements=set(
+            self._object_map[e] for e in self._copied)
+        return self.t
+
     def _copy_plain_object(self, plain_object):
 
         if plain_object.package is not None:
@@ -72,6 +143,7 @@ class ObjectModelCopier(object):
                 description=plain_object.description,
                 astNode=plain_object.astNode)
         self._object_map[plain_object]=new_object
+        self._copied[plain_object]=None
         for slot in plain_object.slots:
             self._copy_slot(slot, new_object)
 
@@ -96,6 +168,8 @@ class ObjectModelCopier(object):
                 astNode=plain_link.astNode,
                 lineNo=plain_link.lineNo,
                 description=plain_link.description)
+        self._object_map[plain_link]=new_link
+        self._copied[plain_link]=None
 
     def _copy_link_object(self, link_object):
         if link_object.package is not None:
@@ -117,6 +191,8 @@ class ObjectModelCopier(object):
                 astNode=link_object.astNode,
                 lineNo=link_object.lineNo,
                 description=link_object.description)
+        self._object_map[link_object]=new_link_object
+        self._copied[link_object]=None
 
     def _copy_slot(self, old_slot, new_object):
         new_slot=\
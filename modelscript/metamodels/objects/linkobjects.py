@@ -48,7 +48,10 @@ class LinkObject(Object, Link):
         # This avoid relying on the implementation of Link constructor.
         # This could be an issue otherwize since link have no name.
         self.name=name
+        model._objectAdded(self)
         model._linkObjectNamed[self.name]=self
+        model._objectChanged(self)
+        model._linkAdded(self)
         print(('TT'*10, 'adding object', model._linkObjectNamed))
 
 
@@ -147,6 +147,7 @@ class PlainLink(Link):
             description=description
         )
         model._plainLinks.append(self)
+        model._linkAdded(self)
 
 
     def isPlainLink(self):
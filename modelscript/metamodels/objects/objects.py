@@ -1,9 +1,9 @@
 # coding=utf-8
 """Metamodel for object models.
 """
-from typing import Dict, Text, Optional, Union, List
+from typing import Dict, Text, Optional, Union, List, Tuple
 from abc import ABCMeta, abstractmethod
-from collections import OrderedDict
+from collections import OrderedDict, Counter
 
 from modelscript.megamodels.models import Placeholder
 # from modelscript.metamodels.classes.classes import Class
@@ -76,6 +76,24 @@ class _ClassPrint(object):
             else:
                 return True
 
+    @property
+    def key(self):
+        """
+        The values of the attributes as a hashable tuple. Two class
+        prints with no unspecified values are equal if and only if
+        their keys are equal.
+        """
+        return tuple(self.attVal.values())
+
+    @property
+    def specified(self):
+        """
+        The indexes of the attributes with a value in key.
+        """
+        return tuple(
+            i for (i, v) in enumerate(self.attVal.values())
+            if v is not UNSPECIFIED)
+
     def __str__(self):
         if len(self.attVal)==0:
             return ()
@@ -88,6 +106,86 @@ class _ClassPrint(object):
             ]))
 
 
+
+class _ClassPrintIndex(object):
+    """
+    Index of the class prints of a list of objects, typically the
+    objects of a class, by key. Objects with the same id are found
+    in linear time instead of comparing all pairs of class prints
+    with equals().
+
+    duplicates is the list of groups of objects with the same
+    class print and no unspecified values. Groups and objects in
+    groups are in the order of the objects given.
+
+    hasUnspecified indicates if some objects cannot be compared
+    because of unspecified values, that is if equals() returns
+    UNSPECIFIED for at least one pair of objects.
+    """
+    def __init__(self, objects, onlyIds=True):
+        self.duplicates=[]
+        #type: List[List[Object]]
+
+        self.hasUnspecified=False
+        #type: bool
+
+        objects_per_key=OrderedDict()
+        #type: Dict[Tuple, List[Object]]
+        keys_per_specified=OrderedDict()
+        #type: Dict[Tuple[int], List[Tuple]]
+        # for each set of specified attributes, the keys of the
+        # objects with these attributes specified
+        for object in objects:
+            class_print=_ClassPrint(object, onlyIds=onlyIds)
+            key=class_print.key
+            if key not in objects_per_key:
+                objects_per_key[key]=[]
+                specified=class_print.specified
+                if specified not in keys_per_specified:
+                    keys_per_specified[specified]=[]
+                keys_per_specified[specified].append(key)
+            objects_per_key[key].append(object)
+        nb_attributes=len(next(iter(objects_per_key), ()))
+        complete=tuple(range(nb_attributes))
+        for key in keys_per_specified.get(complete, ()):
+            if len(objects_per_key[key])>=2:
+                self.duplicates.append(objects_per_key[key])
+        self.hasUnspecified=self._hasUnspecified(
+            objects_per_key,
+            keys_per_specified,
+            complete)
+
+    @classmethod
+    def _hasUnspecified(cls, objectsPerKey, keysPerSpecified, complete):
+        # Two objects cannot be compared if their values are the
+        # same for the attributes specified in both objects, and
+        # one of them has an unspecified value. Keys are compared
+        # for each pair of sets of specified attributes, so the
+        # cost is linear with the number of objects (the number of
+        # such sets depends only on the number of attributes).
+        specifieds=list(keysPerSpecified.keys())
+        for (i, specified1) in enumerate(specifieds):
+            for specified2 in specifieds[i:]:
+                if specified1==complete and specified2==complete:
+                    continue
+                common=sorted(set(specified1) & set(specified2))
+
+                def projections(specified):
+                    counts=Counter()
+                    for key in keysPerSpecified[specified]:
+                        counts[tuple(key[j] for j in common)] += \
+                            len(objectsPerKey[key])
+                    return counts
+
+                counts1=projections(specified1)
+                if specified1==specified2:
+                    if any(n>=2 for n in counts1.values()):
+                        return True
+                elif any(p in counts1 for p in projections(specified2)):
+                    return True
+        return False
+
+
 class Object(PackagableElement, Entity, metaclass=ABCMeta):
     """ An object. Either a plain object or a link object.
     """
@@ -220,7 +318,9 @@ class PlainObject(Object):
             lineNo=lineNo,
             description=description
         )
+        model._objectAdded(self)
         model._plainObjectNamed[name] = self
+        model._objectChanged(self)
 
 
     def isPlainObject(self):
@@ -261,6 +361,7 @@ class Slot(ElementFromOptionalStep, Member):
         self.attribute = attribute
         self.simpleValue = simpleValue
         object._slotNamed[attribute_name] = self
+        object.model._objectChanged(object)
 
     def __str__(self):
         return '%s.%s=%s' % (
@@ -12,9 +12,10 @@ violations are converted to issues.
 
 
 from collections import OrderedDict, Counter
-from typing import List, Optional, Dict, Text, Union, Tuple
+from typing import List, Optional, Dict, Text, Union, Tuple, Set
 from abc import ABCMeta, abstractmethod
 
+from modelscript.base.profiles import Profile
 from modelscript.base.grammars import (
     ASTNodeSourceIssue
 )
@@ -28,7 +29,8 @@ from modelscript.metamodels.classes.invariants import (
     OCLInvariant)
 from modelscript.metamodels.objects.objects import (
     Object,
-    ObjectModel)
+    ObjectModel,
+    _ClassPrintIndex)
 from modelscript.metamodels.objects.links import (
     LinkRole,
     Link)
@@ -144,16 +146,25 @@ class UniqueLinkViolation(ConformityViolation):
     """
     def __init__(self,
                  stateCheck,
-                 duplicatedLinks):
-        #type: (StateCheck, List[Link]) -> None
+                 duplicatedLinks,
+                 object):
+        #type: (StateCheck, List[Link], Object) -> None
 
         super(UniqueLinkViolation, self).__init__(stateCheck)
 
         self.duplicatedLinks=duplicatedLinks
         #type: List[Link]
 
+        self.object=object
+        #type: Object
+        # The object from which the duplicated links have been found.
+
         # add the violation to the analysis
         self.stateCheck.uniqueLinkViolations.append(self)
+        v_per_object=self.stateCheck.uniqueLinkViolationsPerObject
+        if object not in v_per_object:
+            v_per_object[object]=[]
+        v_per_object[object].append(self)
 
     @property
     def source(self):
@@ -398,13 +409,34 @@ class StateCheck(object):
     An Issue is raised for each violation.
     """
 
-    def __init__(self, objectModel):
-        #type: (ObjectModel) -> None
+    def __init__(self, objectModel, incremental=True):
+        #type: (ObjectModel, bool) -> None
 
         self.objectModel=objectModel
         #type: ObjectModel
         # The object model being checked.
 
+        self.previous=None
+        #type: Optional[StateCheck]
+        # The check of the previous snapshot if the object model
+        # is a snapshot of a story state (see ObjectModel.snapshot).
+        # In this case only the elements copied in the snapshot are
+        # checked again. Violations for the other elements, which
+        # are shared with the previous snapshot, are the same
+        # as in the previous check, so they are just created again.
+
+        self.changedElements=None
+        #type: Optional[Set[Union[Object, Link]]]
+        # The objects and links to be checked in incremental mode.
+        # None if all elements must be checked.
+
+        previous_model=objectModel._previousSnapshot
+        if (incremental
+                and previous_model is not None
+                and previous_model.stateCheck is not None):
+            self.previous=previous_model.stateCheck
+            self.changedElements=objectModel._copiedElements
+
         self.allViolations=[]
         #type: List[ConformityViolation]
         # Filled by all check methods through the abstract class
@@ -418,6 +450,10 @@ class StateCheck(object):
         #type: List[UniqueLinkViolation]
         # Filled by _check_unique_links
 
+        self.uniqueLinkViolationsPerObject=OrderedDict()
+        #type: Dict[Object, List[UniqueLinkViolation]]
+        # Filled by _check_unique_links
+
         self.undefinedIdViolation=[]
         #type: List[Class]
         # filled by _check_object_ids
@@ -446,6 +482,15 @@ class StateCheck(object):
     def checkStepEvaluation(self):
         return self.objectModel.checkStepEvaluation
 
+    def _isChanged(self, element):
+        """
+        Indicates if the element must be checked. Otherwise the
+        violations of the previous check are reused.
+        """
+        return (
+            self.changedElements is None
+            or element in self.changedElements)
+
     def _check_slot_types(self, object):
         """
         Visit what slot that exist for the given object
@@ -479,39 +524,77 @@ class StateCheck(object):
 
     def _check_object_slots(self):
         for object in self.objectModel.objects:
-            self._check_slot_types(object)
-            self._check_missing_slots(object)
+            if self._isChanged(object):
+                self._check_slot_types(object)
+                self._check_missing_slots(object)
+            else:
+                previous=self.previous
+                for v in previous.slotValueTypeViolationPerObject.get(
+                        object, ()):
+                    SlotValueTypeViolation(
+                        stateCheck=self,
+                        slot=v.slot,
+                        expectedType=v.expectedType,
+                        actualType=v.actualType)
+                for v in previous.missingSlotsPerObject.get(object, ()):
+                    self.missingSlot=MissingSlotViolation(
+                        stateCheck=self,
+                        object=object,
+                        attribute=v.attribute)
+
+    def _changedClasses(self):
+        """
+        The classes with an object changed, added or replaced since
+        the previous check. None if all classes must be checked.
+        """
+        if self.changedElements is None:
+            return None
+        previous_model=self.previous.objectModel
+        classes=set()
+        for element in self.changedElements:
+            if isinstance(element, Object):
+                classes.add(element.class_)
+                # an object replaced by an object with the same name
+                previous_object=previous_model.object(element.name)
+                if previous_object is not None:
+                    classes.add(previous_object.class_)
+        return classes
 
     def _check_object_ids(self):
         om=self.objectModel
         if om.classModel is not None:
             # check ids for all classes
+            changed_classes=self._changedClasses()
             for class_ in om.classModel.classes:
-                has_unspecified = False
+                if (changed_classes is not None
+                        and class_ not in changed_classes):
+                    # same objects as in the previous check
+                    for v in self.previous.idViolationsPerClass.get(
+                            class_, ()):
+                        IdViolation(
+                            stateCheck=self,
+                            class_=class_,
+                            objects=v.objects)
+                    if class_ in self.previous.undefinedIdViolation:
+                        UndefinedIdViolation(
+                            stateCheck=self,
+                            class_=class_)
+                    continue
                 if len(class_.idPrint)>=1:
-                    # more that one object, check ids
-                    remaining_objects=om.classExtension(class_)[::-1]
-                    while len(remaining_objects)>=2:
-                        o1=remaining_objects.pop()
-                        like_o1=[o1]
-                        for o2 in remaining_objects:
-                            eq=o1.idPrint.equals(o2.idPrint)
-                            if eq==True:
-                                like_o1.append(o2)
-                                remaining_objects.remove(o2)
-                            elif eq==False:
-                                pass
-                            else:
-                                has_unspecified=True
-                        if len(like_o1)>=2:
-                            IdViolation(
-                                stateCheck=self,
-                                class_=class_,
-                                objects=like_o1)
-                if has_unspecified:
-                    UndefinedIdViolation(
-                        stateCheck=self,
-                        class_=class_)
+                    # Objects are grouped by id values in linear time
+                    # instead of comparing all pairs of objects.
+                    index=_ClassPrintIndex(om.classExtension(class_))
+                    for objects in index.duplicates:
+                        # the first object and then the other ones
+                        # from the last one, as reported so far
+                        IdViolation(
+                            stateCheck=self,
+                            class_=class_,
+                            objects=objects[:1]+objects[:0:-1])
+                    if index.hasUnspecified:
+                        UndefinedIdViolation(
+                            stateCheck=self,
+                            class_=class_)
 
     def _check_link_role_types(self):
         """
@@ -541,12 +624,28 @@ class StateCheck(object):
                 # The linkRole is well typed : store it in the
                 # linkRole / role / opposite object registery
                 oo=linkRole.opposite.object
+                if not self._isChanged(oo):
+                    # A link is copied again when one of its objects
+                    # changes. The registery of the other object,
+                    # shared with the previous snapshot, already
+                    # contains the previous copy of the link.
+                    return
                 role=linkRole.role
                 if role not in oo._link_roles_per_role:
                     oo._link_roles_per_role[role]=[]
                 oo._link_roles_per_role[role].append(linkRole)
 
+        for object in self.objectModel.objects:
+            if self._isChanged(object):
+                object._link_roles_per_role=OrderedDict()
         for link in self.objectModel.links:
+            if not self._isChanged(link):
+                # Links incident to a changed object are copied in
+                # snapshots, so both objects of this link are unchanged.
+                for v in self.previous.linkRoleTypeViolationsPerLink.get(
+                        link, ()):
+                    LinkRoleTypeViolation(self, v.linkRole)
+                continue
             print('YY'*10, 'processing link', link)
             for position in ['source', 'target']:
                 link_role=link.linkRole(position)
@@ -560,12 +659,22 @@ class StateCheck(object):
         be initialized to [], at lest if there is not set before..
         """
         for object in self.objectModel.objects:
+            if not self._isChanged(object):
+                continue
             for role in object.class_.ownedOppositeRoles:  #TODO:2 check inheritance
                 if role not in object._link_roles_per_role:
                     object._link_roles_per_role[role]=[]
 
     def _check_cardinalities(self):
         for object in self.objectModel.objects:
+            if not self._isChanged(object):
+                for v in self.previous.cardinalityViolationsPerObject.get(
+                        object, ()):
+                    CardinalityViolation(
+                        stateCheck=self,
+                        object=object,
+                        role=v.role)
+                continue
             print('HH'*10, 'check card for %s' % object)
             for role in list(object._link_roles_per_role.keys()):
                 actual=object.cardinality(role)
@@ -593,6 +702,14 @@ class StateCheck(object):
         #     (a, R, b)
         # only one side is considered.
         for object in self.objectModel.objects:
+            if not self._isChanged(object):
+                for v in self.previous.uniqueLinkViolationsPerObject.get(
+                        object, ()):
+                    UniqueLinkViolation(
+                        stateCheck=self,
+                        duplicatedLinks=v.duplicatedLinks,
+                        object=object)
+                continue
             for role in list(object._link_roles_per_role.keys()):
                 if role.isTarget:
                     links_per_object = dict()
@@ -608,7 +725,8 @@ class StateCheck(object):
                                 UniqueLinkViolation(
                                     stateCheck=self,
                                     duplicatedLinks=\
-                                        links_per_object[o])
+                                        links_per_object[o],
+                                    object=object)
 
     def _check_invariants(self):
         # Check all ocl invariants.
@@ -655,13 +773,16 @@ class StateCheck(object):
 
     def check(self):
         # perform all checks
-        self._check_object_ids()
-        self._check_object_slots()
-        self._check_link_role_types()    # must be here
-        self._add_all_roles_from_schema()  # must be here
-        self._check_cardinalities()
-        self._check_unique_links()
-        self._check_invariants()
+        for rule in [
+                self._check_object_ids,
+                self._check_object_slots,
+                self._check_link_role_types,     # must be here
+                self._add_all_roles_from_schema,   # must be here
+                self._check_cardinalities,
+                self._check_unique_links,
+                self._check_invariants]:
+            with Profile.phase('stateCheck.%s' % rule.__name__.lstrip('_')):
+                rule()
 
         # tranform failed check to issues
         if self.objectModel.checkStepEvaluation is not None:
@@ -21,6 +21,9 @@ from modelscript.metamodels.permissions.gpermissions import (
     PermissionModel,
     PermissionRule
 )
+from modelscript.metamodels.permissions.matrices import (
+    PermissionMatrix
+)
 from modelscript.metamodels.permissions.sar import (
     Action,
     SAR
@@ -121,6 +124,11 @@ class UCPermissionModel(PermissionModel):
         # The permission set is just the expansion of the rule
         # component in many different permissions.
 
+        self._permissionMatrix=None
+        #type: Optional[PermissionMatrix]
+        # The permission matrix, computed on demand.
+        # see permissionMatrix property.
+
     @property
     def metamodel(self):
         #type: () -> Metamodel
@@ -135,6 +143,27 @@ class UCPermissionModel(PermissionModel):
         # noinspection PyTypeChecker
         return self._permissionSet
 
+    @property
+    def permissionMatrix(self):
+        #type: ()->PermissionMatrix
+        """
+        The matrix of the permission set for the actors and usecases
+        of the usecase model (if known) and the resources of the rules.
+        """
+        if self._permissionMatrix is None:
+            subjects=[]
+            if self.usecaseModel is not None:
+                subjects=(
+                    self.usecaseModel.actors
+                    + self.usecaseModel.system.usecases)
+            self._permissionMatrix=PermissionMatrix(
+                self.permissionSet,
+                subjects=subjects+[
+                    s for rule in self.rules for s in rule.subjects],
+                resources=[
+                    r for rule in self.rules for r in rule.resources])
+        return self._permissionMatrix
+
     @property
     def metrics(self):
         #type: () -> Metrics
@@ -153,7 +182,7 @@ class UCPermissionModel(PermissionModel):
                 for r in rule.resources:
                     for a in rule.actions:
                         p= Permission(s, a, r, rule)
-                        self._permissionSet.permissions.add(p)
+                        self._permissionSet.add(p)
                         rule.permissions.append(p)
 
     def __str__(self):
@@ -8,6 +8,7 @@
 PermissionSet
 <>- Permission
 <>- Control
+--- add(permission)
 --- control(access) : Control
 
 SAR
@@ -29,10 +30,15 @@ PermissionModel
 """
 
 from abc import ABCMeta
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Dict, Tuple
 
 from modelscript.megamodels.models import Model
-from modelscript.metamodels.permissions.sar import SAR
+from modelscript.metamodels.permissions.sar import (
+    SAR,
+    SARClosures,
+    Subject,
+    Action,
+    Resource)
 from modelscript.megamodels.elements import SourceModelElement
 
 __all__=(
@@ -130,25 +136,68 @@ class PermissionSet(object):
             set(permissions) if permissions is not None
             else set())
         #type: Set[Permission]
-        """ The collection of permissions"""
+        """ The collection of permissions. Use add() to add
+        a permission so that the index is updated. """
 
         self.controls=[]
         #type: List[Control]
         """ The list of controls already made """
 
+        self._index=None
+        #type: Optional[Dict[Tuple[Subject, Action, Resource], Permission]]
+        # The permissions indexed by (subject, action, resource).
+        # Computed on demand, see index. Reset by add().
+
+        self._closures=SARClosures()
+        #type: SARClosures
+        # Super subjects/actions/resources of controlled accesses.
+
+    def add(self, permission):
+        #type: (Permission) -> None
+        """ Add a permission to the set. """
+        self.permissions.add(permission)
+        self._index=None
+
+    @property
+    def index(self):
+        #type: () -> Dict[Tuple[Subject, Action, Resource], Permission]
+        if self._index is None:
+            self._index={}
+            for p in self.permissions:
+                self._index.setdefault(
+                    (p.subject, p.action, p.resource), p)
+        return self._index
+
+    def permissionFor(self, access):
+        #type: ('Access') -> Optional[Permission]
+        """
+        A permission accepting the access if any. This is the
+        permission for the most specific subject, then action,
+        then resource. The result is the same as searching a
+        permission p such that p.accept(access), but only the
+        ancestors of the access are looked for in the index.
+        """
+        index=self.index
+        for s in self._closures.subjects(access.subject):
+            for a in self._closures.actions(access.action):
+                for r in self._closures.resources(access.resource):
+                    p=index.get((s, a, r))
+                    if p is not None:
+                        return p
+        return None
+
     def control(self, access):
         #type: ('Access') -> Control
         """
         Control an access according to the permission set.
         Returns the control, (either authorisation or denial)
         """
-        for p in self.permissions:
-            if p.accept(access):
-                c=Authorisation(
-                    access=access,
-                    permission=p)
-                break
-        else: #for
+        p=self.permissionFor(access)
+        if p is not None:
+            c=Authorisation(
+                access=access,
+                permission=p)
+        else:
             c=Denial(access)
         self.controls.append(c)
         return c
@@ -0,0 +1,159 @@
+# coding=utf-8
+"""
+Permission matrices. A permission matrix tells for each subject,
+action and resource if the subject can perform the action on the
+resource according to a permission set. Inheritance of subjects,
+actions and resources is taken into account: a usecase can do what
+its actors can do for instance.
+
+PermissionMatrix
+-o> PermissionSet
+--- isPermitted(subject, action, resource) : bool
+--- controlAll(accesses) : List[bool]
+
+For each subject and action, the matrix stores a bitset of the
+resources of the permission set, as a python int. An access is
+then checked with a bitwise "and" between this bitset and the bitset
+of the resource and its super resources.
+"""
+
+from typing import List, Optional, Dict, Tuple, Iterable
+
+from modelscript.metamodels.permissions.sar import (
+    Subject,
+    Action,
+    Resource,
+    SAR,
+    SARClosures)
+from modelscript.metamodels.permissions.gpermissions import (
+    PermissionSet)
+
+__all__=(
+    'PermissionMatrix',
+)
+
+
+class PermissionMatrix(object):
+    """
+    The matrix "subjects x actions x resources" of a permission set.
+    The subjects, actions and resources given are those displayed
+    in exports. By default these are those of the permissions.
+    Other subjects, actions or resources can still be checked.
+    """
+
+    def __init__(self,
+                 permissionSet,
+                 subjects=None,
+                 actions=None,
+                 resources=None):
+        #type: (PermissionSet, Optional[List[Subject]], Optional[List[Action]], Optional[List[Resource]]) -> None
+
+        self.permissionSet=permissionSet
+        #type: PermissionSet
+
+        permissions=list(permissionSet.permissions)
+
+        def unique(elements):
+            return list(dict.fromkeys(elements))
+
+        self.subjects=unique(
+            subjects if subjects is not None
+            else [p.subject for p in permissions])
+        #type: List[Subject]
+
+        self.actions=unique(
+            actions if actions is not None
+            else list(Action._actionNamed.values()))
+        #type: List[Action]
+
+        self.resources=unique(
+            resources if resources is not None
+            else [p.resource for p in permissions])
+        #type: List[Resource]
+
+        self._closures=SARClosures()
+        #type: SARClosures
+
+        self._bit={}
+        #type: Dict[Resource, int]
+        # The bit number of each resource of the permissions.
+
+        self._direct={}
+        #type: Dict[Tuple[Subject, Action], int]
+        # The bitset of the resources directly granted by
+        # permissions for a subject and an action.
+
+        for p in permissions:
+            bit=self._bit.setdefault(p.resource, len(self._bit))
+            key=(p.subject, p.action)
+            self._direct[key]=self._direct.get(key, 0) | 1 << bit
+
+        self._grants={}
+        #type: Dict[Tuple[Subject, Action], int]
+        # Bitset of the resources granted, inheritance included.
+        # Filled on demand.
+
+        self._masks={}
+        #type: Dict[Resource, int]
+        # Bitset of each resource and its super resources.
+        # Filled on demand.
+
+        for s in self.subjects:
+            for a in self.actions:
+                self._grant(s, a)
+
+    def _grant(self, subject, action):
+        #type: (Subject, Action) -> int
+        key=(subject, action)
+        if key not in self._grants:
+            bits=0
+            for s in self._closures.subjects(subject):
+                for a in self._closures.actions(action):
+                    bits |= self._direct.get((s, a), 0)
+            self._grants[key]=bits
+        return self._grants[key]
+
+    def _mask(self, resource):
+        #type: (Resource) -> int
+        if resource not in self._masks:
+            bits=0
+            for r in self._closures.resources(resource):
+                if r in self._bit:
+                    bits |= 1 << self._bit[r]
+            self._masks[resource]=bits
+        return self._masks[resource]
+
+    def isPermitted(self, subject, action, resource):
+        #type: (Subject, Action, Resource) -> bool
+        return (self._grant(subject, action)
+                & self._mask(resource)) != 0
+
+    def controlAll(self, accesses):
+        #type: (Iterable[SAR]) -> List[bool]
+        """
+        Check many accesses at once, for instance the accesses of
+        an AccessSet. Unlike PermissionSet.control no Control is
+        created: the result just tells which accesses are permitted.
+        """
+        grant=self._grant
+        mask=self._mask
+        return [
+            (grant(a.subject, a.action) & mask(a.resource)) != 0
+            for a in accesses]
+
+    def permittedActions(self, subject, resource):
+        #type: (Subject, Resource) -> List[Action]
+        """ The actions of the matrix permitted. """
+        mask=self._mask(resource)
+        return [
+            a for a in self.actions
+            if self._grant(subject, a) & mask]
+
+    @property
+    def nbPermitted(self):
+        #type: () -> int
+        """ Number of cells of the matrix that are permitted. """
+        return sum(
+            len(self.permittedActions(s, r))
+            for s in self.subjects
+            for r in self.resources)
@@ -2,7 +2,7 @@
 
 import abc
 from abc import ABCMeta
-from typing import List, Dict, Text
+from typing import List, Dict, Text, Callable, Tuple, Any
 
 
 def _getNaming(o):
@@ -12,6 +12,25 @@ def _getNaming(o):
     return id(o)
 
 
+def _closure(element, parents):
+    #type: (Any, Callable[[Any], List[Any]]) -> List[Any]
+    """ The element followed by all its ancestors, depth first.
+    Each ancestor is listed once, even with multiple inheritance.
+    """
+    result=[element]
+    seen={element}
+
+    def visit(e):
+        for p in parents(e):
+            if p is not None and p not in seen:
+                seen.add(p)
+                result.append(p)
+                visit(p)
+
+    visit(element)
+    return result
+
+
 class Subject(object, metaclass=ABCMeta):
     @property
     def superSubjects(self):
@@ -23,11 +42,7 @@ class Subject(object, metaclass=ABCMeta):
     def allSuperSubjects(self):
         # type: () -> List[Subject]
         """ All supersubject recursively + this one"""
-        parents = self.superSubjects
-        _=[self]
-        for p in parents:
-            _.extend(p.allSuperSubjects)
-        return _
+        return _closure(self, lambda s: s.superSubjects)
 
     @property
     def subjectLabel(self):
@@ -63,8 +78,7 @@ class Action(object):
     def allSuperActions(self):
         """ All superactions recursively + this one"""
         # type: () -> List[Action]
-        acs = self.superActions
-        return [self]+acs+ [a.superActions for a in acs]
+        return _closure(self, lambda a: a.superActions)
 
     def __str__(self):
         return self.actionLabel
@@ -85,8 +99,7 @@ class Resource(object, metaclass=abc.ABCMeta):
     def allSuperResources(self):
         # type: () -> List[Resource]
         """ All superresources recursively + this one"""
-        rs = self.superResources
-        return [self] + rs + [r.allSuperResources for r in rs]
+        return _closure(self, lambda r: r.superResources)
 
     def __str__(self):
         return self.resourceLabel
@@ -111,5 +124,38 @@ class SAR(object, metaclass=ABCMeta):
         )
 
 
+class SARClosures(object):
+    """
+    Memoized closures of subjects, actions and resources
+    (see allSuperSubjects, allSuperActions, allSuperResources).
+    Closures are computed once per element so the hierarchies
+    should not change while a SARClosures is in use.
+    """
 
-
+    def __init__(self):
+        self._subjects={}
+        #type: Dict[Subject, Tuple[Subject, ...]]
+
+        self._actions={}
+        #type: Dict[Action, Tuple[Action, ...]]
+
+        self._resources={}
+        #type: Dict[Resource, Tuple[Resource, ...]]
+
+    def subjects(self, subject):
+        #type: (Subject) -> Tuple[Subject, ...]
+        if subject not in self._subjects:
+            self._subjects[subject]=tuple(subject.allSuperSubjects)
+        return self._subjects[subject]
+
+    def actions(self, action):
+        #type: (Action) -> Tuple[Action, ...]
+        if action not in self._actions:
+            self._actions[action]=tuple(action.allSuperActions)
+        return self._actions[action]
+
+    def resources(self, resource):
+        #type: (Resource) -> Tuple[Resource, ...]
+        if resource not in self._resources:
+            self._resources[resource]=tuple(resource.allSuperResources)
+        return self._resources[resource]
@@ -4,10 +4,19 @@ Engine performing the evaluation of stories.
 The engine basically creates a StoryEvaluation from
 an initial state (an ObjectModel). This state is updated
 inplace.
+
+The same context or fragment is often included by many scenarios,
+usually from the same state. With a StoryIncludeCache shared
+by the evaluators, an included story is evaluated only once per
+initial state. The other includers get a copy of the evaluation,
+with their own issues, accesses and checked states, and their
+state is restored from a copy of the resulting state.
 """
 
 
-from typing import Union, Optional, Dict, Text
+from collections import OrderedDict
+from copy import copy as shallow_copy
+from typing import Union, Optional, Dict, Text, Tuple
 from modelscript.base.grammars import (
     ASTNodeSourceIssue
 )
@@ -87,6 +96,52 @@ ISSUES={
 def icode(ilabel):
     return ISSUES[ilabel]
 
+
+def stateFingerprint(state):
+    #type: (ObjectModel) -> Optional[Tuple]
+    """
+    Fingerprint of a state built by stories: the steps that created
+    the objects and links of the state, and that set the slots.
+    Since the effect of a step only depends on the state, two states
+    with the same fingerprint have the same content.
+    Return None if some elements do not come from a step.
+    """
+    entries=[]
+    for o in state.objects:
+        entry=(o.step,)+tuple(slot.step for slot in o.slots)
+        if not o.isPlainObject():
+            entry+=(o.sourceObject.step, o.targetObject.step)
+        entries.append(entry)
+    for l in state.plainLinks:
+        entries.append((l.step, l.sourceObject.step, l.targetObject.step))
+    if any(step is None for entry in entries for step in entry):
+        return None
+    return tuple(entries)
+
+
+class StoryIncludeCache(object):
+    """
+    Evaluations of included stories shared by the evaluators
+    of several stories, typically the scenarios of a scenario
+    model. Each evaluation is stored with a frozen copy of the
+    resulting state and indexed by the included story and the
+    fingerprint of the initial state (see stateFingerprint).
+    The stories must not change while the cache is in use.
+    """
+
+    def __init__(self):
+        self.results=OrderedDict()
+        #type: Dict[Tuple[Story, Tuple], Tuple[StoryEvaluation, ObjectModel]]
+
+        self.nbEvaluations=0
+        #type: int
+        # Number of included stories evaluated.
+
+        self.nbReuses=0
+        #type: int
+        # Number of included stories not evaluated again.
+
+
 # class StoryCollection(object):
 #
 #     def __init__(self,
@@ -186,8 +241,9 @@ class StoryEvaluator(object):
     def __init__(self,
                  initialState,
                  storyCollection=None,
-                 permissionSet=None):
-        #type: (ObjectModel, AbstractStoryCollection, Optional[PermissionSet]) -> None
+                 permissionSet=None,
+                 includeCache=None):
+        #type: (ObjectModel, AbstractStoryCollection, Optional[PermissionSet], Optional[StoryIncludeCache]) -> None
         """
         Create the evaluator object. Use evaluateStory() to launch
         the evaluation itself.
@@ -199,6 +255,9 @@ class StoryEvaluator(object):
         :param permissionSet:
             A permissionSet to check the accesses against. If set
             some access Authorization/Denial can be created.
+        :param includeCache:
+            If set, the evaluations of included stories are
+            shared with the other evaluators using this cache.
         """
         self.storyCollection=storyCollection
         #type: AbstractStoryCollection
@@ -220,6 +279,9 @@ class StoryEvaluator(object):
         #type: Optional[StoryEvaluation]
         # Filled by evaluateStory
 
+        self.includeCache=includeCache
+        #type: Optional[StoryIncludeCache]
+
     def evaluateStory(self, story):
         #type: (Story) -> StepEvaluation
         """
@@ -294,17 +356,105 @@ class StoryEvaluator(object):
             #    step_eval.issues.append(i)
             #    self.accesses=[]
 
-        #---- (3) Evaluate the selected story
+        #---- (3) Evaluate the selected story, unless it has been
+        #     evaluated from the same state with the same cache
 
         print('OO'*10, type(story_to_included))
-        story_evaluation_included=\
-            self._eval_story(
-                step=story_to_included,
-                parent=include_evaluation)
+        key=self._include_key(story_to_included)
+        if key is not None and key in self.includeCache.results:
+            (evaluation, final_state)=self.includeCache.results[key]
+            states_copied={}
+            story_evaluation_included=\
+                self._copy_evaluation(
+                    evaluation=evaluation,
+                    parent=include_evaluation,
+                    statesCopied=states_copied)
+            self.state.restore(
+                states_copied.get(final_state, final_state))
+            self.includeCache.nbReuses+=1
+        else:
+            story_evaluation_included=\
+                self._eval_story(
+                    step=story_to_included,
+                    parent=include_evaluation)
+            if key is not None:
+                # Usually the state of the last check, so the next
+                # check of the includers is incremental.
+                self.includeCache.results[key]=(
+                    story_evaluation_included,
+                    self.state.frozenCopy())
+                self.includeCache.nbEvaluations+=1
         include_evaluation \
             .storyEvaluationIncluded=story_evaluation_included
         return include_evaluation
 
+    def _include_key(self, story):
+        #type: (Story) -> Optional[Tuple[Story, Tuple]]
+        if self.includeCache is None:
+            return None
+        fingerprint=stateFingerprint(self.state)
+        if fingerprint is None:
+            return None
+        return (story, fingerprint)
+
+    def _copy_evaluation(self, evaluation, parent, statesCopied):
+        #type: (StepEvaluation, CompositeStepEvaluation, Dict[ObjectModel, ObjectModel]) -> StepEvaluation
+        """
+        Copy of the evaluation of a step for the given parent
+        evaluation, as if the step was evaluated again. Issues are
+        raised again and accesses are created again for the copy,
+        in the access set of this evaluator. Checks get their own
+        copy of the checked state, which is analyzed again
+        (incrementally, nothing has changed). statesCopied maps
+        the checked states of the evaluation to their copy.
+        """
+        if isinstance(evaluation, CheckStepEvaluation):
+            copy=CheckStepEvaluation(
+                parent=parent,
+                step=evaluation.step,
+                currentState=None,
+                name=evaluation.name,
+                frozenState=evaluation.frozenState.sharedCopy())
+            statesCopied[evaluation.frozenState]=copy.frozenState
+        elif isinstance(evaluation, OperationStepEvaluation):
+            copy=OperationStepEvaluation(
+                parent=parent,
+                step=evaluation.step,
+                name=evaluation.name)
+        else:
+            copy=type(evaluation)(
+                parent=parent,
+                step=evaluation.step)
+        copy.issues=[
+            self._copy_issue(issue) for issue in evaluation.issues]
+        copy.accesses=[
+            Access(
+                copy,
+                access.action,
+                access.resource,
+                self.accessSet)
+            for access in evaluation.accesses]
+        if isinstance(evaluation, CompositeStepEvaluation):
+            for substep_evaluation in evaluation.stepEvaluations:
+                self._copy_evaluation(
+                    substep_evaluation, copy, statesCopied)
+        if isinstance(evaluation, StoryIncludeEvaluation) \
+                and evaluation.storyEvaluationIncluded is not None:
+            index=evaluation.stepEvaluations.index(
+                evaluation.storyEvaluationIncluded)
+            copy.storyEvaluationIncluded=copy.stepEvaluations[index]
+        return copy
+
+    @staticmethod
+    def _copy_issue(issue):
+        """
+        Raise again an issue of a copied evaluation. The copy is
+        located at the same step and added to the same source file.
+        """
+        copy=shallow_copy(issue)
+        copy.origin._issueBox._add(copy)
+        return copy
+
 
     def _eval_text(self, step, parent):
         return self._eval_composite(step, parent)
@@ -70,19 +70,27 @@ class CheckStepEvaluation(OperationStepEvaluation):
     def __init__(self,
                  parent: Optional[StepEvaluation],
                  step: Step,
-                 currentState: ObjectModel,
-                 name: Optional[Text] = None) -> None:
+                 currentState: Optional[ObjectModel],
+                 name: Optional[Text] = None,
+                 frozenState: Optional[ObjectModel] = None) -> None:
         """Create a check evaluation by :
         (1) creating a (frozen) copy of the current state
         (2) making an analysis of it
+        If a frozenState is given, it is a copy of the state of
+        the same check in another evaluation of the same story
+        (see StoryIncludeCache). It is analyzed for this check
+        instead of a copy of the current state.
         """
         super(OperationStepEvaluation, self).__init__(
             parent=parent,
             step=step,
             name=name)
 
-        self.frozenState = currentState.copy()
-        #assoc: FrozesState
+        if frozenState is not None:
+            self.frozenState = frozenState
+        else:
+            self.frozenState = currentState.snapshot()
+            #assoc: FrozesState
 
         self.frozenState.checkStepEvaluation = self
         #assoc FrozesState~
@@ -41,9 +41,11 @@ for instance attribute, association, etc. This hierarchy is not the
 one used here.
 """
 
-from typing import Text, Optional, List, Any, Union, cast
+from typing import (
+    Text, Optional, List, Any, Union, Tuple, Dict, ClassVar, cast)
 from abc import ABCMeta, abstractmethod
 
+from modelscript.base.matchers import TermMatcher
 from modelscript.base.metrics import Metrics
 from modelscript.megamodels.elements import (
     SourceModelElement,
@@ -62,6 +64,7 @@ DEBUG=1
 
 ISSUES={
     'TERM_NOT_FOUND': 'txt.TermNotFound',
+    'TERM_NOT_REFERENCED': 'txt.UnreferencedTerm',
 }
 
 def icode(ilabel):
@@ -84,13 +87,44 @@ class WithTextBlocks(object):
     _textBlocks: List['TextBlock']
     """List of all text blocks in the model."""
 
+    _glossaryListMemo: Optional[Tuple[int, List['GlossaryModel']]]
+    """The glossary list and the version of model dependencies
+    used to compute it (see Megamodel.modelDependencyVersion)."""
+
+    detectUnreferencedTerms: ClassVar[bool] = False
+    """Whether terms of glossaries used in plain texts, without
+    a reference, are reported by resolveTextBlocks."""
+
+    _termMatchers: ClassVar[Dict[
+        Tuple['GlossaryModel', ...],
+        Tuple[List[Dict[str, 'Entry']], TermMatcher, Dict[str, 'Entry']]]]\
+        = {}
+    """A term matcher for each glossary list, with the term indexes
+    used to build it and the entry of each term."""
+
+    _termMatchersVersion: ClassVar[int] = 0
+    """The version of model dependencies when unregistered glossaries
+    were last evicted from _termMatchers."""
+
     def __init__(self):
         self._textBlocks = []
+        self._glossaryListMemo = None
 
     @property
     def glossaryList(self):
         """The list of glossaries connected to the model.
+        This list is used for each text reference so it is
+        memoized until model dependencies change.
         """
+        from modelscript.megamodels import Megamodel
+        version = Megamodel.modelDependencyVersion()
+        memo = self._glossaryListMemo
+        if memo is None or memo[0] != version:
+            memo = (version, self._glossaryList())
+            self._glossaryListMemo = memo
+        return memo[1]
+
+    def _glossaryList(self):
         # TODO:- improve the framework to simplify the code below
         #   When using an importBox one can write this
         #       return self.importBox.models('gl')
@@ -127,6 +161,68 @@ class WithTextBlocks(object):
         if len(self.glossaryList) != 0:
             for block in self.textBlocks:
                 block.resolve()
+            if WithTextBlocks.detectUnreferencedTerms:
+                self.checkUnreferencedTerms()
+
+    def _termMatcher(self) -> Tuple[TermMatcher, Dict[str, 'Entry']]:
+        """The matcher for all the terms of the glossary list and
+        the entry of each term. As for text references, the first
+        glossary defining a term wins. Matchers are shared by the
+        models with the same glossary list.
+        """
+        from modelscript.megamodels import Megamodel
+        version = Megamodel.modelDependencyVersion()
+        if WithTextBlocks._termMatchersVersion != version:
+            # glossaries may have been unregistered since
+            models = set(Megamodel.models())
+            for key in list(WithTextBlocks._termMatchers):
+                if not models.issuperset(key):
+                    del WithTextBlocks._termMatchers[key]
+            WithTextBlocks._termMatchersVersion = version
+        glossaries = tuple(self.glossaryList)
+        indexes = [g.termIndex for g in glossaries]
+        memo = WithTextBlocks._termMatchers.get(glossaries)
+        if (memo is None
+                or any(i is not j for (i, j) in zip(memo[0], indexes))):
+            entries = {}
+            for index in indexes:
+                for (term, entry) in index.items():
+                    entries.setdefault(term, entry)
+            memo = (indexes, TermMatcher(entries), entries)
+            WithTextBlocks._termMatchers[glossaries] = memo
+        return (memo[1], memo[2])
+
+    def checkUnreferencedTerms(self):
+        """Report the terms of glossaries used in plain texts without
+        a reference. All text lines are scanned in one pass with
+        a TermMatcher, whatever the number of terms.
+        """
+        from modelscript.base.grammars import (
+            ASTNodeSourceIssue)
+        from modelscript.base.issues import (
+            Levels)
+        (matcher, entries) = self._termMatcher()
+        for block in self.textBlocks:
+            for line in block.textLines:
+                for plain_text in line.plainTexts:
+                    if plain_text.astNode is None:
+                        continue
+                    for occurrence in matcher.occurrences(
+                            plain_text.text):
+                        entry = entries[occurrence.term]
+                        suggestion = (
+                            '`%s`' % occurrence.term
+                            if occurrence.term == entry.term
+                            else '`%s` (see `%s`)' % (
+                                occurrence.term, entry.term))
+                        ASTNodeSourceIssue(
+                            code=icode('TERM_NOT_REFERENCED'),
+                            astNode=plain_text.astNode,
+                            level=Levels.Warning,
+                            message=(
+                                'Term "%s" used without reference.'
+                                ' Use %s.' % (
+                                    occurrence.term, suggestion)))
 
 
 GlossaryModel = 'GlossaryModel'
@@ -1,20 +1,48 @@
 # coding=utf-8
-import modelscript.scripts.demo.all
-import modelscript.scripts.accesses.all
-# import modelscript.scripts.aui.all
-import modelscript.scripts.classes.all
-import modelscript.scripts.glossaries.all
-import modelscript.scripts.megamodels.all
-import modelscript.scripts.metamodels.all
-import modelscript.scripts.objects.all
-import modelscript.scripts.participants.all
-import modelscript.scripts.permissions.all
-# import modelscript.scripts.projects.all
-# import modelscript.scripts.qa.all
-# import modelscript.scripts.qc.all
-import modelscript.scripts.relations.all
-import modelscript.scripts.scenarios.all
-import modelscript.scripts.stories.all
-# import modelscript.scripts.tasks.all
-import modelscript.scripts.textblocks.all
-import modelscript.scripts.usecases.all
+"""
+Scripts of the metamodels: parsers, printers, diagram generators, etc.
+
+The scripts of a metamodel are not imported here but registered as
+a loader of the metamodel (see Megamodel.loadMetamodel). They are
+imported on demand, when the source class or a printer of the
+metamodel is requested, that is usually when a file with the
+extension of the metamodel is loaded. Script packages without
+metamodel (metamodels, megamodels, stories, textblocks) are imported
+by the scripts using them.
+"""
+
+import functools
+import importlib
+
+from modelscript.megamodels import Megamodel
+
+SCRIPT_PACKAGES=(
+    # metamodel id, script package
+    ('de', 'demo'),
+    ('ac', 'accesses'),
+    # ('au', 'aui'),
+    ('cl', 'classes'),
+    ('gl', 'glossaries'),
+    ('ob', 'objects'),
+    ('pa', 'participants'),
+    ('pe', 'permissions'),
+    # ('pr', 'projects'),
+    # ('qa', 'qa'),
+    # ('qc', 'qc'),
+    ('re', 'relations'),
+    ('sc', 'scenarios'),
+    # ('ta', 'tasks'),
+    ('us', 'usecases'),
+)
+
+
+def registerScriptPackages():
+    for (id, name) in SCRIPT_PACKAGES:
+        Megamodel.registerMetamodelLoader(
+            id,
+            functools.partial(
+                importlib.import_module,
+                'modelscript.scripts.%s.all' % name))
+
+
+registerScriptPackages()
@@ -37,6 +37,8 @@ class MegamodelPrinter(ModelPrinter):
     #     return self.output
 
     def doMegamodel(self, megamodel):
+        # metamodels are loaded on demand: display them all
+        megamodel.loadAllMetamodels()
         self.doMetamodelRegistery(megamodel)
         self.doMetaPackageRegistry(megamodel)
         self.doMetaCheckerPackageRegistry(megamodel)
@@ -0,0 +1,236 @@
+# coding=utf-8
+"""
+Scanning of the megamodel part of source files.
+
+The megamodel part of a source file, that is the model definition
+and the imports, comes first in the file::
+
+    // some comments
+    preliminary class model MyModel
+        | some description
+    import glossary model from 'main.gls'
+
+The megamodel parser (see fillDependencies) reads this part after the
+whole file has been bracketed and parsed by textX, and then imports
+each target, so dependencies are only known one file at a time. The
+scanner extracts the same information from the first lines of a file
+with regular expressions, without reading the rest of the file. This
+allows to compute the import graph of a set of files before parsing
+any of them (see ImportGraph), and then to parse independent files
+in parallel, to process files in a topological order and to detect
+import cycles.
+
+The scanner does not check anything: metamodel labels are not
+resolved and targets may not exist. Errors are reported as usual
+when the files are parsed.
+"""
+
+__all__ = (
+    'HeaderImport',
+    'ModelHeader',
+    'scanHeader',
+    'ImportGraph'
+)
+
+import io
+import os
+import re
+from typing import Dict, List, Optional
+
+from modelscript.base.graphs import (
+    stronglyConnectedComponents,
+    topologicalLevels)
+
+_COMMENT = r'\s*((//|--).*)?$'
+
+_DEFINITION = re.compile(
+    r'^(?P<labels>([^\d\W]\w*\s+)+)model(\s+(?P<name>[^\d\W]\w*))?'
+    + _COMMENT)
+
+_IMPORT = re.compile(
+    r'^(?P<modifier>import|include)\s+(?P<label>[^\d\W]\w*)\s+model'
+    r'\s+from\s+(\'(?P<path1>[^\']*)\'|"(?P<path2>[^"]*)")'
+    + _COMMENT)
+
+_KEYWORDS = ('model', 'import', 'include', 'from')
+
+
+class HeaderImport(object):
+    """An import found by the scanner. Same information as an
+    ImportStatement."""
+
+    def __init__(self,
+                 modifier: str,
+                 metamodelLabel: str,
+                 literalTargetFileName: str,
+                 absoluteTargetFilename: str,
+                 lineNo: int) -> None:
+        self.modifier = modifier
+        """ 'import' or 'include' """
+        self.metamodelLabel = metamodelLabel
+        self.literalTargetFileName = literalTargetFileName
+        self.absoluteTargetFilename = absoluteTargetFilename
+        self.lineNo = lineNo
+
+    def __repr__(self):
+        return "%s %s model from '%s'" % (
+            self.modifier,
+            self.metamodelLabel,
+            self.literalTargetFileName)
+
+
+class ModelHeader(object):
+    """The megamodel part of a source file as found by the scanner.
+    """
+
+    def __init__(self, fileName: str) -> None:
+        self.fileName = fileName
+        self.metamodelLabel: Optional[str] = None
+        """ The label of the metamodel, None if there is no model
+        definition."""
+        self.modelKinds: List[str] = []
+        self.modelName: Optional[str] = None
+        self.imports: List[HeaderImport] = []
+        self.nbLines = 0
+        """ Number of lines read by the scanner. """
+
+    @property
+    def targetFilenames(self) -> List[str]:
+        """The absolute names of imported files, without duplicates.
+        """
+        filenames = []
+        for import_ in self.imports:
+            if import_.absoluteTargetFilename not in filenames:
+                filenames.append(import_.absoluteTargetFilename)
+        return filenames
+
+    def __repr__(self):
+        return '%s model %s %s' % (
+            ' '.join(self.modelKinds + [str(self.metamodelLabel)]),
+            self.modelName,
+            self.imports)
+
+
+def scanHeader(fileName: str) -> ModelHeader:
+    """Scan the megamodel part of a source file. Blank lines,
+    comments and indented lines (descriptions) are skipped. Scanning
+    stops at the first line that is not part of the megamodel part.
+    Raise OSError or UnicodeDecodeError if the file cannot be read.
+    """
+    header = ModelHeader(fileName)
+    directory = os.path.dirname(fileName)
+    with io.open(fileName, encoding='utf8') as f:
+        for line in f:
+            header.nbLines += 1
+            line = line.rstrip()
+            stripped = line.lstrip()
+            if (stripped == ''
+                    or stripped.startswith(('//', '--'))
+                    or line != stripped):
+                continue
+            m = _IMPORT.match(line)
+            if m is not None:
+                if header.metamodelLabel is None:
+                    break
+                literal = m.group('path1')
+                if literal is None:
+                    literal = m.group('path2')
+                header.imports.append(HeaderImport(
+                    modifier=m.group('modifier'),
+                    metamodelLabel=m.group('label'),
+                    literalTargetFileName=literal,
+                    absoluteTargetFilename=os.path.abspath(
+                        os.path.join(directory, literal)),
+                    lineNo=header.nbLines))
+                continue
+            m = _DEFINITION.match(line)
+            if (m is not None
+                    and header.metamodelLabel is None
+                    and not header.imports):
+                labels = m.group('labels').split()
+                if any(label in _KEYWORDS for label in labels):
+                    break
+                header.metamodelLabel = labels[-1]
+                header.modelKinds = labels[:-1]
+                header.modelName = m.group('name')
+                continue
+            break
+    return header
+
+
+class ImportGraph(object):
+    """The import graph of some source files and of all the files
+    they import, directly or not, computed with the scanner.
+    Nodes are real paths of files. Targets that do not exist are
+    not part of the graph.
+    """
+
+    def __init__(self, fileNames: List[str]) -> None:
+        self.roots: List[str] = []
+        """ The real paths of the given files, in the given order. """
+        self.headers: Dict[str, Optional[ModelHeader]] = {}
+        """ The header of each file or None if it cannot be read. """
+        self._successors: Dict[str, List[str]] = {}
+        for file_name in fileNames:
+            path = os.path.realpath(file_name)
+            if path not in self.roots:
+                self.roots.append(path)
+        todo = list(reversed(self.roots))
+        while todo:
+            path = todo.pop()
+            if path in self.headers:
+                continue
+            try:
+                header = scanHeader(path)
+            except (OSError, UnicodeDecodeError):
+                header = None
+            self.headers[path] = header
+            successors = []
+            if header is not None:
+                for target in header.targetFilenames:
+                    if os.path.isfile(target):
+                        target = os.path.realpath(target)
+                        if target not in successors:
+                            successors.append(target)
+            self._successors[path] = successors
+            todo.extend(reversed(successors))
+
+    @property
+    def paths(self) -> List[str]:
+        """ All files in the graph. """
+        return list(self.headers.keys())
+
+    def successors(self, path: str) -> List[str]:
+        """ The files directly imported by a file of the graph. """
+        return self._successors[path]
+
+    @property
+    def components(self) -> List[List[str]]:
+        return stronglyConnectedComponents(self.roots, self.successors)
+
+    @property
+    def order(self) -> List[str]:
+        """All files in a topological order: each file comes after
+        the files it imports (except in cycles)."""
+        return [
+            path
+            for component in self.components
+            for path in component]
+
+    @property
+    def levels(self) -> List[List[str]]:
+        """Files grouped by levels. Files of a level only import
+        files of previous levels (except in cycles) and can
+        therefore be processed independently from each other."""
+        return topologicalLevels(self.roots, self.successors)
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """The import cycles, that is the sets of files importing each
+        other, directly or not, including files importing themselves.
+        """
+        return [
+            component
+            for component in self.components
+            if (len(component) >= 2
+                or component[0] in self._successors[component[0]])]
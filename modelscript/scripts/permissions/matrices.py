@@ -0,0 +1,85 @@
+# coding=utf-8
+"""
+Export of permission matrices for audit reports.
+
+In CSV there is one row per subject and resource with at least one
+permitted action, and one column per action ("x" if permitted). In
+JSON the matrix is an object giving for each subject and resource
+the list of permitted actions.
+"""
+
+import csv
+import io
+import json
+from typing import Text
+
+from modelscript.base.exceptions import (
+    UnexpectedValue)
+from modelscript.metamodels.permissions.matrices import (
+    PermissionMatrix)
+
+__all__=(
+    'MATRIX_FORMATS',
+    'matrixCSV',
+    'matrixJSON',
+    'exportMatrix',
+)
+
+
+def matrixCSV(matrix):
+    #type: (PermissionMatrix) -> Text
+    output=io.StringIO()
+    writer=csv.writer(output, lineterminator='\n')
+    writer.writerow(
+        ['subject', 'resource']
+        + [a.actionLabel for a in matrix.actions])
+    for s in matrix.subjects:
+        for r in matrix.resources:
+            actions=matrix.permittedActions(s, r)
+            if actions:
+                writer.writerow(
+                    [str(s.subjectLabel), str(r.resourceLabel)]
+                    + ['x' if a in actions else ''
+                       for a in matrix.actions])
+    return output.getvalue()
+
+
+def matrixJSON(matrix):
+    #type: (PermissionMatrix) -> Text
+    permissions={}
+    for s in matrix.subjects:
+        by_resource={}
+        for r in matrix.resources:
+            actions=matrix.permittedActions(s, r)
+            if actions:
+                by_resource[str(r.resourceLabel)]=[
+                    a.actionLabel for a in actions]
+        permissions[str(s.subjectLabel)]=by_resource
+    return json.dumps(
+        {
+            'subjects': [str(s.subjectLabel) for s in matrix.subjects],
+            'actions': [a.actionLabel for a in matrix.actions],
+            'resources': [str(r.resourceLabel) for r in matrix.resources],
+            'permissions': permissions
+        },
+        indent=2)
+
+
+MATRIX_FORMATS={
+    '.csv': matrixCSV,
+    '.json': matrixJSON,
+}
+
+
+def exportMatrix(matrix, fileName):
+    #type: (PermissionMatrix, Text) -> None
+    """
+    Save the matrix in a file. The format depends on the extension
+    of the file, see MATRIX_FORMATS.
+    """
+    extension=fileName[fileName.rfind('.'):].lower()
+    if extension not in MATRIX_FORMATS:
+        raise UnexpectedValue(  # raise:OK
+            'Unknown permission matrix format: "%s"' % fileName)
+    with open(fileName, 'w') as f:
+        f.write(MATRIX_FORMATS[extension](matrix))
@@ -47,7 +47,8 @@ from modelscript.scripts.stories.parser import (
 from modelscript.metamodels.stories import (
     AbstractStoryId)
 from modelscript.metamodels.stories.evaluations.evaluator import (
-    StoryEvaluator,)
+    StoryEvaluator,
+    StoryIncludeCache)
 
 
 __all__=(
@@ -413,6 +414,10 @@ class ScenarioModelSource(ASTBasedModelSourceFile):
 
         super(ScenarioModelSource, self).resolve()
 
+        #---- contexts and fragments included by several scenarios
+        # from the same state are evaluated only once.
+        include_cache=StoryIncludeCache()
+
         def resolve_scenario(scenario):
             """
             Evaluate a given scenario in the context of a given
@@ -429,7 +434,8 @@ class ScenarioModelSource(ASTBasedModelSourceFile):
             evaluator = StoryEvaluator(
                 initialState=initial_state,
                 storyCollection=story_collection,
-                permissionSet=None)
+                permissionSet=None,
+                includeCache=include_cache)
             #TODO:3 scenario must refer to permission model
             scenario.storyEvaluation = \
                 evaluator.evaluateStory(
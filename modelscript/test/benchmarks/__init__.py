@@ -0,0 +1,47 @@
+# coding=utf-8
+"""Micro-benchmarks.
+Benchmarks are not tests. They are not collected by the test runner
+but launched explicitly, each module being a script. For instance ::
+
+    python -m modelscript.test.benchmarks.brackets
+
+The helpers below measure wall time and print results as a table.
+"""
+
+from typing import Callable, List, Sequence, Any
+import time
+
+__all__ = (
+    'measure',
+    'report'
+)
+
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> float:
+    """Best wall time, in seconds, of several executions of a function.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def report(title: str,
+           header: Sequence[str],
+           rows: List[Sequence[Any]]) -> None:
+    """Print a table with a title."""
+    cells = [[str(c) for c in row] for row in [header]+rows]
+    widths = [
+        max(len(row[i]) for row in cells)
+        for i in range(len(header))]
+    print(title)
+    print('-'*len(title))
+    for (index, row) in enumerate(cells):
+        print('  '.join(c.rjust(w) for (c, w) in zip(row, widths)))
+        if index == 0:
+            print('  '.join('-'*w for w in widths))
+    print('')
@@ -0,0 +1,95 @@
+# coding=utf-8
+"""Analysis of a workspace with a pool of processes.
+
+A workspace with 100 object models and 100 scenarios importing the
+same class model is generated, and the workspace is checked with
+"modelc --jobs N" in a new process for several values of N. With
+--jobs 1 files are analyzed one after the other. Otherwise the class
+model is analyzed first and the 200 other files, which do not depend
+on each other, are analyzed in N worker processes (see AnalysisPool).
+The speedup is bounded by the number of cores of the machine.
+
+    python -m modelscript.test.benchmarks.analyses
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from modelscript.scripts.megamodels.scanner import ImportGraph
+from modelscript.test.framework import (
+    TEST_CASES_DIRECTORY,
+    getTestFile)
+from modelscript.test.benchmarks import report
+
+TEMPLATES = [
+    'obs/ob-main-turbo.obs',
+    'scs/sc-check01.scs',
+]
+
+SHELL = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))),
+    'interfaces', 'modelc', 'shell.py')
+
+
+def generateWorkspace(directory, nbCopies):
+    """Copy the templates nbCopies times, as well as the files they
+    import, keeping paths relative to the test cases directory."""
+    graph = ImportGraph([getTestFile(t) for t in TEMPLATES])
+    root = os.path.realpath(TEST_CASES_DIRECTORY)
+    for path in graph.paths:
+        relative = os.path.relpath(path, root)
+        if relative in TEMPLATES:
+            (base, extension) = os.path.splitext(relative)
+            targets = [
+                '%s-%03i%s' % (base, i, extension)
+                for i in range(nbCopies)]
+        else:
+            targets = [relative]
+        for target in targets:
+            target = os.path.join(directory, target)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy(path, target)
+
+
+def check(directory, jobs):
+    """Wall time of modelc on the directory."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-W', 'ignore', SHELL,
+         '--jobs', str(jobs), directory],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True)
+    return time.perf_counter() - start
+
+
+def main(nbCopies=100, jobList=(1, 2, 4, 8)):
+    directory = tempfile.mkdtemp()
+    try:
+        generateWorkspace(directory, nbCopies)
+        rows = []
+        serial = None
+        for jobs in jobList:
+            duration = check(directory, jobs)
+            if serial is None:
+                serial = duration
+            rows.append([
+                jobs,
+                '%.2f' % duration,
+                '%.2f' % (serial / duration)])
+        report(
+            'Checking %i files on %i cores' % (
+                len(TEMPLATES) * nbCopies, os.cpu_count()),
+            ['jobs', 'seconds', 'speedup'],
+            rows)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
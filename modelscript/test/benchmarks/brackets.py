@@ -0,0 +1,54 @@
+# coding=utf-8
+"""Throughput of the bracketing stage over the testcases corpus.
+
+    python -m modelscript.test.benchmarks.brackets
+"""
+
+import os
+
+from modelscript.base.brackets import (
+    BracketedScript,
+    BracketError)
+from modelscript.test.framework import TEST_CASES_DIRECTORY
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+EXTENSIONS = (
+    '.cls', '.obs', '.scs', '.gls', '.uss', '.pes', '.pas', '.res', '.des')
+
+
+def corpus():
+    """All source files in the testcases directory."""
+    files = []
+    for (root, dirs, names) in os.walk(TEST_CASES_DIRECTORY):
+        for name in sorted(names):
+            if os.path.splitext(name)[1] in EXTENSIONS:
+                files.append(os.path.join(root, name))
+    return files
+
+
+def bracketAll(files):
+    for file in files:
+        try:
+            BracketedScript(file).text
+        except BracketError:
+            pass
+
+
+def main(repeat=5):
+    files = corpus()
+    nb_lines = 0
+    for file in files:
+        with open(file) as f:
+            nb_lines += sum(1 for _ in f)
+    duration = measure(lambda: bracketAll(files), repeat=repeat)
+    report(
+        'Bracketing of the testcases corpus',
+        ['files', 'lines', 'seconds', 'lines/second'],
+        [[len(files), nb_lines,
+          '%.3f' % duration, '%.0f' % (nb_lines/duration)]])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# coding=utf-8
+"""Transitive dependencies between source files.
+
+An import graph of 500 source files is generated, files being
+organized in layers, each file importing two files of the previous
+layer, so there are many paths from a file to the files it uses.
+The files used by each file, directly or not, are computed either
+recursively by union of the files used by the imported files (the
+previous algorithm of ModelSourceFile.allUsedSourceFiles, which
+visits each path) or with Megamodel.usedSourceFileClosure, first
+after a change of the dependencies (cold) and then again (warm).
+The recursive computation is skipped for the deepest graphs.
+
+The sources are lightweight stand-ins registered directly in the
+megamodel, so that only the dependency queries are measured.
+
+    python -m modelscript.test.benchmarks.dependencies
+"""
+
+from modelscript.megamodels import Megamodel
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+class _Model(object):
+
+    def __init__(self):
+        self.metamodel = 'benchmark'
+
+
+class _Source(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.metamodel = 'benchmark'
+        self.model = _Model()
+        self.usedSourceFiles = []
+
+
+class _Import(object):
+
+    def __init__(self, source, target):
+        self.source = source
+        self.target = target
+        self.metamodelDependency = None
+
+
+def importGraph(nbFiles, nbLayers, nbImports=2):
+    """Register nbFiles sources organized in nbLayers layers and
+    return them."""
+    width = nbFiles // nbLayers
+    layers = []
+    for layer in range(nbLayers):
+        sources = [
+            _Source('/benchmark/%i/f%i.src' % (nbLayers, i))
+            for i in range(width)]
+        for (i, source) in enumerate(sources):
+            Megamodel.registerSourceFile(source)
+            if layers:
+                previous = layers[-1]
+                for k in range(nbImports):
+                    target = previous[(i + k) % len(previous)]
+                    source.usedSourceFiles.append(target)
+                    Megamodel.registerSourceFileDependency(
+                        _Import(source, target))
+        layers.append(sources)
+    return [source for sources in layers for source in sources]
+
+
+def recursiveClosure(source):
+    used = set(source.usedSourceFiles)
+    for target in source.usedSourceFiles:
+        used = used.union(recursiveClosure(target))
+    return used
+
+
+def closures(sources):
+    return [Megamodel.usedSourceFileClosure(s) for s in sources]
+
+
+def cold(sources):
+    Megamodel._sourceFileClosures.clear()
+    closures(sources)
+
+
+def main(nbFiles=500, layerList=(5, 10, 15, 25, 50, 100),
+         maxRecursive=15):
+    rows = []
+    for nbLayers in layerList:
+        sources = importGraph(nbFiles, nbLayers)
+        if nbLayers <= maxRecursive:
+            assert ([set(c) for c in closures(sources)]
+                    == [recursiveClosure(s) for s in sources])
+            recursive = '%.3f' % measure(
+                lambda: [recursiveClosure(s) for s in sources],
+                repeat=1)
+        else:
+            recursive = '-'
+        rows.append([
+            nbLayers,
+            recursive,
+            '%.3f' % measure(lambda: cold(sources)),
+            '%.4f' % measure(lambda: closures(sources))])
+    report(
+        'Closures of %i source files (seconds)' % nbFiles,
+        ['layers', 'recursive', 'cold', 'warm'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# coding=utf-8
+"""Cost of the resolution of text references against glossaries.
+
+A glossary with 3000 entries (two inflections and one synonym each)
+spread over 10 packages is generated. Each text reference looks for
+its term in the glossary list of its model. Terms are main terms,
+inflections, synonyms and unknown terms in equal proportions.
+The previous linear search of terms is compared to the term index.
+The cost of computing the glossary list of a model, once per text
+reference, is compared to the memoized glossary list.
+
+    python -m modelscript.test.benchmarks.glossaries
+"""
+
+from modelscript.metamodels.glossaries import (
+    GlossaryModel,
+    Package,
+    Entry)
+from modelscript.scripts.classes.parser import ClassModelSource
+from modelscript.test.framework import getTestFile
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+def glossary(nbEntries, nbPackages=10):
+    model = GlossaryModel()
+    packages = [Package(model, 'p%i' % i) for i in range(nbPackages)]
+    for i in range(nbEntries):
+        Entry(
+            packages[i % nbPackages],
+            'term%i' % i,
+            inflections=['terms%i' % i, 'termed%i' % i],
+            synonyms=['synonym%i' % i])
+    return model
+
+
+def occurrences(nbEntries, nbOccurrences):
+    kinds = ['term%i', 'terms%i', 'synonym%i', 'unknown%i']
+    return [
+        kinds[i % 4] % ((i * 7919) % nbEntries)
+        for i in range(nbOccurrences)]
+
+
+def linearFindEntry(glossary, term):
+    for package in list(glossary.packageNamed.values()):
+        if term in package.entryNamed:
+            return package.entryNamed[term]
+    for package in list(glossary.packageNamed.values()):
+        for entry in list(package.entryNamed.values()):
+            if term in entry.inflections:
+                return entry
+    for package in list(glossary.packageNamed.values()):
+        for entry in list(package.entryNamed.values()):
+            if term in entry.synonyms:
+                return entry
+    return None
+
+
+def resolve(glossaries, terms, findEntry):
+    for term in terms:
+        for g in glossaries():
+            if findEntry(g, term) is not None:
+                break
+
+
+def main(nbEntries=3000, nbOccurrences=2000):
+    g = glossary(nbEntries)
+    terms = occurrences(nbEntries, nbOccurrences)
+    rows = []
+    for (label, find_entry) in [
+            ('linear search', linearFindEntry),
+            ('term index', lambda g, t: g.findEntry(t))]:
+        duration = measure(
+            lambda: resolve(lambda: [g], terms, find_entry),
+            repeat=1)
+        rows.append([label, '%.3f' % duration])
+    report(
+        'Resolution of %i references against %i entries (seconds)' % (
+            nbOccurrences, nbEntries),
+        ['method', 'seconds'],
+        rows)
+
+    # glossary list of a class model importing a glossary
+    model = ClassModelSource(getTestFile('cls/cl-doc-class02.cls'))\
+        .classModel
+    rows = []
+    for (label, glossary_list) in [
+            ('computed', lambda: model._glossaryList()),
+            ('memoized', lambda: model.glossaryList)]:
+        duration = measure(
+            lambda: [glossary_list() for _ in range(nbOccurrences)])
+        rows.append([label, '%.4f' % duration])
+    report(
+        'Glossary list for %i references (seconds)' % nbOccurrences,
+        ['method', 'seconds'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# coding=utf-8
+"""Scaling of the {id} uniqueness check of StateCheck.
+
+Objects of a class with two {id} attributes are generated, about one
+percent of them having the same ids as another object. Duplicates are
+searched either by comparing all pairs of class prints (the previous
+algorithm of StateCheck._check_object_ids) or with a _ClassPrintIndex.
+Pairwise comparisons are skipped for the largest sizes.
+
+    python -m modelscript.test.benchmarks.ids
+"""
+
+from modelscript.metamodels.classes.core import StringValue
+from modelscript.metamodels.objects import ShadowObjectModel
+from modelscript.metamodels.objects.objects import (
+    PlainObject,
+    Slot,
+    _ClassPrintIndex)
+from modelscript.scripts.objects.parser import ObjectModelSource
+from modelscript.test.framework import getTestFile
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+def objects(nbObjects):
+    class_model = ObjectModelSource(getTestFile('obs/ob-ids01.obs'))\
+        .objectModel.classModel
+    number = class_model.class_('Number')
+    name = number.attribute('name')
+    value = number.attribute('value')
+    state = ShadowObjectModel(class_model)
+    result = []
+    for i in range(nbObjects):
+        o = PlainObject(state, 'n%i' % i, number)
+        id = i - 1 if i % 100 == 99 else i
+        Slot(o, name, StringValue("'n%i'" % id, name.type))
+        Slot(o, value, StringValue("'%i'" % id, value.type))
+        result.append(o)
+    return result
+
+
+def pairwise(objects):
+    duplicates = []
+    remaining_objects = objects[::-1]
+    while len(remaining_objects) >= 2:
+        o1 = remaining_objects.pop()
+        like_o1 = [o1]
+        for o2 in remaining_objects:
+            if o1.idPrint.equals(o2.idPrint) == True:
+                like_o1.append(o2)
+                remaining_objects.remove(o2)
+        if len(like_o1) >= 2:
+            duplicates.append(like_o1)
+    return duplicates
+
+
+def main(sizes=(500, 1000, 2000, 4000, 16000, 64000), maxPairwise=2000):
+    rows = []
+    for size in sizes:
+        os = objects(size)
+        indexed = measure(lambda: _ClassPrintIndex(os), repeat=1)
+        if size <= maxPairwise:
+            assert len(pairwise(os)) == len(_ClassPrintIndex(os).duplicates)
+            compared = '%.3f' % measure(lambda: pairwise(os), repeat=1)
+        else:
+            compared = '-'
+        rows.append([size, compared, '%.3f' % indexed])
+    report(
+        'Duplicated ids in a class (seconds)',
+        ['objects', 'pairwise', 'index'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# coding=utf-8
+"""Evaluation of a context included by many scenarios.
+
+A scenario model is generated with a context creating some
+departments, with a check at the end, and 50 scenarios including
+this context before creating one more department and checking the
+state. The scenarios are evaluated either each from scratch or with
+a StoryIncludeCache, the context being then evaluated only once.
+
+    python -m modelscript.test.benchmarks.includes
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+
+from modelscript.megamodels import Megamodel
+from modelscript.metamodels.objects import ShadowObjectModel
+from modelscript.metamodels.stories.evaluations.evaluator import (
+    StoryEvaluator,
+    StoryIncludeCache)
+from modelscript.test.framework import getTestFile
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+def scenarioModel(nbObjects, nbScenarios):
+    lines = [
+        'scenario model Sc_includes',
+        "import class model from '%s'" % getTestFile(
+            'cls/cl-main-cybercompany-a.cls'),
+        '',
+        'context C']
+    for i in range(nbObjects):
+        lines.append('    d%i : Department' % i)
+        lines.append("    d%i.name = 'D%i'" % (i, i))
+    lines.append('    check')
+    for i in range(nbScenarios):
+        lines.extend([
+            '',
+            'scenario S%i' % i,
+            '    include context C',
+            '    create s%i : Department' % i,
+            '    check'])
+    return '\n'.join(lines) + '\n'
+
+
+def evaluateAll(source, cache):
+    for scenario in source.scenarioModel.scenarios:
+        evaluator = StoryEvaluator(
+            initialState=ShadowObjectModel(classModel=source.classModel),
+            storyCollection=source.scenarioModel.containerCollection,
+            includeCache=cache)
+        evaluator.evaluateStory(scenario.story)
+
+
+def main(sizes=(10, 50, 200), nbScenarios=50):
+    directory = tempfile.mkdtemp()
+    rows = []
+    try:
+        for size in sizes:
+            file = os.path.join(directory, 'sc-includes-%i.scs' % size)
+            with open(file, 'w') as f:
+                f.write(scenarioModel(size, nbScenarios))
+            # evaluations print debugging information
+            with contextlib.redirect_stdout(io.StringIO()):
+                source = Megamodel.loadFile(file)
+                plain = measure(
+                    lambda: evaluateAll(source, None), repeat=1)
+                cached = measure(
+                    lambda: evaluateAll(source, StoryIncludeCache()),
+                    repeat=1)
+            rows.append([
+                size,
+                '%.3f' % plain,
+                '%.3f' % cached,
+                '%.1f' % (plain / cached)])
+    finally:
+        shutil.rmtree(directory)
+    report(
+        'Evaluation of %i scenarios including the same context'
+        ' (seconds)' % nbScenarios,
+        ['objects', 'plain', 'cached', 'speedup'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
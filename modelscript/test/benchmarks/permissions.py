@@ -0,0 +1,131 @@
+# coding=utf-8
+"""Cost of access control against a large permission set.
+
+A synthetic permission model is generated with 200 actors (each one
+having one of 20 super actors) and 300 classes. Each actor is granted
+two actions on 50 classes, as UCPermissionModel would expand factorized
+rules. Accesses are made by usecases of the actors, a usecase having
+its actor as super subject, half of them on granted classes. Accesses
+are controlled either by searching a permission accepting them among
+all permissions (the previous implementation of PermissionSet.control)
+or with the index. Finally all accesses are checked at once with a
+PermissionMatrix, whose construction is measured separately.
+
+    python -m modelscript.test.benchmarks.permissions
+"""
+
+from modelscript.metamodels.permissions import (
+    CreateAction,
+    ReadAction,
+    UpdateAction,
+    DeleteAction,
+    ExecuteAction)
+from modelscript.metamodels.permissions.accesses import (
+    AccessSet,
+    Access)
+from modelscript.metamodels.permissions.gpermissions import (
+    Permission,
+    PermissionSet)
+from modelscript.metamodels.permissions.matrices import (
+    PermissionMatrix)
+from modelscript.metamodels.permissions.sar import (
+    Subject,
+    Resource)
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+ACTIONS = [CreateAction, ReadAction, UpdateAction, DeleteAction,
+           ExecuteAction]
+
+
+class Element(Subject, Resource):
+    def __init__(self, name, parents=()):
+        self.name = name
+        self.parents = list(parents)
+
+    @property
+    def superSubjects(self):
+        return self.parents
+
+
+def permissionSet(nbActors, nbClasses, nbSuperActors=20, nbGranted=50):
+    super_actors = [Element('super%i' % i) for i in range(nbSuperActors)]
+    actors = [
+        Element('actor%i' % i, [super_actors[i % nbSuperActors]])
+        for i in range(nbActors)]
+    classes = [Element('class%i' % i) for i in range(nbClasses)]
+    ps = PermissionSet()
+    for (i, actor) in enumerate(actors):
+        for k in range(nbGranted):
+            class_ = classes[(i * 37 + k * 7) % nbClasses]
+            for a in (ACTIONS[i % 5], ACTIONS[(i + k) % 5]):
+                ps.add(Permission(actor, a, class_))
+    return (ps, actors, classes)
+
+
+def accesses(actors, classes, nbAccesses):
+    """Half of the accesses are on classes granted to the actor."""
+    usecases = [Element('uc%i' % i, [a]) for (i, a) in enumerate(actors)]
+    result = []
+    for i in range(nbAccesses):
+        u = (i * 7919) % len(usecases)
+        if i % 2 == 0:
+            class_ = classes[(u * 37 + (i % 50) * 7) % len(classes)]
+            action = ACTIONS[u % 5]
+        else:
+            class_ = classes[(i * 104729) % len(classes)]
+            action = ACTIONS[i % 5]
+        result.append((usecases[u], action, class_))
+    return result
+
+
+def linearControl(permissions, access):
+    for p in permissions:
+        if p.accept(access):
+            return p
+    return None
+
+
+def main(nbActors=200, nbClasses=300, nbAccesses=200):
+    (ps, actors, classes) = permissionSet(nbActors, nbClasses)
+    sars = accesses(actors, classes, nbAccesses)
+    access_set = AccessSet()
+    all_accesses = [Access(s, a, r, access_set) for (s, a, r) in sars]
+    permissions = list(ps.permissions)
+    granted = [linearControl(permissions, a) is not None
+               for a in all_accesses]
+    assert granted == [ps.permissionFor(a) is not None
+                       for a in all_accesses]
+    rows = []
+    for (label, control) in [
+            ('linear search', lambda a: linearControl(permissions, a)),
+            ('index', lambda a: ps.control(a))]:
+        duration = measure(
+            lambda: [control(a) for a in all_accesses],
+            repeat=1)
+        rows.append([
+            label,
+            '%.4f' % duration,
+            '%.0f' % (nbAccesses / duration)])
+    duration = measure(lambda: PermissionMatrix(ps, subjects=actors))
+    rows.append(['matrix (build)', '%.4f' % duration, '-'])
+    matrix = PermissionMatrix(ps, subjects=actors)
+    assert matrix.controlAll(all_accesses) == granted
+    many_accesses = all_accesses * 100
+    duration = measure(lambda: matrix.controlAll(many_accesses))
+    rows.append([
+        'matrix (x100)',
+        '%.4f' % duration,
+        '%.0f' % (len(many_accesses) / duration)])
+    report(
+        '%i accesses, %i permissions (%i actors, %i classes), '
+        '%i granted' % (
+            nbAccesses, len(permissions), nbActors, nbClasses,
+            sum(granted)),
+        ['method', 'seconds', 'accesses/s'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
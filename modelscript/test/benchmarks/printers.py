@@ -0,0 +1,82 @@
+# coding=utf-8
+"""Cost of printing large models.
+
+A printer following the conventions of model printers (one doXXX
+method per element, returning the output, line numbers displayed) is
+run on a growing number of elements. The previous implementation of
+AbstractPrinter, concatenating strings and counting end of lines in
+the whole output, is emulated for comparison. The new implementation
+is measured when producing a string and when streaming to a file.
+
+    python -m modelscript.test.benchmarks.printers
+"""
+
+import os
+import tempfile
+
+from modelscript.base.printers import (
+    AbstractPrinter,
+    AbstractPrinterConfig)
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+class ElementPrinter(AbstractPrinter):
+
+    def __init__(self, nbElements):
+        super(ElementPrinter, self).__init__(
+            AbstractPrinterConfig(displayLineNos=True))
+        self.nbElements = nbElements
+
+    def do(self):
+        for i in range(self.nbElements):
+            self.doElement(i)
+        return self.output
+
+    def doElement(self, i):
+        self.outLine('class C%i' % i, lineNo=self.currentLineNo)
+        self.outLine('attributes', indent=1)
+        self.outLine('a%i : String' % i, indent=2)
+        return self.output
+
+
+class ConcatenatingPrinter(ElementPrinter):
+    """The previous implementation of AbstractPrinter."""
+
+    output = ''
+
+    @property
+    def currentLineNo(self):
+        return self.output.count('\n')+1
+
+    def out(self, s, indent=0, style=None):
+        self.output += '%s%s' % (self._indentPrefix(indent), s)
+        return self.output
+
+    def doFull(self, removeLastEOL=False, addLastEOL=True):
+        return self.do()
+
+
+def main(sizes=(1000, 4000, 16000, 64000), maxConcatenation=16000):
+    file = os.path.join(tempfile.mkdtemp(), 'output.txt')
+    rows = []
+    for size in sizes:
+        if size <= maxConcatenation:
+            concatenation = '%.3f' % measure(
+                lambda: ConcatenatingPrinter(size).string(), repeat=1)
+        else:
+            concatenation = '-'
+        chunks = measure(lambda: ElementPrinter(size).string(), repeat=1)
+        stream = measure(
+            lambda: ElementPrinter(size).save(file, stream=True), repeat=1)
+        rows.append([
+            size, concatenation, '%.3f' % chunks, '%.3f' % stream])
+    report(
+        'Printing elements (seconds)',
+        ['elements', 'concatenation', 'string', 'file stream'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# coding=utf-8
+"""Cost of freezing the state of a story at each check step.
+
+A scenario creating 10000 employees (with two slots each) and
+links to some departments is generated. The state is frozen every
+500 creations, either with ObjectModel.copy() or with
+ObjectModel.snapshot().
+
+    python -m modelscript.test.benchmarks.snapshots
+"""
+
+import time
+import tracemalloc
+
+from modelscript.metamodels.objects import ShadowObjectModel
+from modelscript.metamodels.objects.links import PlainLink
+from modelscript.metamodels.objects.objects import (
+    PlainObject,
+    Slot)
+from modelscript.scripts.objects.parser import ObjectModelSource
+from modelscript.test.framework import getTestFile
+from modelscript.test.benchmarks import report
+
+
+def classModel():
+    source = ObjectModelSource(getTestFile('obs/ob-main-turbo.obs'))
+    return source.objectModel.classModel
+
+
+def runScenario(classModel, freeze, nbObjects, checkEvery):
+    """Run the scenario and return the frozen states as well as
+    the time spent to freeze them."""
+    employee = classModel.class_('Employee')
+    department = classModel.class_('Department')
+    works_in = classModel.association('WorksIn')
+    name = employee.attribute('name')
+    salary = employee.attribute('salary')
+    model = ObjectModelSource(getTestFile('obs/ob-main-turbo.obs'))\
+        .objectModel
+    values = model.object('zoe')
+
+    state = ShadowObjectModel(classModel)
+    departments = [
+        PlainObject(state, 'd%i' % i, department) for i in range(10)]
+    frozen_states = []
+    freezing = 0.0
+    for i in range(nbObjects):
+        e = PlainObject(state, 'e%i' % i, employee)
+        Slot(e, name, values.slot('name').simpleValue)
+        Slot(e, salary, values.slot('salary').simpleValue)
+        if i % 5 == 0:
+            PlainLink(state, works_in, e, departments[i % 10])
+        if (i+1) % checkEvery == 0:
+            start = time.perf_counter()
+            frozen_states.append(freeze(state))
+            freezing += time.perf_counter() - start
+    return (frozen_states, freezing)
+
+
+def main(nbObjects=10000, checkEvery=500):
+    class_model = classModel()
+    rows = []
+    for (label, freeze) in [
+            ('copy', lambda s: s.copy()),
+            ('snapshot', lambda s: s.snapshot())]:
+        tracemalloc.start()
+        (states, duration) = runScenario(
+            class_model, freeze, nbObjects, checkEvery)
+        (current, peak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append([
+            label,
+            len(states),
+            '%.3f' % duration,
+            '%.1f' % (current / 2**20),
+            '%.1f' % (peak / 2**20)])
+        del states
+    report(
+        'Freezing the state of a %i objects scenario' % nbObjects,
+        ['method', 'checks', 'seconds', 'retained MB', 'peak MB'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
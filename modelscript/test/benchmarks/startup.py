@@ -0,0 +1,114 @@
+# coding=utf-8
+"""Startup cost of modelscript.
+
+A few scripts are run in fresh python processes with
+"python -X importtime" to measure their wall time and the modules they
+import. The import time of textX, needed to parse anything, is given
+for reference. Scripts of metamodels
+(parsers, printers, diagram generators...) are imported on demand, so
+importing modelscript or loading a glossary should import much less
+than loading all metamodels, which was done at startup before.
+
+    python -m modelscript.test.benchmarks.startup
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, Set
+
+from modelscript.test.benchmarks import report
+
+__all__ = (
+    'Startup',
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+GLOSSARY = os.path.join(
+    ROOT, 'modelscript', 'test', 'testcases', 'gls', 'gl-main-medium.gls')
+
+SCRIPTS = [
+    ('import modelscript',
+     'import modelscript'),
+    ('load a .gls file',
+     'import modelscript\n'
+     'from modelscript.megamodels import Megamodel\n'
+     'Megamodel.loadFile(%r)' % GLOSSARY),
+    ('load all metamodels',
+     'import modelscript\n'
+     'from modelscript.megamodels import Megamodel\n'
+     'Megamodel.loadAllMetamodels()'),
+]
+
+_WRAPPER = """
+import json, sys, time
+_start = time.perf_counter()
+exec(%r)
+print(json.dumps({
+    'time': time.perf_counter() - _start,
+    'modules': sorted(sys.modules)}))
+"""
+
+_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\S+)$')
+
+
+class Startup(object):
+    """The imports performed by some code, run in a new python
+    process with "python -X importtime"."""
+
+    def __init__(self, code: str) -> None:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [ROOT] + [p for p in [env.get('PYTHONPATH')] if p])
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-W', 'ignore',
+             '-c', _WRAPPER % code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            env=env,
+            check=True)
+        result = json.loads(process.stdout.splitlines()[-1])
+        self.time = result['time']  # type: float
+        """Wall time of the code in seconds."""
+        self.modules = set(result['modules'])  # type: Set[str]
+        """All the modules imported."""
+        self.importTimes = {}  # type: Dict[str, int]
+        """Cumulative import time of modules in microseconds, as
+        reported by -X importtime. Modules imported with importlib
+        are not reported (but the modules they import are)."""
+        for line in process.stderr.splitlines():
+            m = _LINE.match(line)
+            if m:
+                self.importTimes[m.group(3)] = int(m.group(2))
+
+    def modulesIn(self, package: str) -> Set[str]:
+        return {
+            m for m in self.modules
+            if m.startswith(package+'.')}
+
+
+def main():
+    rows = []
+    for (label, code) in SCRIPTS:
+        startup = min(
+            (Startup(code) for _ in range(3)),
+            key=lambda s: s.time)
+        rows.append([
+            label,
+            '%.0f' % (startup.time * 1000),
+            '%.0f' % (startup.importTimes.get('textx', 0) / 1000),
+            len(startup.modulesIn('modelscript')),
+            len(startup.modulesIn('modelscript.scripts'))])
+    report(
+        'Startup (best of 3 processes)',
+        ['script', 'ms', 'textx ms', 'modules', 'script modules'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# coding=utf-8
+"""Cost of the detection of glossary terms used without reference.
+
+Texts are generated from a vocabulary of common words in which the
+terms of a glossary (3000 terms of one to three words) appear from
+time to time. Occurrences of terms are searched either by looking
+for each term at each word of the text, or with a TermMatcher which
+reads each word once whatever the number of terms.
+
+    python -m modelscript.test.benchmarks.unreferenced_terms
+"""
+
+from modelscript.base.matchers import (
+    TermMatcher,
+    _words)
+from modelscript.test.benchmarks import (
+    measure,
+    report)
+
+
+def terms(nbTerms):
+    return [
+        ' '.join('t%i_%i' % (i, k) for k in range(1 + i % 3))
+        for i in range(nbTerms)]
+
+
+def texts(allTerms, nbTexts, nbWords=60):
+    common = ['the', 'a', 'of', 'is', 'with', 'and', 'to', ',', '.']
+    result = []
+    for i in range(nbTexts):
+        words = []
+        for j in range(nbWords):
+            n = i * nbWords + j
+            if n % 10 == 0:
+                words.append(allTerms[(n * 7919) % len(allTerms)])
+            else:
+                words.append(common[n % len(common)])
+        result.append(' '.join(words))
+    return result
+
+
+def naiveOccurrences(termWords, text):
+    words = [w for (w, _) in _words(text)]
+    found = []
+    for i in range(len(words)):
+        for term in termWords:
+            if words[i:i+len(term)] == term:
+                found.append(i)
+    return found
+
+
+def main(nbTerms=3000, nbTexts=200):
+    all_terms = terms(nbTerms)
+    all_texts = texts(all_terms, nbTexts)
+    size = sum(len(t) for t in all_texts)
+    nb_words = sum(len(_words(t)) for t in all_texts)
+    term_words = [[w for (w, _) in _words(t)] for t in all_terms]
+    matcher = TermMatcher(all_terms)
+    rows = []
+    for (label, scan) in [
+            ('term by term', lambda t: naiveOccurrences(term_words, t)),
+            ('term matcher', lambda t: matcher.occurrences(t))]:
+        duration = measure(
+            lambda: [scan(t) for t in all_texts],
+            repeat=1)
+        rows.append([
+            label,
+            '%.3f' % duration,
+            '%.0f' % (nb_words / duration),
+            '%.3f' % (size / duration / 1e6)])
+    report(
+        'Scanning %i texts (%i words) for %i terms' % (
+            nbTexts, nb_words, nbTerms),
+        ['method', 'seconds', 'words/s', 'MB/s'],
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# coding=utf-8
+import pytest
+
+from modelscript.base.brackets import (
+    BracketedScript,
+    BracketError)
+
+O = BracketedScript.OPENING_BRACKET
+C = BracketedScript.CLOSING_BRACKET
+E = BracketedScript.EOL
+D = BracketedScript.CLOSING_DOC_LINE
+
+SOURCE = '\n'.join([
+    'class model M',
+    '',
+    'class A',
+    '    | doc',
+    '    attributes',
+    '        x : Integer',
+    '',
+    '// comment',
+    'class B',
+    ''])
+
+
+class TestBracketedScript(object):
+
+    def testText(self):
+        assert BracketedScript('m.cls', SOURCE).text == '\n'.join([
+            'class model M'+E,
+            '',
+            'class A'+O,
+            '    | doc'+D+E,
+            '    attributes'+O,
+            '        x : Integer'+E+C+E+C+E,
+            '',
+            '// comment',
+            'class B'+E])
+
+    def testInputs(self):
+        lines = SOURCE.splitlines()
+        expected = BracketedScript('m.cls', SOURCE).text
+        assert BracketedScript('m.cls', lines).text == expected
+        assert BracketedScript('m.cls', iter(lines)).text == expected
+
+    def testStreaming(self):
+        # the first line is produced as soon as the second is read
+        lines = iter(['class A', 'class B', '        wrong'])
+        generator = BracketedScript('m.cls', lines).bracketedLines()
+        assert next(generator) == 'class A'+E
+        with pytest.raises(BracketError):
+            list(generator)
+
+    def testIndentationErrors(self):
+        with pytest.raises(BracketError) as e:
+            BracketedScript('m.cls', 'class A\n  x').text
+        assert e.value.line == 2
+        with pytest.raises(BracketError) as e:
+            BracketedScript('m.cls', 'class A\n        x').text
+        assert e.value.line == 2
@@ -0,0 +1,85 @@
+# coding=utf-8
+import os
+import pickle
+
+import pytest
+
+from modelscript.base.grammars import (
+    Grammar,
+    GrammarCache)
+from modelscript.base.brackets import BracketedScript
+from modelscript.test.framework import getTestFile
+
+GRAMMAR_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', '..', 'scripts', 'glossaries', 'parser', 'grammar.tx')
+
+
+class TestGrammarCache(object):
+
+    @pytest.fixture(autouse=True)
+    def cacheDirectory(self, tmp_path):
+        previous_directory = GrammarCache._directory
+        GrammarCache._directory = str(tmp_path)
+        yield tmp_path
+        GrammarCache._directory = previous_directory
+
+    def testMissThenHit(self):
+        g1 = Grammar(GRAMMAR_FILE, useCache=True)
+        assert not g1.fromCache
+        g2 = Grammar(GRAMMAR_FILE, useCache=True)
+        assert g2.fromCache
+
+    def testSameModel(self):
+        text = BracketedScript(getTestFile('gls/gl-main-medium.gls')).text
+        built = Grammar(GRAMMAR_FILE, useCache=True)
+        cached = Grammar(GRAMMAR_FILE, useCache=True)
+        m1 = built.metamodel.model_from_str(text)
+        m2 = cached.metamodel.model_from_str(text)
+        assert type(m1).__name__ == type(m2).__name__
+        terms1 = [getattr(d, 'term', None) for d in m1.declarations]
+        terms2 = [getattr(d, 'term', None) for d in m2.declarations]
+        assert len(terms1) > 0
+        assert terms1 == terms2
+
+    def testKeyDependsOnText(self):
+        assert GrammarCache.key('a') != GrammarCache.key('b')
+        assert GrammarCache.key('a') == GrammarCache.key('a')
+
+    def testKeyDependsOnTextXVersion(self, monkeypatch):
+        key = GrammarCache.key('a')
+        monkeypatch.setattr(GrammarCache, 'textXVersion', '0.0')
+        assert GrammarCache.key('a') != key
+        monkeypatch.setattr(GrammarCache, 'textXVersion', None)
+        assert GrammarCache.key('a') is None
+        assert not Grammar(GRAMMAR_FILE, useCache=True).fromCache
+        assert not Grammar(GRAMMAR_FILE, useCache=True).fromCache
+
+    def testCorruptedEntry(self, cacheDirectory):
+        Grammar(GRAMMAR_FILE, useCache=True)
+        (entry,) = cacheDirectory.iterdir()
+        for content in (b'corrupted', pickle.dumps('not a metamodel')):
+            entry.write_bytes(content)
+            grammar = Grammar(GRAMMAR_FILE, useCache=True)
+            assert not grammar.fromCache
+            assert grammar.metamodel.model_from_str(
+                BracketedScript(getTestFile('gls/gl-main-medium.gls')).text)
+            # the entry is replaced
+            assert Grammar(GRAMMAR_FILE, useCache=True).fromCache
+
+
+class TestAST(object):
+
+    def testInMemory(self):
+        from modelscript.base.grammars import AST
+        grammar = Grammar(GRAMMAR_FILE)
+        file = getTestFile('gls/gl-main-medium.gls')
+        ast = AST(grammar, file)
+        assert ast.bracketedFile is None
+        # lines are the same in the source and the bracketed text
+        first_entry = [
+            d for d in ast.model.declarations if hasattr(d, 'term')][0]
+        line = ast.line(first_entry)
+        with open(file) as f:
+            source_line = f.readlines()[line-1]
+        assert source_line.strip().startswith(first_entry.term)
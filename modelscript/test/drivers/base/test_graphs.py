@@ -1,6 +1,9 @@
 from modelscript.base.graphs import (
     genPaths,
-    cycles)
+    cycles,
+    reachableNodes,
+    stronglyConnectedComponents,
+    topologicalLevels)
 
 class TestGraph(object):
 
@@ -37,6 +40,36 @@ class TestGraph(object):
         assert list(genPaths(succs, 1,1))==[[1,1]]
         assert cycles(list(graph.keys()), succs)== [[1,1]]
 
+    def testComponents(self):
+        graph = {1: [2, 3], 2: [4], 3: [4], 4: []}
+        succs=lambda x:graph[x]
+        assert stronglyConnectedComponents([1], succs)== \
+               [[4], [2], [3], [1]]
+        assert topologicalLevels([1], succs)== [[4], [2, 3], [1]]
+        graph = {1: [2], 2: [3], 3: [1], 4: [1], 5: [5]}
+        assert stronglyConnectedComponents([4, 5], succs)== \
+               [[1, 2, 3], [4], [5]]
+        assert topologicalLevels([4, 5], succs)== [[1, 2, 3, 5], [4]]
+
+    def testReachableNodes(self):
+        graph = {1: [2, 3], 2: [4], 3: [4], 4: []}
+        succs=lambda x:graph[x]
+        assert reachableNodes(1, succs)== [4, 2, 3]
+        assert reachableNodes(4, succs)== []
+        graph = {1: [2], 2: [3], 3: [1], 4: [1], 5: [5]}
+        assert reachableNodes(4, succs)== [3, 2, 1]
+        assert reachableNodes(1, succs)== [3, 2, 1]
+        assert reachableNodes(5, succs)== [5]
+
+    def testLongChain(self):
+        graph = {n: [n+1] for n in range(10000)}
+        graph[10000] = []
+        succs=lambda x:graph[x]
+        levels = topologicalLevels([0], succs)
+        assert len(levels) == 10001
+        assert levels[0] == [10000]
+        assert reachableNodes(0, succs)[:2] == [10000, 9999]
+
 
 # graph1={ 1: [2, 3, 5], 2: [1], 3: [1], 4: [2], 5: [2] }
 # graph2={1:[2],2:[3],3:[1],4:[1]}
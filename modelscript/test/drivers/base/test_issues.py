@@ -0,0 +1,64 @@
+# coding=utf-8
+from modelscript.base.issues import (
+    Issue,
+    IssueBox,
+    Levels,
+    LocalizedSourceIssue,
+    WithIssueList)
+
+
+class _Source(WithIssueList):
+    def __init__(self, name, parents=()):
+        self.name = name
+        self.fileName = name
+        super(_Source, self).__init__(
+            parents=[p.issues for p in parents])
+        self.sourceLines = ['line'] * 10
+
+    @property
+    def label(self):
+        return self.name
+
+
+def _diamond():
+    """top imports left and right, both importing base."""
+    base = _Source('base')
+    left = _Source('left', [base])
+    right = _Source('right', [base])
+    top = _Source('top', [left, right])
+    return (base, left, right, top)
+
+
+class TestIssueBox(object):
+
+    def testDiamond(self):
+        (base, left, right, top) = _diamond()
+        issue = Issue(base, Levels.Warning, 'in base')
+        assert top.issues.allParents == [
+            base.issues, left.issues, right.issues]
+        assert top.issues.all == [issue]
+        assert top.issues.nb == 1
+
+    def testInvalidation(self):
+        (base, left, right, top) = _diamond()
+        assert top.issues.nb == 0
+        Issue(base, Levels.Warning, 'in base')
+        assert top.issues.nb == 1
+        other = _Source('other')
+        Issue(other, Levels.Error, 'in other')
+        left.issues.addParent(other.issues)
+        assert top.issues.nb == 2
+        assert not top.isValid
+
+    def testAt(self):
+        (base, left, right, top) = _diamond()
+        i1 = LocalizedSourceIssue(base, Levels.Warning, 'i1', line=3)
+        i2 = LocalizedSourceIssue(top, Levels.Warning, 'i2', line=3)
+        i3 = LocalizedSourceIssue(right, Levels.Warning, 'i3', line=3)
+        i4 = LocalizedSourceIssue(left, Levels.Warning, 'i4', line=5)
+        assert top.issues.at(3) == [i1, i3, i2]
+        assert top.issues.at(3, parentsFirst=False) == [i2, i1, i3]
+        assert top.issues.at(5) == [i4]
+        assert top.issues.at(4) == []
+        i5 = LocalizedSourceIssue(top, Levels.Warning, 'i5', line=4)
+        assert top.issues.at(4) == [i5]
@@ -0,0 +1,51 @@
+# coding=utf-8
+import random
+import re
+
+from modelscript.base.matchers import TermMatcher
+
+_WORD = re.compile(r'\w+|[^\w\s]')
+
+
+def _naiveOccurrences(terms, text):
+    """Reference implementation: compare each term with the words
+    at each position of the text."""
+    words = [(m.group(), m.start()) for m in _WORD.finditer(text)]
+    found = []
+    for term in terms:
+        term_words = _WORD.findall(term)
+        n = len(term_words)
+        for i in range(len(words) - n + 1):
+            if [w for (w, _) in words[i:i+n]] == term_words:
+                (last, last_start) = words[i+n-1]
+                found.append((words[i][1], last_start+len(last), term))
+    return found
+
+
+class TestTermMatcher(object):
+
+    def testOverlaps(self):
+        m = TermMatcher(['he', 'she', 'his', 'hers', 'a b c', 'b'])
+        assert [(o.term, o.start, o.end) for o in m.occurrences(
+            'she hers ; a b  c b, ushers')] == [
+            ('she', 0, 3),
+            ('hers', 4, 8),
+            ('a b c', 11, 17),
+            ('b', 18, 19)]
+
+    def testSameAsNaiveSearch(self):
+        rand = random.Random(0)
+        words = ['a', 'b', 'c', 'ab', 'ba', '-', '.']
+        terms = set(
+            ' '.join(rand.choice(words) for _ in range(rand.randint(1, 3)))
+            for _ in range(20))
+        m = TermMatcher(terms)
+        for _ in range(50):
+            text = ' '.join(rand.choice(words) for _ in range(30))
+            found = sorted(
+                (o.start, o.end - o.start, o.term)
+                for o in m.allOccurrences(text))
+            expected = sorted(
+                (start, end - start, term)
+                for (start, end, term) in _naiveOccurrences(terms, text))
+            assert found == expected
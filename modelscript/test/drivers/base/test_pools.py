@@ -0,0 +1,57 @@
+# coding=utf-8
+import pytest
+from textx.exceptions import TextXSyntaxError
+
+from modelscript.base.grammars import (
+    AST,
+    Grammars)
+from modelscript.base.pools import ParsePool
+from modelscript.test.framework import getTestFile
+from modelscript.scripts.glossaries.parser import GlossaryModelSource
+
+GRAMMAR_FILE = GlossaryModelSource.defaultGrammarFile()
+
+
+class TestParsePool(object):
+
+    def teardown_method(self, method):
+        ParsePool.clear()
+
+    def testSameAsSerial(self):
+        grammar = Grammars.get(GRAMMAR_FILE)
+        file = getTestFile('gls/gl-main-medium.gls')
+        ParsePool.parseAll([(GRAMMAR_FILE, file)], processes=2)
+        parallel = AST(grammar, file, model=ParsePool.take(grammar, file))
+        serial = AST(grammar, file)
+        entries = [
+            (d.term, serial.line(d))
+            for d in serial.model.declarations if hasattr(d, 'term')]
+        assert len(entries) > 0
+        assert entries == [
+            (d.term, parallel.line(d))
+            for d in parallel.model.declarations if hasattr(d, 'term')]
+        # the result has been consumed
+        assert ParsePool.take(grammar, file) is None
+
+    def testWithoutParserBlueprint(self, monkeypatch):
+        grammar = Grammars.get(GRAMMAR_FILE)
+        file = getTestFile('gls/gl-main-medium.gls')
+        ParsePool.parseAll([(GRAMMAR_FILE, file)], processes=2)
+        with monkeypatch.context() as m:
+            m.delattr(grammar.metamodel, '_parser_blueprint')
+            assert ParsePool.take(grammar, file) is None
+        # the file is parsed again by the regular parser
+        ast = AST(grammar, file, model=None)
+        assert any(
+            hasattr(d, 'term') for d in ast.model.declarations)
+
+    def testSyntaxError(self):
+        grammar = Grammars.get(GRAMMAR_FILE)
+        file = getTestFile('gls/gl-mega03.gls')
+        ParsePool.parseAll([(GRAMMAR_FILE, file)], processes=2)
+        with pytest.raises(TextXSyntaxError) as e:
+            ParsePool.take(grammar, file)
+        with pytest.raises(TextXSyntaxError) as expected:
+            AST(grammar, file)
+        assert (e.value.line, e.value.col) \
+            == (expected.value.line, expected.value.col)
@@ -0,0 +1,50 @@
+# coding=utf-8
+import io
+import os
+
+from modelscript.base.printers import (
+    AbstractPrinter,
+    AbstractPrinterConfig)
+
+
+class _Printer(AbstractPrinter):
+
+    def __init__(self, nbLines):
+        super(_Printer, self).__init__(
+            AbstractPrinterConfig(displayLineNos=True))
+        self.nbLines = nbLines
+        self.lineNos = []
+
+    def do(self):
+        for i in range(self.nbLines):
+            self.lineNos.append(self.currentLineNo)
+            self.outLine('line\n%i' % i, lineNo=self.currentLineNo)
+        self.outLine('last', removeLastEOL=True)
+        return self.output
+
+
+class TestPrinters(object):
+
+    def testOutput(self):
+        printer = _Printer(3)
+        text = printer.do()
+        assert printer.lineNos == [1, 3, 5]
+        assert text.split('\n')[:2] == ['   1|line', '   1|0']
+        assert text.endswith('    |last')
+        assert printer.currentLineNo == 7
+        assert _Printer(3).string(addLastEOL=False) == text
+
+    def testStreams(self, tmpdir):
+        expected = _Printer(500).string()
+        for size in [1, 7, 100, 100000]:
+            printer = _Printer(500)
+            printer.STREAM_BUFFER_SIZE = size
+            stream = io.StringIO()
+            printer.doStream(stream)
+            assert stream.getvalue() == expected
+            assert printer.lineNos == list(range(1, 1000, 2))
+        file = os.path.join(str(tmpdir), 'out.txt')
+        _Printer(500).save(
+            file, stream=True, removeLastEOL=True, addLastEOL=False)
+        with open(file) as f:
+            assert f.read() == expected[:-1]
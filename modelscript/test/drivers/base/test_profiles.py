@@ -0,0 +1,36 @@
+# coding=utf-8
+import json
+
+from modelscript.base.profiles import Profile
+
+
+class TestProfile(object):
+
+    def teardown_method(self, method):
+        Profile.stop()
+        Profile.clear()
+
+    def testDisabled(self):
+        Profile.clear()
+        with Profile.phase('parse', file='a.cls'):
+            pass
+        assert len(Profile.records) == 0
+
+    def testNestedPhases(self):
+        Profile.clear()
+        Profile.start(traceAllocations=True)
+        for _ in range(2):
+            with Profile.phase('finalize', file='a.cls'):
+                with Profile.phase('check'):
+                    data = [0] * 100000
+        Profile.stop()
+        finalize = Profile.records[('a.cls', 'finalize')]
+        check = Profile.records[('a.cls', 'check')]
+        assert (finalize.calls, check.calls) == (2, 2)
+        assert finalize.wall >= check.wall
+        assert abs(finalize.self - (finalize.wall - check.wall)) < 1e-6
+        assert check.allocated > 0
+        assert 'a.cls' in Profile.table()
+        records = json.loads(Profile.json())['records']
+        assert [(r['file'], r['phase']) for r in records] == [
+            ('a.cls', 'finalize'), ('a.cls', 'check')]
@@ -0,0 +1,99 @@
+# coding=utf-8
+from modelscript.megamodels import Megamodel
+from modelscript.metamodels.glossaries import (
+    GlossaryModel,
+    Package,
+    Entry)
+from modelscript.metamodels.textblocks import WithTextBlocks
+from modelscript.scripts.glossaries.parser import GlossaryModelSource
+from modelscript.test.framework import getTestFile
+
+
+def _linearFindEntry(glossary, term):
+    """Reference implementation: main terms, then inflections, then
+    synonyms."""
+    for package in glossary.packageNamed.values():
+        if term in package.entryNamed:
+            return package.entryNamed[term]
+    for attribute in ('inflections', 'synonyms'):
+        for package in glossary.packageNamed.values():
+            for entry in package.entryNamed.values():
+                if term in getattr(entry, attribute):
+                    return entry
+    return None
+
+
+class TestTermIndex(object):
+
+    def testSameAsLinearSearch(self):
+        source = GlossaryModelSource(getTestFile('gls/gl-main-medium.gls'))
+        glossary = source.glossaryModel
+        terms = ['unknown', 'a', 'Uno', 'uns']
+        for package in glossary.packages:
+            for entry in package.entries:
+                terms += [entry.term] + entry.inflections + entry.synonyms
+        for term in terms:
+            assert glossary.findEntry(term) \
+                is _linearFindEntry(glossary, term)
+
+    def testPrecedence(self):
+        glossary = GlossaryModel()
+        p1 = Package(glossary, 'p1')
+        p2 = Package(glossary, 'p2')
+        by_synonym = Entry(p1, 'car', synonyms=['auto'])
+        assert glossary.findEntry('auto') is by_synonym
+        # the index is reset when entries are added
+        by_inflection = Entry(p1, 'cars', inflections=['auto'])
+        assert glossary.findEntry('auto') is by_inflection
+        main = Entry(p2, 'auto')
+        assert glossary.findEntry('auto') is main
+        assert glossary.findEntry('car') is by_synonym
+
+    def testGlossaryListIsMemoized(self):
+        source = GlossaryModelSource(getTestFile('gls/gl-main-medium.gls'))
+        glossary = source.glossaryModel
+        glossary_list = glossary.glossaryList
+        assert glossary_list[0] is glossary
+        assert glossary.glossaryList is glossary_list
+        other = GlossaryModelSource(
+            getTestFile('gls/gl-inflections-01.gls'))
+        version = Megamodel.modelDependencyVersion()
+        Megamodel.unregisterSourceFile(other)
+        # dependencies have changed: the list is computed again
+        assert Megamodel.modelDependencyVersion() != version
+        assert glossary.glossaryList is not glossary_list
+        assert glossary.glossaryList == glossary_list
+
+
+class TestUnreferencedTerms(object):
+
+    def teardown_method(self, method):
+        WithTextBlocks.detectUnreferencedTerms = False
+
+    def _warnings(self, detect):
+        WithTextBlocks.detectUnreferencedTerms = detect
+        source = GlossaryModelSource(getTestFile('gls/gl-main-medium.gls'))
+        Megamodel.unregisterSourceFile(source)
+        return [
+            i.message for i in source.issues.all
+            if i.code == 'txt.UnreferencedTerm']
+
+    def testOptional(self):
+        assert self._warnings(detect=False) == []
+
+    def testSuggestions(self):
+        # "a" is a synonym of Reference used in the description of Trois
+        assert self._warnings(detect=True) == [
+            'Term "a" used without reference. Use `a` (see `Reference`).']
+
+    def testMatchersOfUnregisteredGlossaries(self):
+        WithTextBlocks.detectUnreferencedTerms = True
+        source = GlossaryModelSource(getTestFile('gls/gl-doc-terms01.gls'))
+        glossary = source.glossaryModel
+        assert (glossary,) in WithTextBlocks._termMatchers
+        Megamodel.unregisterSourceFile(source)
+        other = GlossaryModelSource(getTestFile('gls/gl-entry01.gls'))
+        Megamodel.unregisterSourceFile(other)
+        assert all(
+            glossary not in glossaries
+            for glossaries in WithTextBlocks._termMatchers)
@@ -0,0 +1,105 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+
+from modelscript.megamodels import Megamodel
+from modelscript.megamodels.pools import AnalysisPool
+from modelscript.scripts.megamodels.scanner import ImportGraph
+from modelscript.test.framework import getTestFile
+from modelscript.test.benchmarks.analyses import (
+    TEMPLATES,
+    generateWorkspace)
+
+
+def _sources(directory):
+    return [
+        Megamodel.loadFile(os.path.join(directory, '%s-%03i%s' % (
+            os.path.splitext(t)[0], i, os.path.splitext(t)[1])))
+        for t in TEMPLATES
+        for i in range(2)]
+
+
+def _issues(source, directory):
+    return [
+        issue.str().replace(directory, '')
+        for issue in source.issues.all]
+
+
+def _occurrences(glossarySource):
+    return {
+        entry.term: sorted(
+            (os.path.basename(o.model.source.fileName), o.text)
+            for o in entry.occurrences)
+        for package in glossarySource.model.packages
+        for entry in package.entries}
+
+
+class TestAnalysisPool(object):
+
+    def testSameAsSerial(self):
+        if not AnalysisPool.isAvailable():
+            return
+        (serial, parallel) = (tempfile.mkdtemp(), tempfile.mkdtemp())
+        for directory in (serial, parallel):
+            generateWorkspace(directory, 2)
+        serial_sources = _sources(serial)
+        graph = ImportGraph([
+            s.fileName.replace(serial, parallel)
+            for s in serial_sources])
+        assert [len(level) for level in graph.levels] == [2, 4]
+        nb_worker_analyses = AnalysisPool.nbWorkerAnalyses
+        AnalysisPool.analyzeAll(graph.levels, processes=2)
+        assert AnalysisPool.nbWorkerAnalyses - nb_worker_analyses == 6
+        parallel_sources = _sources(parallel)
+        for (s, p) in zip(serial_sources, parallel_sources):
+            assert type(p) is type(s)
+            assert p.fileName == s.fileName.replace(serial, parallel)
+            assert _issues(p, parallel) == _issues(s, serial)
+        # imported models are those of the main process
+        class_source = Megamodel.loadFile(
+            os.path.join(parallel, 'cls', 'cl-main-cybercompany-a.cls'))
+        assert parallel_sources[0].model.classModel \
+            is class_source.model
+        assert parallel_sources[0] in Megamodel.sourceFiles()
+        assert Megamodel.sourceDependency(
+            parallel_sources[0], class_source) is not None
+
+    def testBackReferences(self):
+        # Entries of the imported glossary get the occurrences of
+        # their terms in the class models analyzed by workers.
+        if not AnalysisPool.isAvailable():
+            return
+        files = ['cl-doc-association01.cls', 'cl-doc-attribute01.cls']
+        occurrences = []
+        for processes in (1, 2):
+            directory = tempfile.mkdtemp()
+            for file in files + ['g01.gls']:
+                shutil.copy(getTestFile('cls/%s' % file), directory)
+            paths = [os.path.join(directory, f) for f in files]
+            nb_worker_analyses = AnalysisPool.nbWorkerAnalyses
+            AnalysisPool.analyzeAll(
+                ImportGraph(paths).levels, processes=processes)
+            assert AnalysisPool.nbWorkerAnalyses - nb_worker_analyses \
+                == (0 if processes == 1 else 2)
+            glossary = Megamodel.sourceFile(
+                os.path.realpath(os.path.join(directory, 'g01.gls')))
+            for entry in glossary.model.packages[0].entries:
+                for o in entry.occurrences:
+                    assert o.model in [
+                        Megamodel.loadFile(p).model for p in paths]
+            occurrences.append(_occurrences(glossary))
+        assert occurrences[0]['Un'] == [
+            ('cl-doc-association01.cls', 'Un'),
+            ('cl-doc-attribute01.cls', 'Un')]
+        assert occurrences[1] == occurrences[0]
+
+    def testMainFiles(self):
+        directory = tempfile.mkdtemp()
+        generateWorkspace(directory, 2)
+        graph = ImportGraph([
+            os.path.join(directory, 'obs', 'ob-main-turbo-000.obs')])
+        assert [
+            os.path.basename(f)
+            for f in AnalysisPool.mainFiles(graph.levels, processes=2)
+        ] == ['cl-main-cybercompany-a.cls', 'ob-main-turbo-000.obs']
@@ -0,0 +1,62 @@
+# coding=utf-8
+from modelscript.megamodels.checkers import (
+    Checker,
+    CheckList)
+
+
+class _Node(object):
+    def __init__(self, name, children=()):
+        self.name = name
+        self.children = list(children)
+
+
+class _Leaf(_Node):
+    pass
+
+
+class _RecordingChecker(Checker):
+    def __init__(self, **params):
+        super(_RecordingChecker, self).__init__(**params)
+        self.checked = []
+
+    def doCheck(self, e):
+        self.checked.append(e.name)
+
+
+NODE_CHECKER = _RecordingChecker(metaclasses=[_Node])
+LEAF_CHECKER = _RecordingChecker(metaclasses=[_Leaf, _Node])
+
+
+class TestCheckList(object):
+
+    def setup_method(self, method):
+        NODE_CHECKER.checked = []
+        LEAF_CHECKER.checked = []
+
+    def testDispatch(self):
+        # checkers of superclasses apply, once
+        assert CheckList.checkersFor(_Node) == (NODE_CHECKER, LEAF_CHECKER)
+        assert CheckList.checkersFor(_Leaf) == (LEAF_CHECKER, NODE_CHECKER)
+        assert LEAF_CHECKER.code == 'cck._Leaf__Node._RecordingChecker'
+
+    def testCheckTree(self):
+        shared = _Leaf('shared')
+        root = _Node('root', [
+            _Node('a', [_Leaf('a1'), shared]),
+            _Node('b', [shared, _Leaf('b1')])])
+        assert CheckList.checkTree(root) == 6
+        assert NODE_CHECKER.checked == [
+            'root', 'a', 'a1', 'shared', 'b', 'b1']
+        assert LEAF_CHECKER.checked == NODE_CHECKER.checked
+
+    def testTimings(self):
+        CheckList.timings.pop('_RecordingChecker', None)
+        CheckList.checkTree(_Leaf('untimed'))
+        assert '_RecordingChecker' not in CheckList.timings
+        CheckList.recordTimings = True
+        try:
+            CheckList.checkTree(_Node('root', [_Leaf('a'), _Leaf('b')]))
+        finally:
+            CheckList.recordTimings = False
+        assert CheckList.timings['_RecordingChecker'][0] == 6
+        assert '_RecordingChecker: ' in CheckList.timingReport()
@@ -0,0 +1,39 @@
+# coding=utf-8
+import os
+
+from modelscript.megamodels import Megamodel
+from modelscript.test.framework import getTestFile
+
+
+def _names(sources):
+    return sorted(os.path.basename(s.fileName) for s in sources)
+
+
+class TestDependencyClosures(object):
+
+    def testSourceFiles(self):
+        scenario = Megamodel.loadFile(getTestFile('scs/sc-check01.scs'))
+        class_source = Megamodel.sourceFile(
+            path=os.path.realpath(
+                getTestFile('cls/cl-main-cybercompany-a.cls')))
+        assert _names(Megamodel.usedSourceFileClosure(scenario)) == [
+            'cl-main-cybercompany-a.cls', 'us-main-CyberCompany01.uss']
+        assert _names(scenario.allUsedSourceFiles) == [
+            'cl-main-cybercompany-a.cls', 'us-main-CyberCompany01.uss']
+        assert scenario.allUsedMetamodels == {
+            s.metamodel for s in scenario.allUsedSourceFiles}
+        assert scenario in Megamodel.usingSourceFileClosure(class_source)
+        assert scenario in Megamodel.dependentSourceFiles(class_source)
+        order = Megamodel.sourceFileList(origins=[scenario])
+        assert order[-1] is scenario
+        assert order.index(class_source) < order.index(scenario)
+
+        model = scenario.model
+        assert model in [
+            d.sourceModel for d in class_source.model.inDependencies()]
+
+        Megamodel.unregisterSourceFile(scenario)
+        assert scenario not in Megamodel.usingSourceFileClosure(
+            class_source)
+        assert model not in [
+            d.sourceModel for d in class_source.model.inDependencies()]
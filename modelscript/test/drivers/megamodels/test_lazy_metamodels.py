@@ -0,0 +1,42 @@
+# coding=utf-8
+from modelscript.megamodels import Megamodel
+from modelscript.test.benchmarks.startup import (
+    GLOSSARY,
+    Startup)
+
+
+def _scriptPackages(startup):
+    return {
+        m.split('.')[2] for m in startup.modulesIn('modelscript.scripts')}
+
+
+class TestLazyMetamodels(object):
+
+    def testImportLoadsNoScripts(self):
+        startup = Startup('import modelscript')
+        assert 'modelscript.metamodels.glossaries' in startup.modules
+        assert 'modelscript.megamodels' in startup.importTimes
+        assert _scriptPackages(startup) == {'metamodels'}
+        for module in (
+                'modelscript.metamodels.classes.checkers',
+                'modelscript.tools.use.engine',
+                'graphviz'):
+            assert module not in startup.modules
+
+    def testLoadFileLoadsItsMetamodel(self):
+        startup = Startup(
+            'import modelscript\n'
+            'from modelscript.megamodels import Megamodel\n'
+            'Megamodel.loadFile(%r)' % GLOSSARY)
+        assert _scriptPackages(startup) == {
+            'glossaries', 'textblocks', 'megamodels', 'metamodels'}
+        assert 'modelscript.metamodels.glossaries.checkers' \
+            in startup.modules
+        assert 'modelscript.metamodels.classes.checkers' \
+            not in startup.modules
+
+    def testSourceClass(self):
+        metamodel = Megamodel.theMetamodel(ext='.res')
+        assert metamodel.sourceClass.__name__ == 'RelationModelSource'
+        assert 're' not in Megamodel._metamodelLoaders
+        assert metamodel.sourcePrinterClass is not None
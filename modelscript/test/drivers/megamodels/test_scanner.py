@@ -0,0 +1,96 @@
+# coding=utf-8
+import os
+import tempfile
+
+from modelscript.megamodels import Megamodel
+from modelscript.scripts.megamodels.scanner import (
+    ImportGraph,
+    scanHeader)
+from modelscript.test.framework import getTestFile
+
+
+class TestScanner(object):
+
+    def setup_method(self, method):
+        self.directory = tempfile.mkdtemp()
+
+    def _file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def testHeader(self):
+        file = self._file('a.cls', (
+            '// a comment\n'
+            '    //@Issue x 1\n'
+            '\n'
+            'preliminary class model A\n'
+            '    | a description\n'
+            '    | import class model from "x.cls"\n'
+            'import glossary model from "g.gls"  // comment\n'
+            "include object model from '../o.obs'\n"
+            'class A\n'
+            "import glossary model from 'h.gls'\n"))
+        header = scanHeader(file)
+        assert header.metamodelLabel == 'class'
+        assert header.modelKinds == ['preliminary']
+        assert header.modelName == 'A'
+        assert [(i.modifier, i.metamodelLabel, i.lineNo)
+                for i in header.imports] == [
+            ('import', 'glossary', 7),
+            ('include', 'object', 8)]
+        assert header.targetFilenames == [
+            os.path.join(self.directory, 'g.gls'),
+            os.path.join(os.path.dirname(self.directory), 'o.obs')]
+        assert header.nbLines == 9
+
+    def testNoDefinition(self):
+        file = self._file('b.gls', (
+            "import glossary model from 'a.gls'\n"
+            'glossary model B\n'))
+        header = scanHeader(file)
+        assert header.metamodelLabel is None
+        assert header.imports == []
+
+    def testSameAsParser(self):
+        file = getTestFile('imports/imp-3-ok01.scs')
+        source = Megamodel.loadFile(file)
+        header = scanHeader(file)
+        assert header.modelName == source.importBox.modelName
+        assert header.targetFilenames == [
+            i.importStmt.absoluteTargetFilename
+            for i in source.importBox.imports]
+
+    def testGraph(self):
+        file = getTestFile('imports/imp-3-ok01.scs')
+        graph = ImportGraph([file])
+        names = lambda paths: [os.path.basename(p) for p in paths]
+        assert names(graph.order) == [
+            'imp-3-ok01.gls', 'imp-3-ok01.cls',
+            'imp-3-ok01.obs', 'imp-3-ok01.scs']
+        assert [names(level) for level in graph.levels] == [
+            ['imp-3-ok01.gls'], ['imp-3-ok01.cls'],
+            ['imp-3-ok01.obs'], ['imp-3-ok01.scs']]
+        assert graph.cycles == []
+
+    def testCycles(self):
+        a = self._file('a.cls', (
+            'class model A\n'
+            "import glossary model from 'g.gls'\n"
+            "import class model from 'b.cls'\n"
+            "import class model from 'missing.cls'\n"))
+        self._file('b.cls', (
+            'class model B\n'
+            "import class model from 'a.cls'\n"))
+        self._file('g.gls', 'glossary model G\n')
+        graph = ImportGraph([a])
+        names = lambda paths: [os.path.basename(p) for p in paths]
+        assert sorted(names(graph.paths)) == ['a.cls', 'b.cls', 'g.gls']
+        assert [names(cycle) for cycle in graph.cycles] == [
+            ['a.cls', 'b.cls']]
+        assert [names(level) for level in graph.levels] == [
+            ['g.gls'], ['a.cls', 'b.cls']]
+        circular = getTestFile('imports/imp-0-circular01.gls')
+        assert ImportGraph([circular]).cycles == [
+            [os.path.realpath(circular)]]
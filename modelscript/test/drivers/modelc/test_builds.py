@@ -0,0 +1,109 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+
+from modelscript.interfaces.modelc.builds import (
+    BuildState,
+    CachedSourceFile,
+    fileHash)
+from modelscript.interfaces.modelc.execution import ExecutionContext
+from modelscript.megamodels import Megamodel
+from modelscript.test.framework import (
+    TEST_CASES_DIRECTORY,
+    getTestFile)
+
+
+def copyTestCases(basenames):
+    directory = tempfile.mkdtemp()
+    for basename in basenames:
+        shutil.copy(
+            os.path.join(TEST_CASES_DIRECTORY, 'imports', basename),
+            directory)
+    return directory
+
+
+class TestBuildState(object):
+
+    def setup_method(self, method):
+        self.previousDirectory = BuildState._directory
+        BuildState._directory = tempfile.mkdtemp()
+
+    def teardown_method(self, method):
+        BuildState._directory = self.previousDirectory
+
+    def testReplay(self):
+        d = copyTestCases([
+            'imp-1-okko02.gls', 'imp-1-okko02.cls'])
+        bc = ExecutionContext(['--incremental', d])
+        assert bc.nbIssues == 2
+        state = BuildState('full')
+        cls_file = os.path.realpath(os.path.join(d, 'imp-1-okko02.cls'))
+        assert state.isUpToDate(cls_file)
+        replayed = CachedSourceFile(state, cls_file, state.entries[cls_file])
+        source = bc.buildState.sourceFile(cls_file)
+        assert replayed.label == source.label
+        assert (
+            replayed.issues.str(styled=False, summary=False)
+            == source.issues.str(styled=False, summary=False))
+
+    def testChangedDependency(self):
+        d = copyTestCases([
+            'imp-2-ok01.gls', 'imp-2-ok01.cls', 'imp-2-ok01.obs'])
+        ExecutionContext(['--incremental', d])
+        files = [
+            os.path.realpath(os.path.join(d, 'imp-2-ok01' + ext))
+            for ext in ('.gls', '.cls', '.obs')]
+        assert all(BuildState('full').isUpToDate(f) for f in files)
+        with open(files[1], 'a') as f:
+            f.write('\n')
+        state = BuildState('full')
+        assert state.isUpToDate(files[0])
+        assert not state.isUpToDate(files[1])
+        assert not state.isUpToDate(files[2])
+        # each analysis level has its own build state
+        assert not BuildState('justAST').isUpToDate(files[0])
+
+    def testImportCycle(self):
+        d = os.path.realpath(tempfile.mkdtemp())
+        (a, b, c) = (os.path.join(d, name) for name in ('a', 'b', 'c'))
+        for file in (a, b, c):
+            with open(file, 'w') as f:
+                f.write(file)
+        state = BuildState('full')
+        state.entries = {
+            a: {'hash': fileHash(a), 'imports': [b, c]},
+            b: {'hash': fileHash(b), 'imports': [a]},
+            c: {'hash': 'changed', 'imports': []}}
+        # b is in a cycle with a which depends on the changed file
+        assert not state.isUpToDate(a)
+        assert not state.isUpToDate(b)
+        state.entries[c]['hash'] = fileHash(c)
+        state._upToDate = {}
+        assert state.isUpToDate(b)
+        assert state.isUpToDate(a)
+
+    def testAnalysisOptions(self):
+        d = tempfile.mkdtemp()
+        shutil.copy(getTestFile('gls/gl-main-medium.gls'), d)
+
+        def unreferenced(args):
+            # as with a new modelc process
+            bc = ExecutionContext(args)
+            for source in bc.allSourceFileList:
+                if not isinstance(source, CachedSourceFile):
+                    Megamodel.unregisterSourceFile(source)
+            return (bc, [
+                i for source in bc.allSourceFileList
+                for i in source.issues.all
+                if i.code == 'txt.UnreferencedTerm'])
+
+        assert unreferenced(['--incremental', d])[1] == []
+        (bc, issues) = unreferenced(
+            ['--incremental', '--unreferenced-terms', d])
+        assert len(issues) == 1
+        # replayed with the same options
+        (bc, issues) = unreferenced(
+            ['--incremental', '--unreferenced-terms', d])
+        assert len(issues) == 1
+        assert isinstance(bc.allSourceFileList[0], CachedSourceFile)
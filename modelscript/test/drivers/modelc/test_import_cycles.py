@@ -0,0 +1,48 @@
+# coding=utf-8
+import os
+import tempfile
+
+from modelscript.interfaces.modelc.execution import ExecutionContext
+from modelscript.megamodels import Megamodel
+from modelscript.test.framework import (
+    TEST_CASES_DIRECTORY,
+    getTestFile)
+
+
+def objectModel(name, imported):
+    return '\n'.join([
+        'object model %s' % name.upper(),
+        "import class model from '%s'" % getTestFile(
+            'cls/cl-main-cybercompany-a.cls'),
+        "import object model from '%s.obs'" % imported,
+        '',
+        '%s : Employee' % name,
+        ''])
+
+
+def cycleIssues(path):
+    source = Megamodel.sourceFile(path=os.path.realpath(path))
+    return [
+        (issue.line, issue.message)
+        for issue in source.issues.all
+        if issue.code == 'mgm.sem.Import.Cycle']
+
+
+def testCycleReportedOnSources():
+    d = tempfile.mkdtemp()
+    for (name, imported) in [('a', 'b'), ('b', 'a')]:
+        with open(os.path.join(d, name + '.obs'), 'w') as f:
+            f.write(objectModel(name, imported))
+    ExecutionContext([d])
+    for name in ['a', 'b']:
+        assert cycleIssues(os.path.join(d, name + '.obs')) == [
+            (3, 'Import cycle between a.obs, b.obs.')]
+
+
+def testCycleNotReportedTwice():
+    # the parser already rejects a glossary importing a glossary
+    file = os.path.join(
+        TEST_CASES_DIRECTORY, 'imports', 'imp-0-circular01.gls')
+    bc = ExecutionContext([file])
+    assert bc.nbIssues == 1
+    assert cycleIssues(file) == []
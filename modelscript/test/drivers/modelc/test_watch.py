@@ -0,0 +1,67 @@
+# coding=utf-8
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+from modelscript.interfaces.modelc.execution import ExecutionContext
+from modelscript.interfaces.modelc.watch import Watcher
+from modelscript.megamodels import Megamodel
+from modelscript.test.framework import TEST_CASES_DIRECTORY
+
+
+def copyTestCases(basenames):
+    directory = tempfile.mkdtemp()
+    for basename in basenames:
+        shutil.copy(
+            os.path.join(TEST_CASES_DIRECTORY, 'imports', basename),
+            directory)
+    return directory
+
+
+class TestWatcher(object):
+
+    def setup_method(self, method):
+        self.directory = copyTestCases([
+            'imp-2-ok01.gls', 'imp-2-ok01.cls', 'imp-2-ok01.obs'])
+        (self.gls, self.cls, self.obs) = [
+            os.path.realpath(
+                os.path.join(self.directory, 'imp-2-ok01' + ext))
+            for ext in ('.gls', '.cls', '.obs')]
+
+    def testInvalidateDependents(self):
+        watcher = Watcher(ExecutionContext(['--watch', self.directory]))
+        assert watcher.args == [self.directory]
+        assert watcher.changedFiles() == []
+        gls_source = Megamodel.sourceFile(path=self.gls)
+        with open(self.cls, 'a') as f:
+            f.write('\n')
+        assert watcher.changedFiles() == [self.cls]
+        context = watcher.check()
+        assert watcher.changedFiles() == []
+        # the glossary has not been analyzed again
+        assert Megamodel.sourceFile(path=self.gls) is gls_source
+        assert context.nbIssues == 0
+        assert (
+            [s.basename for s in context.allSourceFileList]
+            == ['imp-2-ok01.gls', 'imp-2-ok01.cls', 'imp-2-ok01.obs'])
+        assert Megamodel.sourceFile(path=self.obs).model.classModel \
+            is Megamodel.sourceFile(path=self.cls).model
+
+    def testServe(self):
+        watcher = Watcher(ExecutionContext([self.obs]))
+        server = watcher.server(0)
+        port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        with open(self.cls, 'a') as f:
+            f.write('\n')
+        connection = socket.create_connection(('localhost', port), 10)
+        connection.sendall(b'-m full\n')
+        response = connection.makefile().read()
+        connection.close()
+        server.shutdown()
+        server.server_close()
+        assert 'imp-2-ok01.obs:OK' in response
+        assert watcher.changedFiles() == []
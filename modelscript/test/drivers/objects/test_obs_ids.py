@@ -0,0 +1,81 @@
+# coding=utf-8
+import random
+
+from modelscript.metamodels.classes.core import StringValue
+from modelscript.metamodels.classes.types import UNSPECIFIED
+from modelscript.metamodels.objects import ShadowObjectModel
+from modelscript.metamodels.objects.objects import (
+    PlainObject,
+    Slot,
+    _ClassPrintIndex)
+from modelscript.scripts.objects.parser import ObjectModelSource
+from modelscript.test.framework import getTestFile
+
+
+def _classModel():
+    source_file = ObjectModelSource(getTestFile('obs/ob-ids01.obs'))
+    assert source_file.isValid
+    return source_file.objectModel.classModel
+
+
+def _pairwise(objects):
+    """Reference implementation: compare all pairs of objects."""
+    duplicates = []
+    grouped = set()
+    has_unspecified = False
+    for (i, o1) in enumerate(objects):
+        like_o1 = [o1]
+        for o2 in objects[i+1:]:
+            eq = o1.idPrint.equals(o2.idPrint)
+            if eq is UNSPECIFIED:
+                has_unspecified = True
+            elif eq and o1 not in grouped:
+                like_o1.append(o2)
+                grouped.add(o2)
+        if len(like_o1) >= 2:
+            duplicates.append(like_o1)
+    return (duplicates, has_unspecified)
+
+
+def _randomObjects(classModel, seed, nbObjects):
+    rand = random.Random(seed)
+    employee = classModel.class_('Employee')
+    state = ShadowObjectModel(classModel)
+    objects = []
+    for i in range(nbObjects):
+        o = PlainObject(state, 'e%i' % i, employee)
+        for attribute in employee.attributes:
+            if rand.random() < 0.9:
+                Slot(o, attribute, StringValue(
+                    "'%i'" % rand.randint(0, 2),
+                    attribute.type))
+        objects.append(o)
+    return objects
+
+
+class TestClassPrintIndex(object):
+
+    def testSameAsPairwise(self):
+        class_model = _classModel()
+        for seed in range(50):
+            objects = _randomObjects(class_model, seed, 12)
+            index = _ClassPrintIndex(objects)
+            assert (index.duplicates, index.hasUnspecified) \
+                == _pairwise(objects)
+
+    def testNoUnspecified(self):
+        class_model = _classModel()
+        number = class_model.class_('Number')
+        state = ShadowObjectModel(class_model)
+        objects = []
+        for (name, value) in [
+                ('a', '1'), ('b', '2'), ('a', '2'), ('a', '1')]:
+            o = PlainObject(state, 'n%i' % len(objects), number)
+            Slot(o, number.attribute('name'), StringValue(
+                "'%s'" % name, number.attribute('name').type))
+            Slot(o, number.attribute('value'), StringValue(
+                "'%s'" % value, number.attribute('value').type))
+            objects.append(o)
+        index = _ClassPrintIndex(objects)
+        assert index.duplicates == [[objects[0], objects[3]]]
+        assert not index.hasUnspecified
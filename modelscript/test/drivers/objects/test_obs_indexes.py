@@ -0,0 +1,75 @@
+# coding=utf-8
+import pytest
+
+from modelscript.metamodels.objects import ElementView
+from modelscript.metamodels.objects.links import PlainLink
+from modelscript.metamodels.objects.objects import (
+    PlainObject,
+    Slot)
+from modelscript.scripts.objects.parser import ObjectModelSource
+from modelscript.test.framework import getTestFile
+
+
+def _model():
+    source_file = ObjectModelSource(getTestFile('obs/ob-main-turbo.obs'))
+    assert source_file.isValid
+    return source_file.objectModel
+
+
+def _indexes(model):
+    """The content of the indexes, by names, compared to the result
+    of linear scans."""
+    classes = model.classModel.classes
+    extensions = [
+        [o.name for o in model.classExtension(c)] for c in classes]
+    assert extensions == [
+        [o.name for o in model.objects if o.class_ == c] for c in classes]
+    assert all(
+        model.plainLinks[index] is link
+        for (link, index) in model._plainLinkIndex.items())
+    return extensions
+
+
+class TestIndexes(object):
+
+    def testParsedModel(self):
+        _indexes(_model())
+
+    def testViews(self):
+        state = _model().copy()
+        objects = state.objects
+        assert isinstance(objects, ElementView)
+        n = len(objects)
+        zoe = state.object('zoe')
+        PlainObject(state, 'bob', zoe.class_)
+        assert len(objects) == n+1
+        assert 'bob' in state.objectNames
+        assert list(objects)[-1] is state.object('bob')
+        with pytest.raises(TypeError):
+            objects[-1]
+        assert list(state.classExtension(zoe.class_))[-1].name == 'bob'
+        # views are iterated on a copy when the model changes
+        plain_objects = list(state.plainObjects)
+        for o in plain_objects:
+            PlainObject(state, o.name + '2', o.class_)
+        assert len(objects) == n+1+len(plain_objects)
+
+    def testSnapshots(self):
+        state = _model().copy()
+        s1 = state.snapshot()
+        indexes1 = _indexes(s1)
+        zoe = state.object('zoe')
+        bob = PlainObject(state, 'bob', zoe.class_)
+        Slot(bob, zoe.slot('name').attribute, zoe.slot('name').simpleValue)
+        for l in list(state.plainLinks):
+            if l.sourceObject is zoe:
+                PlainLink(state, l.association, bob, l.targetObject)
+                PlainLink(state, l.association, zoe, l.targetObject)
+        # replaced by an object with the same name
+        PlainObject(state, 'carl', zoe.class_)
+        state.snapshot()
+        PlainObject(state, 'carl', zoe.class_)
+        s2 = state.snapshot()
+        assert _indexes(s2) == _indexes(state.copy())
+        # the previous snapshot is unchanged
+        assert _indexes(s1) == indexes1
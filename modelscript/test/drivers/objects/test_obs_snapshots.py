@@ -0,0 +1,153 @@
+# coding=utf-8
+
+from modelscript.metamodels.objects.links import PlainLink
+from modelscript.metamodels.objects.objects import (
+    PlainObject,
+    Slot)
+from modelscript.metamodels.objects.statechecker import StateCheck
+from modelscript.scripts.objects.parser import ObjectModelSource
+from modelscript.test.framework import getTestFile
+
+
+def _content(model):
+    return (
+        [(o.name, [str(s) for s in o.slots]) for o in model.objects],
+        [str(l) for l in model.links])
+
+
+def _cardinalities(model):
+    return {
+        (o.name, role.name): o.cardinality(role)
+        for o in model.objects
+        for role in o._link_roles_per_role}
+
+
+def _state():
+    source_file = ObjectModelSource(getTestFile('obs/ob-main-turbo.obs'))
+    assert source_file.isValid
+    return source_file.objectModel.copy()
+
+
+class TestSnapshots(object):
+
+    def testSameContentAsCopy(self):
+        state = _state()
+        snapshot = state.snapshot()
+        copy = state.copy()
+        assert snapshot.objectNames == copy.objectNames
+        assert [str(l) for l in snapshot.links] \
+            == [str(l) for l in copy.links]
+        for o in snapshot.objects:
+            assert o.model is snapshot
+            assert [str(s) for s in o.slots] \
+                == [str(s) for s in copy.object(o.name).slots]
+
+    def testUnchangedElementsAreShared(self):
+        state = _state()
+        s1 = state.snapshot()
+        s2 = state.snapshot()
+        assert all(
+            s1.object(name) is s2.object(name)
+            for name in state.objectNames)
+        assert all(
+            l1 is l2 for (l1, l2) in zip(s1.plainLinks, s2.plainLinks))
+
+    def testChangedObjectIsCopied(self):
+        state = _state()
+        s1 = state.snapshot()
+        zoe = state.object('zoe')
+        old_slot = zoe.slot('salary')
+        Slot(
+            object=zoe,
+            attribute=old_slot.attribute,
+            simpleValue=state.object('babako').slot('salary').simpleValue)
+        s2 = state.snapshot()
+        assert s2.object('zoe') is not s1.object('zoe')
+        assert s2.object('zoe').slot('salary').simpleValue.value == 1800
+        assert s1.object('zoe').slot('salary').simpleValue.value == 3500
+        assert s2.object('babako') is s1.object('babako')
+        # links of zoe refer to the new copy of zoe
+        zoe_links = [
+            l for l in s2.plainLinks
+            if 'zoe' in (l.sourceObject.name, l.targetObject.name)]
+        assert len(zoe_links) > 0
+        for l in zoe_links:
+            assert s2.object('zoe') in (l.sourceObject, l.targetObject)
+
+    def testSameContentAfterChanges(self):
+        state = _state()
+        state.snapshot()
+        zoe = state.object('zoe')
+        bob = PlainObject(state, 'bob', zoe.class_)
+        Slot(bob, zoe.slot('name').attribute, zoe.slot('name').simpleValue)
+        for l in list(state.plainLinks):
+            if l.sourceObject is zoe:
+                PlainLink(state, l.association, bob, l.targetObject)
+        snapshot = state.snapshot()
+        assert _content(snapshot) == _content(state.copy())
+        for l in snapshot.plainLinks:
+            assert snapshot.object(l.sourceObject.name) is l.sourceObject
+            assert snapshot.object(l.targetObject.name) is l.targetObject
+
+
+class TestIncrementalStateCheck(object):
+
+    def _check(self, snapshot):
+        snapshot.finalize()
+        full = StateCheck(snapshot, incremental=False)
+        full.check()
+        return (snapshot.stateCheck, full)
+
+    def testSameViolationsAsFullCheck(self):
+        state = _state()
+        (first, _) = self._check(state.snapshot())
+        assert first.previous is None
+        zoe = state.object('zoe')
+        # an object without slots and with the same id as zoe
+        bob = PlainObject(state, 'bob', zoe.class_)
+        Slot(bob, zoe.slot('name').attribute, zoe.slot('name').simpleValue)
+        # duplicated links
+        for l in list(state.plainLinks):
+            if l.sourceObject is zoe:
+                PlainLink(state, l.association, zoe, l.targetObject)
+        (incremental, full) = self._check(state.snapshot())
+        assert incremental.previous is first
+        assert len(incremental.changedElements) \
+            < len(state.objects) + len(state.links)
+        assert len(full.messages) > len(first.messages)
+        assert incremental.messages == full.messages
+        # no change
+        (next, full) = self._check(state.snapshot())
+        assert next.changedElements == set()
+        assert next.messages == full.messages == incremental.messages
+
+    def testSharedObjectsKeepTheirLinkRoles(self):
+        state = _state()
+        s1 = state.snapshot()
+        s1.finalize()
+        before = _cardinalities(s1)
+        # zoe only gains a slot, so its links are copied again
+        # while the objects at the other end are shared
+        zoe = state.object('zoe')
+        Slot(
+            object=zoe,
+            attribute=zoe.slot('salary').attribute,
+            simpleValue=state.object('babako').slot('salary').simpleValue)
+        s2 = state.snapshot()
+        s2.finalize()
+        assert s2.stateCheck.previous is s1.stateCheck
+        expected = state.copy()
+        expected.finalize()
+        assert _cardinalities(s2) == _cardinalities(expected)
+        assert _cardinalities(s1) == before
+        shared = [
+            l.object(position)
+            for l in s2.links
+            for position in ('source', 'target')
+            if zoe.name in (l.sourceObject.name, l.targetObject.name)
+            and l.object(position).name != zoe.name]
+        assert shared
+        for o in shared:
+            assert o is s1.object(o.name)
+            for link_roles in o._link_roles_per_role.values():
+                assert len(link_roles) == len(set(link_roles))
@@ -0,0 +1,125 @@
+# coding=utf-8
+import json
+
+from modelscript.metamodels.permissions import (
+    CreateAction,
+    ReadAction,
+    UpdateAction)
+from modelscript.metamodels.permissions.accesses import (
+    AccessSet,
+    Access)
+from modelscript.metamodels.permissions.gpermissions import (
+    Authorisation,
+    Denial,
+    Permission,
+    PermissionSet)
+from modelscript.metamodels.permissions.matrices import (
+    PermissionMatrix)
+from modelscript.metamodels.permissions.sar import (
+    Subject,
+    Resource)
+from modelscript.scripts.permissions.matrices import (
+    matrixCSV,
+    matrixJSON)
+
+
+class _Subject(Subject):
+    def __init__(self, name, parents=()):
+        self.name = name
+        self.parents = list(parents)
+
+    @property
+    def superSubjects(self):
+        return self.parents
+
+
+class _Resource(Resource):
+    def __init__(self, name, parents=()):
+        self.name = name
+        self.parents = list(parents)
+
+    @property
+    def superResources(self):
+        return self.parents
+
+
+def _permissionSet():
+    # staff <- clerk <- (step1, step2) ; diamond: step2 <- intern too
+    staff = _Subject('staff')
+    clerk = _Subject('clerk', [staff])
+    intern = _Subject('intern', [staff])
+    step1 = _Subject('step1', [clerk])
+    step2 = _Subject('step2', [clerk, intern])
+    item = _Resource('Item')
+    book = _Resource('Book', [item])
+    ps = PermissionSet()
+    for (s, a, r) in [
+            (staff, ReadAction, item),
+            (clerk, UpdateAction, book),
+            (intern, CreateAction, item)]:
+        ps.add(Permission(s, a, r))
+    return (ps, [staff, clerk, intern, step1, step2], [item, book])
+
+
+class TestControl(object):
+
+    def testSameAsAccept(self):
+        (ps, subjects, resources) = _permissionSet()
+        accesses = AccessSet(ps)
+        for s in subjects:
+            for a in [CreateAction, ReadAction, UpdateAction]:
+                for r in resources:
+                    access = Access(s, a, r, accesses)
+                    accepting = [
+                        p for p in ps.permissions if p.accept(access)]
+                    if accepting:
+                        assert isinstance(access.control, Authorisation)
+                        assert access.control.permission in accepting
+                    else:
+                        assert isinstance(access.control, Denial)
+        assert len(ps.controls) == 5 * 3 * 2
+
+    def testMostSpecific(self):
+        (ps, subjects, resources) = _permissionSet()
+        (staff, clerk, intern, step1, step2) = subjects
+        (item, book) = resources
+        ps.add(Permission(step1, ReadAction, book))
+        access = Access(step1, ReadAction, book, AccessSet())
+        assert ps.permissionFor(access).subject is step1
+        access = Access(step2, ReadAction, book, AccessSet())
+        assert ps.permissionFor(access).subject is staff
+        assert step2.allSuperSubjects == [step2, clerk, staff, intern]
+
+
+class TestMatrix(object):
+
+    def testSameAsControl(self):
+        (ps, subjects, resources) = _permissionSet()
+        accesses = AccessSet()
+        for s in subjects:
+            for a in [CreateAction, ReadAction, UpdateAction]:
+                for r in resources:
+                    Access(s, a, r, accesses)
+        matrix = PermissionMatrix(ps, subjects=subjects)
+        assert matrix.controlAll(accesses.accesses) == [
+            ps.permissionFor(a) is not None for a in accesses.accesses]
+
+    def testExports(self):
+        (ps, subjects, resources) = _permissionSet()
+        (staff, clerk, intern, step1, step2) = subjects
+        matrix = PermissionMatrix(
+            ps,
+            subjects=[clerk, step2],
+            actions=[CreateAction, ReadAction, UpdateAction],
+            resources=resources)
+        assert matrixCSV(matrix).splitlines() == [
+            'subject,resource,create,read,update',
+            'clerk,Item,,x,',
+            'clerk,Book,,x,x',
+            'step2,Item,x,x,',
+            'step2,Book,x,x,x']
+        assert json.loads(matrixJSON(matrix))['permissions'] == {
+            'clerk': {'Item': ['read'], 'Book': ['read', 'update']},
+            'step2': {
+                'Item': ['create', 'read'],
+                'Book': ['create', 'read', 'update']}}
@@ -0,0 +1,144 @@
+# coding=utf-8
+import os
+import tempfile
+
+from modelscript.megamodels import Megamodel
+from modelscript.metamodels.objects import ShadowObjectModel
+from modelscript.metamodels.stories.evaluations.evaluator import (
+    StoryEvaluator,
+    StoryIncludeCache)
+from modelscript.test.framework import getTestFile
+
+SCENARIOS = '''scenario model Sc_shared
+
+import class model from '%s'
+
+context C
+    computing : Department
+    computing.name = 'Computing'
+    check
+    nobody.name = 'X'
+
+story S
+    create hardware : Department
+
+scenario A
+    include context C
+    include story S
+    check
+
+scenario B
+    include context C
+    include story S
+    create research : Department
+    check
+
+scenario D
+    create research : Department
+    include context C
+'''
+
+
+class TestStoryIncludes(object):
+
+    def setup_method(self, method):
+        directory = tempfile.mkdtemp()
+        file = os.path.join(directory, 'sc-shared.scs')
+        with open(file, 'w') as f:
+            f.write(SCENARIOS % getTestFile('cls/cl-main-cybercompany-a.cls'))
+        self.source = Megamodel.loadFile(file)
+        self.scenarios = {
+            s.name: s for s in self.source.scenarioModel.scenarios}
+
+    def _include(self, scenario):
+        return scenario.storyEvaluation.stepEvaluations[0]
+
+    def testSharedEvaluation(self):
+        (a, b, d) = (self.scenarios[n] for n in 'ABD')
+        (include_a, include_b) = (self._include(a), self._include(b))
+        assert include_b is not include_a
+        included_b = include_b.storyEvaluationIncluded
+        assert included_b.parent is include_b
+        assert included_b.step is include_a.storyEvaluationIncluded.step
+        # the issue of the context is raised again for each includer
+        (failed_a, failed_b) = (
+            i.storyEvaluationIncluded.stepEvaluations[-1]
+            for i in (include_a, include_b))
+        assert len(failed_b.issues) == 1
+        assert failed_b.issues[0] is not failed_a.issues[0]
+        assert str(failed_b.issues[0]) == str(failed_a.issues[0])
+        # the check of the context is evaluated once from the
+        # same state, and again from another state
+        (check_a, check_b, check_d) = (
+            s.storyEvaluation.checkEvaluations[0] for s in (a, b, d))
+        assert check_b is not check_a
+        assert check_b.storyEvaluation is b.storyEvaluation
+        assert check_b.frozenState is not check_a.frozenState
+        assert check_b.frozenState._previousSnapshot \
+            is check_a.frozenState
+        assert check_d.frozenState is not check_a.frozenState
+        assert list(check_d.frozenState.objectNames) == [
+            'research', 'computing']
+        final_b = b.storyEvaluation.checkEvaluations[-1].frozenState
+        assert list(final_b.objectNames) == [
+            'computing', 'hardware', 'research']
+        assert final_b.object('computing').slot('name') is not None
+
+    def testAccesses(self):
+        evaluations = {}
+        for cache in (None, StoryIncludeCache()):
+            for name in 'ABD':
+                evaluator = StoryEvaluator(
+                    initialState=ShadowObjectModel(
+                        classModel=self.source.classModel),
+                    storyCollection=
+                        self.source.scenarioModel.containerCollection,
+                    includeCache=cache)
+                evaluator.evaluateStory(self.scenarios[name].story)
+                evaluations[(cache is None, name)] = evaluator
+        assert (cache.nbEvaluations, cache.nbReuses) == (3, 2)
+        for name in 'ABD':
+            (plain, cached) = (
+                evaluations[(True, name)], evaluations[(False, name)])
+            assert list(cached.state.objectNames) \
+                == list(plain.state.objectNames)
+            assert cached.accessSet.accesses
+            assert [str(a) for a in cached.accessSet.accesses] \
+                == [str(a) for a in plain.accessSet.accesses]
+            assert all(
+                a.subject.storyEvaluation is cached.storyEvaluation
+                for a in cached.accessSet.accesses)
+
+    def _evaluate(self, name, cache):
+        evaluator = StoryEvaluator(
+            initialState=ShadowObjectModel(
+                classModel=self.source.classModel),
+            storyCollection=self.source.scenarioModel.containerCollection,
+            includeCache=cache)
+        evaluator.evaluateStory(self.scenarios[name].story)
+        return evaluator
+
+    def testCopiedEvaluations(self):
+        issues = {}
+        for cache in (None, StoryIncludeCache()):
+            count = len(self.source.issues.all)
+            evaluators = [self._evaluate(name, cache) for name in 'AB']
+            issues[cache is None] = [
+                str(i) for i in self.source.issues.all[count:]]
+        assert cache.nbReuses == 2
+        # the issues of the context, including the issues of its
+        # check, are raised again for the second includer
+        assert issues[False] == issues[True]
+        assert len([i for i in issues[False] if ':C.3:' in i]) == 4
+        for evaluator in evaluators:
+            story_evaluation = evaluator.storyEvaluation
+            for check in story_evaluation.checkEvaluations:
+                assert check.frozenState.checkStepEvaluation is check
+                assert check.frozenState.storyEvaluation \
+                    is story_evaluation
+        (failed_a, failed_b) = (
+            e.storyEvaluation.stepEvaluations[0]
+                .storyEvaluationIncluded.stepEvaluations[-1]
+            for e in evaluators)
+        assert failed_b.issues[0] is not failed_a.issues[0]
+        assert failed_b.issues[0].origin is failed_a.issues[0].origin
@@ -0,0 +1,68 @@
+# coding=utf-8
+"""
+A stand-in for "use -nogui -nr" used to test use sessions without
+java. The last argument is the .use file. Lines are read from the
+standard input after a "use> " prompt. Supported commands:
+
+    !<statement>      creates an object
+    ? '<text>'        prints "-> '<text>' : String"
+    ? count           prints the number of objects
+    open '<file>'     executes the commands of the file
+    reset             removes all objects
+    crash             exits with code 3
+    quit              exits
+
+If the .use file contains "error" an error is printed on stderr
+when starting.
+"""
+
+import sys
+import re
+
+objects = []
+
+
+def command(line):
+    line = line.strip()
+    m = re.match(r"^\? *'(.*)'$", line)
+    if m:
+        print("-> '%s' : String" % m.group(1))
+    elif line == '? count':
+        print('-> %i : Integer' % len(objects))
+    elif line.startswith('!'):
+        objects.append(line[1:])
+    elif line.startswith('open '):
+        with open(line[5:].strip(" '")) as f:
+            for l in f:
+                command(l)
+    elif line == 'reset':
+        del objects[:]
+    elif line == 'crash':
+        sys.stdout.flush()
+        sys.exit(3)
+    elif line == 'quit':
+        sys.exit(0)
+    elif line != '':
+        print('<input>:1:0: unknown command "%s"' % line, file=sys.stderr)
+
+
+def main():
+    use_file = sys.argv[-1]
+    print('use version 5.2.0, Copyright (C) 1999-2019 University of Bremen')
+    with open(use_file) as f:
+        if 'error' in f.read():
+            print('%s:1:0: error in model' % use_file, file=sys.stderr)
+    sys.stderr.flush()
+    while True:
+        sys.stdout.write('use> ')
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if line == '':
+            return
+        command(line)
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+if __name__ == '__main__':
+    main()
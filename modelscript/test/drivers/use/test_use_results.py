@@ -0,0 +1,115 @@
+# coding=utf-8
+import os
+import tempfile
+
+from modelscript.tools.use.engine import USEEngine
+from modelscript.tools.use.engine.results import (
+    USEResult,
+    USEResultCache)
+
+
+class TestUSEResultCache(object):
+
+    def setup_method(self, method):
+        self.previous = (
+            USEResultCache._directory,
+            USEResultCache._useVersion,
+            USEResultCache.maxSize,
+            USEEngine.__dict__['_execute'])
+        USEResultCache._directory = tempfile.mkdtemp()
+        USEResultCache._useVersion = '5.2.0'
+        self.directory = tempfile.mkdtemp()
+        self.executions = []
+        self.exitCode = 0
+
+        def execute(cls, useSource, soilSource, basicFileName,
+                    workerSpace=None, errWithOut=False,
+                    executionDirectory=None):
+            # stands for use: count executions instead
+            self.executions.append(os.path.basename(useSource))
+            cls.commandExitCode = self.exitCode
+            if errWithOut:
+                cls.outAndErr = 'trace %i' % len(self.executions)
+                cls.out = None
+            else:
+                cls.out = 'out'
+                cls.err = 'model.use:1:2: error %i' % len(self.executions)
+            return cls.commandExitCode
+
+        USEEngine._execute = classmethod(execute)
+
+    def teardown_method(self, method):
+        (USEResultCache._directory,
+         USEResultCache._useVersion,
+         USEResultCache.maxSize,
+         USEEngine._execute) = self.previous
+
+    def _file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def testAnalyzeHit(self):
+        use_file = self._file('model.use', 'model M')
+        assert USEEngine.analyzeUSEModel(use_file, workerSpace='self') == 0
+        assert USEEngine.analyzeUSEModel(use_file, workerSpace='self') == 0
+        assert self.executions == ['model.use']
+        assert USEEngine.err == 'model.use:1:2: error 1'
+        assert USEEngine.out == 'out'
+
+    def testKeyDependsOnContentAndVersion(self):
+        use_file = self._file('model.use', 'model M')
+        USEEngine.analyzeUSEModel(use_file, workerSpace='self')
+        self._file('model.use', 'model N')
+        USEEngine.analyzeUSEModel(use_file, workerSpace='self')
+        USEResultCache._useVersion = '6.0.0'
+        USEEngine.analyzeUSEModel(use_file, workerSpace='self')
+        assert len(self.executions) == 3
+        assert USEEngine.err == 'model.use:1:2: error 3'
+
+    def testTraceHit(self):
+        use_file = self._file('model.use', 'model M')
+        soil_file = self._file('s.soil', '!create x')
+        traces = []
+        for _ in range(2):
+            trace_file = USEEngine.executeSoilFileAsTrace(
+                use_file, soil_file, workerSpace='self')
+            with open(trace_file) as f:
+                traces.append(f.read())
+        assert traces == ['trace 1', 'trace 1']
+        assert len(self.executions) == 1
+
+    def testFailuresAreNotCached(self):
+        # a failure may be transient
+        self.exitCode = 1
+        use_file = self._file('model.use', 'model M')
+        assert USEEngine.analyzeUSEModel(use_file, workerSpace='self') == 1
+        assert USEEngine.analyzeUSEModel(use_file, workerSpace='self') == 1
+        assert len(self.executions) == 2
+
+    def testDisabled(self):
+        USEResultCache.enabled = False
+        try:
+            use_file = self._file('model.use', 'model M')
+            USEEngine.analyzeUSEModel(use_file, workerSpace='self')
+            USEEngine.analyzeUSEModel(use_file, workerSpace='self')
+        finally:
+            USEResultCache.enabled = True
+        assert len(self.executions) == 2
+
+    def testLeastRecentlyUsedEviction(self):
+        keys = ['%040i' % i for i in range(4)]
+        for (i, key) in enumerate(keys[:3]):
+            USEResultCache.save(key, USEResult(0, out='x' * 100))
+            os.utime(USEResultCache._file(key), (i, i))
+        # room for 3 entries
+        USEResultCache.maxSize = 3 * os.path.getsize(
+            USEResultCache._file(keys[0]))
+        # keys[0] becomes the most recently used
+        assert USEResultCache.load(keys[0]) is not None
+        USEResultCache.save(keys[3], USEResult(0, out='x' * 100))
+        assert USEResultCache.load(keys[1]) is None
+        assert all(
+            USEResultCache.load(k) is not None
+            for k in (keys[0], keys[2], keys[3]))
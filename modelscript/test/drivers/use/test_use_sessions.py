@@ -0,0 +1,163 @@
+# coding=utf-8
+import os
+import sys
+import tempfile
+
+import pytest
+
+from modelscript.tools.use.engine import USEEngine
+from modelscript.tools.use.engine.results import USEResultCache
+from modelscript.tools.use.engine.sessions import (
+    USESession,
+    USESessionPool,
+    USESessionCrash)
+
+FAKE_USE = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fakeuse.py')]
+
+
+def _useFile(directory, name='model.use', content='model M\n'):
+    path = str(directory.join(name))
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+class TestUSESession(object):
+
+    def setup_method(self, method):
+        self.sessions = []
+
+    def teardown_method(self, method):
+        for session in self.sessions:
+            session.close()
+
+    def _session(self, useFile):
+        session = USESession(useFile, command=FAKE_USE)
+        self.sessions.append(session)
+        return session
+
+    def testFraming(self, tmpdir):
+        session = self._session(_useFile(tmpdir))
+        output = session.execute("? 'a'\n? 'b'")
+        assert output == "use> -> 'a' : String\nuse> -> 'b' : String\n"
+        assert session.banner.startswith('use version 5.2.0')
+        # prompts before the sentinel are on its line
+        assert session.execute('!create x') == ''
+        assert session.nbStarts == 1
+        assert session.nbRequests == 2
+
+    def testStateIsResetBetweenRequests(self, tmpdir):
+        session = self._session(_useFile(tmpdir))
+        assert session.execute('!a\n!b\n? count').endswith('-> 2 : Integer\n')
+        assert session.execute('? count').endswith('-> 0 : Integer\n')
+
+    def testErrorsAreMerged(self, tmpdir):
+        use_file = _useFile(tmpdir, content='error')
+        session = self._session(use_file)
+        assert session.execute('unknown').startswith(
+            'use> <input>:1:0: unknown command')
+        assert ('%s:1:0: error in model' % use_file) in session.banner
+
+    def testRestartOnCrash(self, tmpdir):
+        session = self._session(_useFile(tmpdir))
+        with pytest.raises(USESessionCrash) as info:
+            session.execute("? 'before'\ncrash")
+        assert info.value.exitCode == 3
+        assert info.value.output == "use> -> 'before' : String\nuse> "
+        assert info.value.banner == session.banner
+        assert not session.isAlive
+        assert session.execute("? 'after'") == "use> -> 'after' : String\n"
+        assert session.nbStarts == 2
+
+    def testRestartWhenUseFileChanges(self, tmpdir):
+        use_file = _useFile(tmpdir)
+        session = self._session(use_file)
+        session.execute('')
+        _useFile(tmpdir, content='model M2 -- changed\n')
+        session.execute('')
+        assert session.nbStarts == 2
+
+    def testClose(self, tmpdir):
+        session = self._session(_useFile(tmpdir))
+        session.execute('')
+        session.close()
+        assert not session.isAlive
+        assert session.exitCode == 0
+
+
+class TestUSESessionPool(object):
+
+    def testLeastRecentlyUsedIsClosed(self, tmpdir):
+        pool = USESessionPool(maxSize=2, command=FAKE_USE)
+        try:
+            (a, b, c) = (
+                _useFile(tmpdir, name) for name in ('a.use', 'b.use', 'c.use'))
+            session_a = pool.session(a)
+            pool.execute(a, '')
+            pool.execute(b, '')
+            assert pool.session(a) is session_a
+            pool.execute(c, '')
+            assert [s.useFileName for s in pool.sessions] == [
+                os.path.realpath(a), os.path.realpath(c)]
+            assert session_a.isAlive
+        finally:
+            pool.close()
+        assert not session_a.isAlive
+
+    def testSize(self):
+        with pytest.raises(ValueError):
+            USESessionPool(maxSize=0)
+
+
+class TestEngineWithSessions(object):
+
+    def setup_method(self, method):
+        self.previous = (
+            USEResultCache._directory,
+            USEResultCache._useVersion)
+        USEResultCache._directory = tempfile.mkdtemp()
+        USEResultCache._useVersion = '5.2.0'
+
+    def teardown_method(self, method):
+        USEEngine.stopSessions()
+        (USEResultCache._directory,
+         USEResultCache._useVersion) = self.previous
+
+    def testExecuteSoilFileAsTrace(self, tmpdir):
+        use_file = _useFile(tmpdir)
+        soil_file = str(tmpdir.join('s.soil'))
+        with open(soil_file, 'w') as f:
+            f.write("!create x\n? count\n")
+        USEEngine.startSessions(poolSize=1, command=FAKE_USE)
+        for _ in range(2):
+            trace_file = USEEngine.executeSoilFileAsTrace(
+                use_file,
+                soil_file,
+                workerSpace='self')
+            assert USEEngine.commandExitCode == 0
+            with open(trace_file) as f:
+                trace = f.read()
+            assert trace.startswith('use version 5.2.0')
+            assert trace.endswith('-> 1 : Integer\n')
+        assert USEEngine.sessionPool.sessions[0].nbStarts == 1
+
+    def testExecuteSoilFileAsTraceWithCrash(self, tmpdir):
+        use_file = _useFile(tmpdir)
+        soil_file = str(tmpdir.join('crash.soil'))
+        with open(soil_file, 'w') as f:
+            f.write("? 'before'\ncrash\n")
+        USEEngine.startSessions(poolSize=1, command=FAKE_USE)
+        for _ in range(2):
+            trace_file = USEEngine.executeSoilFileAsTrace(
+                use_file,
+                soil_file,
+                workerSpace='self')
+            assert USEEngine.commandExitCode == 3
+            with open(trace_file) as f:
+                trace = f.read()
+            assert trace.startswith('use version 5.2.0')
+            assert trace.endswith("-> 'before' : String\n")
+        # the crash is not cached
+        assert USEEngine.sessionPool.sessions[0].nbRequests == 2
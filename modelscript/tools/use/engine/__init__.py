@@ -11,11 +11,15 @@ import logging
 import os
 import re
 from modelscript.config import Config
+from modelscript.base.profiles import Profile
 from modelscript.interfaces.environment import Environment
 from modelscript.base.files import (
     replaceExtension,
     readFileLines,
     writeFileLines)
+from modelscript.tools.use.engine.results import (
+    USEResult,
+    USEResultCache)
 
 __all__ = [
     'USEEngine',
@@ -85,6 +89,34 @@ class USEEngine(object):
     #: Combined output & errors for last execution if merged out/err
     outAndErr = None
 
+    #: Whether the use process of a session died during the last
+    #: execution. See _executeInSession.
+    sessionCrashed = False
+
+    #: Pool of persistent use processes used to execute soil files,
+    #: or None to start a new use process for each execution.
+    #: See startSessions.
+    sessionPool = None
+
+    @classmethod
+    def startSessions(cls, poolSize=1, command=None):
+        """
+        Execute soil files in persistent use processes, at most
+        poolSize at a time, instead of starting a new use process
+        for each execution. See the module sessions.
+        """
+        from modelscript.tools.use.engine.sessions import USESessionPool
+        cls.stopSessions()
+        cls.sessionPool = USESessionPool(
+            maxSize=poolSize,
+            command=command)
+
+    @classmethod
+    def stopSessions(cls):
+        if cls.sessionPool is not None:
+            cls.sessionPool.close()
+            cls.sessionPool = None
+
 
     @classmethod
     def _soilHelper(cls, name):
@@ -226,7 +258,9 @@ class USEEngine(object):
                 print(('USE:        output     : %s' % errors_filename))
 
         os.chdir(cls.directory)
-        cls.commandExitCode = os.system(cls.command)
+        cls.sessionCrashed = False
+        with Profile.phase('use'):
+            cls.commandExitCode = os.system(cls.command)
         os.chdir(previousDirectory)
         if DEBUG>=2 or Config.realtimeUSE>=1:
             print(('USE:        exit code  : %s' % cls.commandExitCode))
@@ -267,6 +301,47 @@ class USEEngine(object):
             print(('USE: ' + '.' * 80))
         return cls.commandExitCode
 
+    @classmethod
+    def _loadResult(cls, key):
+        #type: (Optional[Text]) -> bool
+        """
+        Set the result of the last execution from USEResultCache.
+        Return False if there is no result for the key.
+        """
+        if key is None:
+            return False
+        result=USEResultCache.load(key)
+        if result is None:
+            return False
+        if DEBUG>=2 or Config.realtimeUSE>=1:
+            print(('USE:    RESULT FROM CACHE %s' % key))
+        cls.command=None
+        cls.sessionCrashed=False
+        cls.commandExitCode=result.commandExitCode
+        cls.out=result.out
+        cls.err=result.err
+        cls.outAndErr=result.outAndErr
+        return True
+
+    @classmethod
+    def _saveResult(cls, key):
+        #type: (Optional[Text]) -> None
+        """
+        Save the result of the last execution in USEResultCache,
+        unless use has failed or produced nothing. A failure may be
+        transient (e.g. a crash of the JVM) so it is not replayed.
+        """
+        if (key is None
+                or cls.commandExitCode != 0
+                or cls.sessionCrashed
+                or (cls.out is None and cls.outAndErr is None)):
+            return
+        USEResultCache.save(key, USEResult(
+            commandExitCode=cls.commandExitCode,
+            out=cls.out,
+            err=cls.err,
+            outAndErr=cls.outAndErr))
+
     @classmethod
     def useVersion(cls):
         """
@@ -325,11 +400,14 @@ class USEEngine(object):
         soil=cls._soilHelper('infoModelAndQuit.soil')
         if DEBUG>=2:
             print(('USE: '+' analyzeUSEModel '.center(80,'#')))
-        cls._execute(
-            useFileName,
-            soil,
-            basicFileName=prequelFileName,
-            workerSpace=workerSpace)
+        key=USEResultCache.key('analyze', [useFileName, soil])
+        if not cls._loadResult(key):
+            cls._execute(
+                useFileName,
+                soil,
+                basicFileName=prequelFileName,
+                workerSpace=workerSpace)
+            cls._saveResult(key)
         if DEBUG>=2:
             print(('USE: '+' END analyzeUSEModel '.center(80,'#')))
         return cls.commandExitCode
@@ -351,14 +429,82 @@ class USEEngine(object):
         abs_soil_file=os.path.realpath(soilFile)
         # worker_file_label=Environment.pathToLabel(abs_soil_file)
 
+        key=USEResultCache.key('trace', [abs_use_file, abs_soil_file])
+        if cls._loadResult(key):
+            pass
+        elif cls.sessionPool is not None:
+            cls._executeInSession(abs_use_file, abs_soil_file)
+            cls._saveResult(key)
+        else:
+            cls._executeDriver(
+                abs_use_file,
+                abs_soil_file,
+                abs_prequel_file,
+                workerSpace)
+            cls._saveResult(key)
+
+        # save the result in a temp file
+        # (f, trace_filename) = tempfile.mkstemp(suffix='.stc', text=True)
+        # os.close(f)
+        trace_filename=Environment.getWorkerFileName(
+            basicFileName=\
+                replaceExtension(
+                    abs_prequel_file,
+                    '.stc'),
+            workerSpace=workerSpace)
+        # print('NN'*10, type(cls.outAndErr))
+        with open(trace_filename, 'w') as f:
+            f.write(cls.outAndErr)
+        return trace_filename
+
+    @classmethod
+    def _executeInSession(cls, useFile, soilFile):
+        #type: (Text, Text) -> int
+        """
+        Open the soil file in the use session of the use file.
+        Set the same attributes as _execute(errWithOut=True). The
+        output starts with the banner of the session, even if the
+        process dies, so that it is the same as if a new process was
+        started.
+        """
+        from modelscript.tools.use.engine.sessions import USESessionCrash
+        session = cls.sessionPool.session(useFile)
+        cls.command = "open '%s'" % soilFile
+        cls.directory = session.directory
+        cls.out = None
+        cls.err = None
+        if DEBUG>=3 or Config.realtimeUSE>=1:
+            print(('USE:    USE SESSION %s: %s' % (useFile, cls.command)))
+        try:
+            with Profile.phase('use'):
+                output = session.execute(cls.command)
+        except USESessionCrash as e:
+            cls.commandExitCode = e.exitCode
+            cls.sessionCrashed = True
+            cls.outAndErr = e.banner+e.output
+        else:
+            cls.commandExitCode = 0
+            cls.sessionCrashed = False
+            cls.outAndErr = session.banner+output
+        if DEBUG>=2 or Config.realtimeUSE>=1:
+            print(('USE:        exit code  : %s' % cls.commandExitCode))
+        return cls.commandExitCode
+
+    @classmethod
+    def _executeDriver(cls, useFile, soilFile, prequelFile, workerSpace):
+        #type: (Text, Text, Text, Optional[Text]) -> int
+        """
+        Open the soil file in a new use process, via a driver soil
+        file opening it and quitting.
+        """
         # create the driver file
-        driver_sequence = "open '%s' \nquit\n" % abs_soil_file
+        driver_sequence = "open '%s' \nquit\n" % soilFile
         # (f, driver_filename) = tempfile.mkstemp(suffix='.soil', text=True)
         # os.close(f)
         driver_filename=Environment.getWorkerFileName(
             basicFileName=\
                 replaceExtension(
-                    abs_prequel_file,
+                    prequelFile,
                     '.driver.soil'),
             workerSpace=workerSpace
             )
@@ -367,28 +513,13 @@ class USEEngine(object):
             f.write(driver_sequence)
 
         # execute  use
-        cls._execute(
-            abs_use_file,
+        return cls._execute(
+            useFile,
             driver_filename,
-            basicFileName=replaceExtension(abs_prequel_file,'.use'),
+            basicFileName=replaceExtension(prequelFile,'.use'),
             errWithOut=True,
             workerSpace=workerSpace)
 
-
-        # save the result in a temp file
-        # (f, trace_filename) = tempfile.mkstemp(suffix='.stc', text=True)
-        # os.close(f)
-        trace_filename=Environment.getWorkerFileName(
-            basicFileName=\
-                replaceExtension(
-                    abs_prequel_file,
-                    '.stc'),
-            workerSpace=workerSpace)
-        # print('NN'*10, type(cls.outAndErr))
-        with open(trace_filename, 'w') as f:
-            f.write(cls.outAndErr)
-        return trace_filename
-
     @classmethod
     def executeSoilFileAsSex(cls, useFile, soilFile, prequelFileName=None):
         #type: (Text, Text, Optional[Text]) -> Text
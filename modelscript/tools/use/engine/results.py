@@ -0,0 +1,237 @@
+# coding=utf-8
+"""
+Persistent cache of the results of use.
+
+Executing use takes seconds while most compilations submit the same
+.use and .soil files again. The results of USEEngine.analyzeUSEModel
+and USEEngine.executeSoilFileAsTrace (exit code and outputs) are
+stored in the directory ~/.mdl/cache/use. Each entry is keyed by a
+hash of the kind of execution, the paths and contents of the files
+submitted and the version of use, so there is no need to invalidate
+entries explicitly. Paths are part of the key because use messages
+refer to them.
+
+The version of use is obtained once by executing use and is then
+saved with the size and date of the use command, so that a hit does
+not execute use at all. If use cannot be executed the cache is not
+used.
+
+The cache is bounded: when the entries exceed USEResultCache.maxSize
+bytes, the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+from typing import ClassVar, List, Optional, Text
+
+from modelscript.base.files import ensureDir
+from modelscript.interfaces.environment import Environment
+
+__all__=(
+    'USEResult',
+    'USEResultCache',
+)
+
+
+class USEResult(object):
+    """ The result of an execution of use, see USEEngine. """
+
+    def __init__(self,
+                 commandExitCode,
+                 out=None,
+                 err=None,
+                 outAndErr=None):
+        #type: (Optional[int], Optional[Text], Optional[Text], Optional[Text]) -> None
+        self.commandExitCode=commandExitCode
+        self.out=out
+        self.err=err
+        self.outAndErr=outAndErr
+
+    def json(self):
+        return {
+            'commandExitCode': self.commandExitCode,
+            'out': self.out,
+            'err': self.err,
+            'outAndErr': self.outAndErr
+        }
+
+
+class USEResultCache(object):
+
+    FORMAT: ClassVar[Text]='1'
+    """Version of the cache format."""
+
+    enabled: ClassVar[bool]=True
+
+    maxSize: ClassVar[int]=32*1024*1024
+    """Maximum size of the entries in bytes."""
+
+    nbHits: ClassVar[int]=0
+
+    nbMisses: ClassVar[int]=0
+
+    _directory: ClassVar[Optional[Text]]=None
+
+    _useVersion: ClassVar[Optional[Text]]=None
+
+    _withoutUSE: ClassVar[bool]=False
+    """Set when use cannot be executed, to try only once."""
+
+    @classmethod
+    def directory(cls):
+        #type: () -> Text
+        """ The cache directory, created on demand. """
+        if cls._directory is None:
+            cls._directory=os.path.join(
+                Environment.getUserModelDir(), 'cache', 'use')
+            ensureDir(cls._directory)
+        return cls._directory
+
+    @classmethod
+    def useVersion(cls):
+        #type: () -> Optional[Text]
+        """
+        The version of use or None if use cannot be executed.
+        """
+        if cls._useVersion is not None or cls._withoutUSE:
+            return cls._useVersion
+        from modelscript.tools.use.engine import (
+            USE_OCL_COMMAND,
+            USEEngine,
+            USEError)
+        try:
+            stat=os.stat(os.path.realpath(USE_OCL_COMMAND))
+            stamp='%s|%s|%s' % (
+                os.path.realpath(USE_OCL_COMMAND),
+                stat.st_mtime,
+                stat.st_size)
+        except OSError:
+            cls._withoutUSE=True
+            return None
+        version_file=os.path.join(
+            cls.directory(),
+            'version-%s.txt' % cls._hash([stamp]))
+        try:
+            with open(version_file) as f:
+                cls._useVersion=f.read()
+            return cls._useVersion
+        except OSError:
+            pass
+        try:
+            version=USEEngine.useVersion()
+        except (USEError, EnvironmentError):
+            cls._withoutUSE=True
+            return None
+        cls._write(version_file, version)
+        cls._useVersion=version
+        return version
+
+    @classmethod
+    def _hash(cls, parts):
+        #type: (List[Text]) -> Text
+        h=hashlib.sha1()
+        for part in parts:
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    @classmethod
+    def key(cls, kind, fileNames):
+        #type: (Text, List[Text]) -> Optional[Text]
+        """
+        The key of the execution of the given kind with the given
+        files, or None if the cache cannot be used.
+        """
+        if not cls.enabled:
+            return None
+        version=cls.useVersion()
+        if version is None:
+            return None
+        parts=[cls.FORMAT, version, kind]
+        try:
+            for file_name in fileNames:
+                path=os.path.realpath(file_name)
+                with open(path) as f:
+                    parts += [path, f.read()]
+        except (OSError, UnicodeDecodeError):
+            return None
+        return cls._hash(parts)
+
+    @classmethod
+    def _file(cls, key):
+        #type: (Text) -> Text
+        return os.path.join(cls.directory(), key+'.json')
+
+    @classmethod
+    def load(cls, key):
+        #type: (Text) -> Optional[USEResult]
+        """ The result cached for the key or None. """
+        filename=cls._file(key)
+        try:
+            with open(filename) as f:
+                result=USEResult(**json.load(f))
+            # the entry is now the most recently used one
+            os.utime(filename)
+        except Exception:  # except:OK
+            # missing or corrupted entries are ignored
+            cls.nbMisses += 1
+            return None
+        cls.nbHits += 1
+        return result
+
+    @classmethod
+    def save(cls, key, result):
+        #type: (Text, USEResult) -> bool
+        """ Save the result. Return False if this is not possible. """
+        if not cls._write(cls._file(key), json.dumps(result.json())):
+            return False
+        cls._evict()
+        return True
+
+    @classmethod
+    def _write(cls, filename, text):
+        #type: (Text, Text) -> bool
+        try:
+            # Write to a temporary file first so that concurrent
+            # processes never read a partial entry.
+            tmp_filename='%s.%i.tmp' % (filename, os.getpid())
+            with open(tmp_filename, 'w') as f:
+                f.write(text)
+            os.replace(tmp_filename, filename)
+            return True
+        except OSError:
+            return False
+
+    @classmethod
+    def _evict(cls):
+        """ Remove the least recently used entries if too big. """
+        entries=[]
+        total=0
+        for name in os.listdir(cls.directory()):
+            if not name.endswith('.json'):
+                continue
+            path=os.path.join(cls.directory(), name)
+            try:
+                stat=os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for (_, size, path) in entries:
+            if total <= cls.maxSize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    @classmethod
+    def clear(cls):
+        for name in os.listdir(cls.directory()):
+            if name.endswith(('.json', '.txt')):
+                os.remove(os.path.join(cls.directory(), name))
+        cls._useVersion=None
+        cls._withoutUSE=False
@@ -0,0 +1,273 @@
+# coding=utf-8
+"""
+Persistent use processes.
+
+Starting use means starting a JVM and compiling the .use model, which
+takes much longer than executing a soil file. A USESession keeps a
+"use -nogui" process running for a .use model and sends it soil
+commands through its standard input. The output of each request is
+framed with a sentinel query ::
+
+    reset
+    ? '__modelscript_end_1__'
+    open '/path/to/scenario.soil'
+    ? '__modelscript_end_2__'
+
+Everything printed before the line containing the sentinel is the
+output of the request. The "reset" command makes each request start
+from an empty system state, as with a new process. Standard errors are
+merged with the output, like with USEEngine._execute(errWithOut=True).
+
+If the process dies while executing a request, USESessionCrash is
+raised and a new process is started on the next request. If the .use
+file changes the process is restarted as well.
+
+A USESessionPool keeps at most a given number of sessions, one per
+.use file, and closes the least recently used one when full.
+"""
+
+import atexit
+import os
+import subprocess
+from collections import OrderedDict
+from typing import ClassVar, List, Optional, Text, Tuple
+
+from modelscript.tools.use.engine import (
+    USE_OCL_COMMAND,
+    USEExecutionError)
+
+__all__=(
+    'USESession',
+    'USESessionPool',
+    'USESessionCrash',
+)
+
+USE_OPTIONS=[
+    '-nogui',
+    '-nr',
+    '-extendedTypeSystemChecks:I',
+    '-oclAnyCollectionsChecks:I'
+]
+
+
+class USESessionCrash(USEExecutionError):
+    """ The use process died while executing a request. """
+
+    def __init__(self, message, output, exitCode, banner=''):
+        #type: (Text, Text, Optional[int], Text) -> None
+        super(USESessionCrash, self).__init__(message)
+        self.output=output
+        self.exitCode=exitCode
+        self.banner=banner
+        """ The banner of the session, empty if the process died
+        while starting (the output is then the partial banner). """
+
+
+class USESession(object):
+    """
+    A use process running for a given .use file.
+    """
+
+    SENTINEL: ClassVar[Text]='__modelscript_end_%i__'
+
+    def __init__(self,
+                 useFileName,
+                 command=None,
+                 directory=None):
+        #type: (Text, Optional[List[Text]], Optional[Text]) -> None
+        self.useFileName=os.path.realpath(useFileName)
+        #type: Text
+
+        self.command=(
+            list(command) if command is not None
+            else [USE_OCL_COMMAND])
+        #type: List[Text]
+        # The command to start use, without its arguments.
+
+        self.directory=(
+            directory if directory is not None
+            else os.path.dirname(self.useFileName))
+        #type: Text
+        # The working directory of the process.
+
+        self.process=None
+        #type: Optional[subprocess.Popen]
+
+        self.banner=''
+        #type: Text
+        # The output of use when started, that is the version
+        # of use and the errors of the .use file if any.
+
+        self.exitCode=None
+        #type: Optional[int]
+        # The exit code of the last process that ended.
+
+        self.nbStarts=0
+        #type: int
+
+        self.nbRequests=0
+        #type: int
+
+        self._nbSentinels=0
+        #type: int
+
+        self._stamp=None
+        #type: Optional[Tuple[float, int]]
+        # Modification time and size of the .use file when the
+        # process was started.
+
+    def _useFileStamp(self):
+        #type: () -> Optional[Tuple[float, int]]
+        try:
+            stat=os.stat(self.useFileName)
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+    @property
+    def isAlive(self):
+        #type: () -> bool
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """ Start the process, closing the previous one if any. """
+        self.close()
+        self._stamp=self._useFileStamp()
+        self.process=subprocess.Popen(
+            self.command+USE_OPTIONS+[self.useFileName],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.directory,
+            universal_newlines=True,
+            bufsize=1)
+        self.nbStarts += 1
+        self.banner=''
+        self.banner=self._request('')
+
+    def execute(self, commands):
+        #type: (Text) -> Text
+        """
+        Execute soil commands and return their output. The
+        process is started (again) if needed.
+        """
+        if (not self.isAlive
+                or self._useFileStamp() != self._stamp):
+            self.start()
+        self._request('reset\n')
+        self.nbRequests += 1
+        return self._request(commands)
+
+    def _request(self, commands):
+        #type: (Text) -> Text
+        self._nbSentinels += 1
+        sentinel=self.SENTINEL % self._nbSentinels
+        if commands and not commands.endswith('\n'):
+            commands += '\n'
+        try:
+            self.process.stdin.write(
+                "%s? '%s'\n" % (commands, sentinel))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            # the process is dead: its output is read below
+            pass
+        lines=[]
+        while True:
+            line=self.process.stdout.readline()
+            if line=='':
+                self._crashed(''.join(lines))
+            if sentinel in line:
+                return ''.join(lines)
+            lines.append(line)
+
+    def _crashed(self, output):
+        #type: (Text) -> None
+        self.exitCode=self.process.wait()
+        self._release()
+        raise USESessionCrash(  # raise:OK
+            'use process for "%s" ended with exit code %s' % (
+                self.useFileName,
+                self.exitCode),
+            output=output,
+            exitCode=self.exitCode,
+            banner=self.banner)
+
+    def _release(self):
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except (BrokenPipeError, OSError):
+                pass
+        self.process=None
+
+    def close(self, timeout=5):
+        """ Quit use, or kill it if it does not quit in time. """
+        if self.process is None:
+            return
+        if self.isAlive:
+            try:
+                self.process.stdin.write('quit\n')
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError):
+                pass
+            try:
+                self.exitCode=self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.exitCode=self.process.wait()
+        else:
+            self.exitCode=self.process.wait()
+        self._release()
+
+
+class USESessionPool(object):
+    """
+    At most maxSize sessions, one per .use file. The least recently
+    used session is closed when a session is needed for another file.
+    """
+
+    def __init__(self, maxSize=1, command=None):
+        #type: (int, Optional[List[Text]]) -> None
+        if maxSize < 1:
+            raise ValueError(  # raise:OK
+                'The size of a use session pool must be at least 1.')
+        self.maxSize=maxSize
+        self.command=command
+        self._sessions=OrderedDict()
+        #type: OrderedDict[Text, USESession]
+        self._pid=os.getpid()
+        atexit.register(self.close)
+
+    @property
+    def sessions(self):
+        #type: () -> List[USESession]
+        return list(self._sessions.values())
+
+    def session(self, useFileName):
+        #type: (Text) -> USESession
+        path=os.path.realpath(useFileName)
+        if os.getpid() != self._pid:
+            # Forked process (see AnalysisPool): the sessions belong
+            # to the parent process and cannot be shared.
+            self._sessions=OrderedDict()
+            self._pid=os.getpid()
+        if path in self._sessions:
+            self._sessions.move_to_end(path)
+        else:
+            while len(self._sessions) >= self.maxSize:
+                (_, oldest)=self._sessions.popitem(last=False)
+                oldest.close()
+            self._sessions[path]=USESession(
+                path,
+                command=self.command)
+        return self._sessions[path]
+
+    def execute(self, useFileName, commands):
+        #type: (Text, Text) -> Text
+        return self.session(useFileName).execute(commands)
+
+    def close(self):
+        if os.getpid() == self._pid:
+            for session in self._sessions.values():
+                session.close()
+        self._sessions=OrderedDict()